@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+bench_graph_io.py
+
+Benchmark for graph_io.load_graph_from_file: parse time and peak RSS of the
+current offset-based parser compared with the previous split + regex parser,
+and of a warm load through the parsed-graph cache (graph_cache.py).
+
+Each measurement runs in a fresh Python process, so the reported peak RSS is
+not polluted by earlier runs. Peak RSS is read from getrusage() (Linux/macOS).
+
+Usage (from the Connectome_Weaver folder):
+    python benchmarks/bench_graph_io.py [--nodes 200000] [--file path/to/SG.md] [--repeat 3]
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import argparse
+import json
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def _legacy_load(file_path: Path):
+    """The parser used before the offset-based rewrite, kept for comparison."""
+    with file_path.open('r', encoding='utf-8') as f:
+        content = f.read()
+    parts = content.split('---', 2)
+    metadata = yaml.safe_load(parts[1])
+    json_match = re.search(r'```json\s*\n(.*?)\n```', parts[2], re.DOTALL)
+    graph_data = json.loads(json_match.group(1))
+    return metadata, graph_data
+
+
+def _current_load(file_path: Path):
+    from weaverSG.core import graph_io
+    return graph_io.load_graph_from_file(file_path)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_worker(parser_name: str, file_path: Path, cache_dir: Path) -> None:
+    """Runs one parse in this process and prints the measurements as JSON."""
+    loader = _legacy_load if parser_name == 'legacy' else _current_load
+    if parser_name != 'legacy':
+        # Import outside of the timed region, like the legacy parser's modules.
+        from weaverSG.core import graph_cache, graph_io  # noqa: F401
+        graph_cache.configure(cache_dir if parser_name == 'cached' else None)
+    rss_before = _peak_rss_mb()
+    started = time.perf_counter()
+    _, graph_data = loader(file_path)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_rss_mb": _peak_rss_mb(),
+        "rss_growth_mb": _peak_rss_mb() - rss_before,
+        "nodes": len(graph_data.get('nodes', [])),
+    }))
+
+
+def _generate_graph(file_path: Path, node_count: int) -> None:
+    """Writes a synthetic SG with node_count nodes and twice as many relations."""
+    nodes = [{
+        "MUID": f"NODE_{i}",
+        "type": "concept",
+        "content": f"Синтетический узел номер {i} для замера производительности.",
+        "weight": "medium",
+    } for i in range(node_count)]
+    relations = [{
+        "LID": f"l_{i:08x}",
+        "from_MUID": f"NODE_{i % node_count}",
+        "to_MUID": f"NODE_{(i * 7 + 3) % node_count}",
+        "type": "relates_to",
+        "class": "link",
+    } for i in range(node_count * 2)]
+    metadata = {"title": "Benchmark SG", "graph_version": "3.0"}
+    with file_path.open('w', encoding='utf-8') as f:
+        f.write("---\n" + yaml.dump(metadata, allow_unicode=True, sort_keys=False) + "---\n\n")
+        f.write("```json\n" + json.dumps({"nodes": nodes, "relations": relations}, indent=2, ensure_ascii=False) + "\n```\n")
+
+
+def _measure(parser_name: str, file_path: Path, cache_dir: Path, repeat: int) -> dict:
+    command = [sys.executable, __file__, '--worker', parser_name, '--file', str(file_path), '--cache-dir', str(cache_dir)]
+    if parser_name == 'cached':
+        # Warm-up run that populates the cache.
+        subprocess.run(command, check=True, capture_output=True)
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
+        runs.append(json.loads(result.stdout))
+    best = min(runs, key=lambda r: r['seconds'])
+    best['peak_rss_mb'] = max(r['peak_rss_mb'] for r in runs)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SG file parsing (before/after).")
+    parser.add_argument("--nodes", type=int, default=200000, help="Node count of the generated SG.")
+    parser.add_argument("--file", type=Path, help="Benchmark an existing SG file instead of a generated one.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser; the fastest is reported.")
+    parser.add_argument("--worker", choices=['legacy', 'current', 'cached', 'generate'], help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker == 'generate':
+        _generate_graph(args.file, args.nodes)
+        return
+    if args.worker:
+        _run_worker(args.worker, args.file, args.cache_dir)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = args.file
+        if file_path is None:
+            # Generated in a child process: a large parent would pass its peak RSS
+            # on to the measuring processes it spawns.
+            file_path = Path(tmp_dir) / "bench_SG.md"
+            subprocess.run(
+                [sys.executable, __file__, '--worker', 'generate', '--nodes', str(args.nodes), '--file', str(file_path)],
+                check=True
+            )
+        size_mb = file_path.stat().st_size / (1024 * 1024)
+        print(f"File: {file_path} ({size_mb:.1f} MB)")
+
+        cache_dir = Path(tmp_dir) / "graph_cache"
+        results = {name: _measure(name, file_path, cache_dir, args.repeat) for name in ('legacy', 'current', 'cached')}
+
+    print(f"{'parser':<10}{'time, s':>10}{'peak RSS, MB':>15}{'RSS growth, MB':>17}")
+    for name, result in results.items():
+        print(f"{name:<10}{result['seconds']:>10.3f}{result['peak_rss_mb']:>15.1f}{result['rss_growth_mb']:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
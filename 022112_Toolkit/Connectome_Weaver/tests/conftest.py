@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+conftest.py
+
+Shared fixtures of the weaverSG tests: a small sample graph, an SG file written
+from it into a temporary directory, and a helper that applies a recipe to that
+file through the batch-modify command.
+
+Run the tests from the Connectome_Weaver folder:
+    python -m pytest -q
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import copy
+from pathlib import Path
+from typing import Dict, Any, List, Callable
+
+import pytest
+import yaml
+
+from weaverSG.commands import batch_modifier
+from weaverSG.core import graph_cache, graph_io
+
+SG_METADATA = {'title': 'Test SG', 'graph_version': '3.0', 'muid': '11111111-2222-4333-8444-555555555555'}
+
+_SAMPLE_GRAPH = {
+    "nodes": [
+        {"MUID": f"00000000-aaaa-4bbb-8ccc-{i:012d}", "type": "concept" if i % 3 else "artifact",
+         "content": f"Node {i}", "weight": i % 5}
+        for i in range(24)
+    ] + [
+        {"MUID": "NODE_A", "type": "concept", "content": "Legacy MUID"},
+        {"MUID": "NODE_B", "type": "concept"},
+        {"MUID": "NODE_A", "type": "artifact", "content": "Duplicate MUID"},
+        {"type": "concept", "content": "No MUID"},
+    ],
+    "relations": [
+        {"LID": f"l_{i:08d}", "from_MUID": f"00000000-aaaa-4bbb-8ccc-{i:012d}",
+         "to_MUID": f"00000000-aaaa-4bbb-8ccc-{(i * 7 + 1) % 24:012d}", "type": "link" if i % 2 else "depends_on"}
+        for i in range(20)
+    ] + [
+        {"LID": "l_legacy", "from_MUID": "NODE_A", "to_MUID": "NODE_B", "type": "link"},
+        {"from_MUID": "NODE_B", "to_MUID": "MISSING_NODE", "type": "link"},
+        {"LID": "l_dangling", "from_MUID": "NODE_B", "to_MUID": "ALSO_MISSING", "type": "link"},
+    ],
+    "graph_notes": {"owner": "tests", "tags": ["sample"]},
+}
+
+
+@pytest.fixture(autouse=True)
+def _isolated_environment(monkeypatch):
+    """Runs every test without a graph cache and with the default checkpoint settings."""
+    for variable in ('WEAVERSG_CACHE_DIR', 'WEAVERSG_CHECKPOINT_INTERVAL', 'WEAVERSG_CHECKPOINT_KEEP'):
+        monkeypatch.delenv(variable, raising=False)
+    graph_cache.configure()
+    yield
+    graph_cache.configure()
+
+
+@pytest.fixture
+def graph_data() -> Dict[str, Any]:
+    """A fresh copy of the sample graph data."""
+    return copy.deepcopy(_SAMPLE_GRAPH)
+
+
+@pytest.fixture
+def sg_file(tmp_path: Path, graph_data: Dict[str, Any]) -> Path:
+    """The sample graph saved as 'SG.md' in a temporary directory (without a log)."""
+    path = tmp_path / 'SG.md'
+    graph_io.save_graph_to_file(path, dict(SG_METADATA), graph_data)
+    return path
+
+
+@pytest.fixture
+def apply_recipe(tmp_path: Path) -> Callable[..., None]:
+    """
+    Returns apply(sg_file, operations, **options): writes a recipe with the given
+    operations and runs batch-modify on the file. Each call gets its own recipe id.
+    """
+    counter = [0]
+
+    def apply(sg_path: Path, operations: List[Dict[str, Any]], **options) -> None:
+        counter[0] += 1
+        recipe_path = tmp_path / f"recipe_{counter[0]}.yaml"
+        recipe_path.write_text(yaml.safe_dump({'id': f"test_recipe_{counter[0]}", 'operations': operations}), encoding='utf-8')
+        batch_modifier.handle_batch_modify(sg_path, recipe_path, **options)
+
+    return apply
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+test_checkout.py
+
+Tests of the 'checkout' command: the state reconstructed at a transaction must
+equal the SG as it was saved by that transaction, whether it is replayed from
+the current SG, from a checkpoint, or through an archived log.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import pytest
+
+from weaverSG.commands import checkout, log_archiver, validator
+from weaverSG.core import checkpoints, graph_io
+from weaverSG.core.lsg_manager import LSGManager, LAST_TRANSACTION_KEY
+
+_RECIPES = [
+    [{"action": "add_node", "params": {"node_data": {"MUID": "NEW_NODE", "type": "concept"}}},
+     {"action": "add_relation", "params": {"relation_data": {"LID": "l_new", "from_MUID": "NEW_NODE", "to_MUID": "NODE_B", "type": "link"}}}],
+    [{"action": "update_node", "params": {"muid": "00000000-aaaa-4bbb-8ccc-000000000004", "updates": {"content": "updated"}}}],
+    [{"action": "delete_node", "params": {"muid": "00000000-aaaa-4bbb-8ccc-000000000002", "on_relations": "cascade"}}],
+    [{"action": "delete_nodes_by_query", "params": {"query": {"type": "artifact", "weight": {"$gte": 2}}}},
+     {"action": "update_relations_by_query", "params": {"query": {"type": "depends_on"}, "updates": {"weight": 2}}}],
+    [{"action": "rename_muids", "params": {"mapping": {"NODE_B": "NODE_C"}}}],
+    [{"action": "add_nodes", "params": {"nodes": [{"MUID": f"BULK_{i}", "type": "concept"} for i in range(5)]}},
+     {"action": "delete_relations_by_query", "params": {"query": {"to_MUID": "ALSO_MISSING"}}}],
+]
+
+
+def _saved_state(sg_file):
+    return checkpoints.graph_state(graph_io.load_graph_from_file(sg_file)[1])
+
+def _build_history(sg_file, apply_recipe, recipes=_RECIPES):
+    """Applies the recipes (validating after some of them) and returns {transaction ID: saved state}."""
+    states = {}
+    for i, operations in enumerate(recipes):
+        apply_recipe(sg_file, operations)
+        states[LSGManager(sg_file).last_transaction_id()] = _saved_state(sg_file)
+        if i % 2:
+            validator.validate_file(sg_file)
+            states[LSGManager(sg_file).last_transaction_id()] = _saved_state(sg_file)
+    return states
+
+def _checkout(sg_file, tid, output):
+    checkout.handle_checkout(sg_file, tid, output)
+    return checkpoints.graph_state(graph_io.load_graph_from_file(output)[1])
+
+
+@pytest.mark.parametrize("interval", [0, 2])
+def test_checkout_equals_the_saved_state(sg_file, apply_recipe, tmp_path, monkeypatch, capsys, interval):
+    monkeypatch.setenv('WEAVERSG_CHECKPOINT_INTERVAL', str(interval))
+    monkeypatch.setenv('WEAVERSG_CHECKPOINT_KEEP', '0')
+    states = _build_history(sg_file, apply_recipe)
+    assert len(states) == len(_RECIPES) + len(_RECIPES) // 2
+    saved_checkpoints = checkpoints.list_checkpoints(sg_file)
+    assert bool(saved_checkpoints) == bool(interval)
+    capsys.readouterr()
+
+    for tid, state in states.items():
+        assert _checkout(sg_file, tid, tmp_path / 'out.md') == state, tid
+        output = capsys.readouterr().out
+        if tid in saved_checkpoints:
+            assert f"Started from the checkpoint {tid}" in output
+        elif not interval:
+            assert "Started from the current SG" in output
+
+def test_checkout_before_the_first_transaction(sg_file, apply_recipe, tmp_path):
+    original = _saved_state(sg_file)
+    _build_history(sg_file, apply_recipe, _RECIPES[:2])
+
+    assert _checkout(sg_file, '2000-01-01T00:00:00', tmp_path / 'out.md') == original
+
+def test_checkout_through_an_archived_log(sg_file, apply_recipe, tmp_path, monkeypatch):
+    monkeypatch.setenv('WEAVERSG_CHECKPOINT_INTERVAL', '2')
+    states = _build_history(sg_file, apply_recipe, _RECIPES[:3])
+    log_archiver.handle_archive_log(sg_file)
+    assert not checkpoints.list_checkpoints(sg_file)
+    states.update(_build_history(sg_file, apply_recipe, _RECIPES[3:]))
+
+    for tid, state in states.items():
+        assert _checkout(sg_file, tid, tmp_path / 'out.md') == state, tid
+
+def test_checkout_leaves_the_sg_untouched(sg_file, apply_recipe):
+    states = _build_history(sg_file, apply_recipe, _RECIPES[:2])
+    before = sg_file.read_bytes()
+    first = next(iter(states))
+
+    checkout.handle_checkout(sg_file, first)
+
+    assert sg_file.read_bytes() == before
+    outputs = list((sg_file.parent / checkout.CHECKOUT_DIR_NAME).iterdir())
+    assert len(outputs) == 1
+    metadata, graph_data = graph_io.load_graph_from_file(outputs[0])
+    assert checkpoints.graph_state(graph_data) == states[first]
+    assert LAST_TRANSACTION_KEY not in metadata
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+test_graph_delta.py
+
+Tests of the field-level transaction deltas (core/graph_delta.py): a delta
+replays a change exactly, and applying its inverse returns the original graph,
+list order included.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import copy
+import json
+
+import pytest
+
+from weaverSG.core import operations
+from weaverSG.core.graph_delta import DeltaError, apply_delta, compute_delta, invert_delta, touched_identifiers
+from weaverSG.core.graph_model import as_graph
+
+
+def _dump(graph_data):
+    return json.dumps(graph_data, ensure_ascii=False)
+
+def _uuid(i):
+    return f"00000000-aaaa-4bbb-8ccc-{i:012d}"
+
+def _mixed_change(graph):
+    """A recipe-like mix of additions, removals, updates, renames and key changes."""
+    operations.add_node(graph, {"MUID": "NEW_NODE", "type": "concept", "content": "added"})
+    operations.add_relation(graph, {"LID": "l_new", "from_MUID": "NEW_NODE", "to_MUID": "NODE_B", "type": "link"})
+    operations.delete_node(graph, _uuid(2), on_relations='cascade')
+    operations.delete_nodes_by_query(graph, {"type": "artifact", "weight": {"$gte": 2}}, on_relations='keep')
+    operations.update_node(graph, _uuid(4), {"content": "updated", "status": "draft"})
+    operations.update_relations_by_query(graph, {"type": "depends_on"}, {"weight": 0.5})
+    operations.delete_relations_by_query(graph, {"to_MUID": "ALSO_MISSING"})
+    operations.rename_muids(graph, {"NODE_B": "NODE_C"})
+    operations.update_graph_properties(graph, {
+        "graph_version": "4.0",
+        "validation_issues": [{"issue_code": "A"}, {"issue_code": "B"}],
+    })
+    graph.delete_node_fields(graph.nodes[1], ["weight"])
+    del graph['graph_notes']
+
+def _record(graph_data, change):
+    """Applies a change to a copy of the graph and returns (changed graph, delta)."""
+    graph = as_graph(copy.deepcopy(graph_data))
+    savepoint = graph.savepoint()
+    change(graph)
+    delta = compute_delta(graph, savepoint)
+    graph.release_savepoints()
+    return graph, delta
+
+
+def test_delta_replays_the_change(graph_data):
+    changed, delta = _record(graph_data, _mixed_change)
+
+    replayed = apply_delta(copy.deepcopy(graph_data), delta)
+    assert _dump(replayed) == _dump(changed)
+
+def test_inverse_delta_restores_the_original(graph_data):
+    changed, delta = _record(graph_data, _mixed_change)
+
+    restored = apply_delta(changed, invert_delta(delta))
+    assert _dump(restored) == _dump(graph_data)
+
+def test_delta_survives_a_json_round_trip(graph_data):
+    changed, delta = _record(graph_data, _mixed_change)
+    stored = json.loads(json.dumps(delta))
+
+    assert _dump(apply_delta(copy.deepcopy(graph_data), stored)) == _dump(changed)
+    assert _dump(apply_delta(changed, invert_delta(stored))) == _dump(graph_data)
+
+def test_inverse_of_an_identifier_swap(graph_data):
+    def swap(graph):
+        first, second = graph.find_node(_uuid(0)), graph.find_node(_uuid(1))
+        graph.update_node(first, {"MUID": "TEMP"})
+        graph.update_node(second, {"MUID": _uuid(0)})
+        graph.update_node(first, {"MUID": _uuid(1)})
+
+    changed, delta = _record(graph_data, swap)
+    assert changed.nodes[0]['MUID'] == _uuid(1)
+    assert _dump(apply_delta(copy.deepcopy(graph_data), delta)) == _dump(changed)
+    assert _dump(apply_delta(changed, invert_delta(delta))) == _dump(graph_data)
+
+def test_relations_without_lid_are_addressed_by_endpoints(graph_data):
+    def change(graph):
+        graph.update_relation(graph.relations[21], {"to_MUID": "NODE_A", "note": "fixed"})
+
+    changed, delta = _record(graph_data, change)
+    assert {op['path'] for op in delta} == {
+        "/relations/by-endpoints/NODE_B/link/MISSING_NODE/to_MUID",
+        "/relations/by-endpoints/NODE_B/link/MISSING_NODE/note",
+    }
+    assert _dump(apply_delta(changed, invert_delta(delta))) == _dump(graph_data)
+
+def test_removals_are_restored_at_their_position(graph_data):
+    def change(graph):
+        graph.remove_nodes([graph.nodes[i] for i in range(0, 27, 2)])
+        graph.remove_relation(graph.relations[3])
+
+    changed, delta = _record(graph_data, change)
+    assert all('index' in op for op in delta if op['op'] == 'remove')
+    assert _dump(apply_delta(changed, invert_delta(delta))) == _dump(graph_data)
+
+def test_delta_values_are_snapshots(graph_data):
+    changed, delta = _record(graph_data, _mixed_change)
+    recorded = json.dumps(delta)
+
+    changed.find_node("NEW_NODE")['content'] = "changed after the delta"
+    changed['validation_issues'].append({"issue_code": "C"})
+    assert json.dumps(delta) == recorded
+
+def test_checked_apply_rejects_a_diverged_graph(graph_data):
+    _, delta = _record(graph_data, lambda graph: operations.update_node(graph, _uuid(4), {"content": "updated"}))
+
+    diverged = copy.deepcopy(graph_data)
+    diverged['nodes'][4]['content'] = "edited elsewhere"
+    with pytest.raises(DeltaError):
+        apply_delta(diverged, delta)
+    assert apply_delta(diverged, delta, check=False).find_node(_uuid(4))['content'] == "updated"
+
+def test_touched_identifiers(graph_data):
+    _, delta = _record(graph_data, lambda graph: (
+        operations.add_relation(graph, {"LID": "l_new", "from_MUID": "NODE_A", "to_MUID": _uuid(5), "type": "link"}),
+        operations.update_node(graph, _uuid(6), {"MUID": "RENAMED"}),
+        operations.update_graph_properties(graph, {"graph_version": "4.0"}),
+    ))
+    assert touched_identifiers(delta) == {
+        'muids': {"NODE_A", _uuid(5), _uuid(6), "RENAMED"},
+        'lids': {"l_new"},
+        'keys': {"graph_version"},
+    }
+
+    _, delta = _record(graph_data, lambda graph: operations.delete_node(graph, _uuid(7)))
+    assert touched_identifiers(delta) is None
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+test_incremental_validation.py
+
+Tests of incremental validation: after a recipe, re-checking only what the
+transactions since the watermark touched must give the same issues as a full
+run, and a graph that did not change since its last validation is re-validated
+without loading its log.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import pytest
+
+from weaverSG.commands import validator
+from weaverSG.core import graph_io
+from weaverSG.core.lsg_manager import LSGManager
+
+# Adds and changes entities (no removals), creating and fixing issues of every built-in rule.
+_MIXED_RECIPE = [
+    {"action": "update_node", "params": {"muid": "00000000-aaaa-4bbb-8ccc-000000000003", "updates": {"MUID": "NODE_B"}}},
+    {"action": "update_node", "params": {"muid": "00000000-aaaa-4bbb-8ccc-000000000005", "updates": {"alias": "old-5"}}},
+    {"action": "update_node", "params": {"muid": "00000000-aaaa-4bbb-8ccc-000000000006", "updates": {"alias": "old-5"}}},
+    {"action": "add_node", "params": {"node_data": {"MUID": "MISSING_NODE", "type": "concept"}}},
+    {"action": "add_relation", "params": {"relation_data": {"LID": "l_ghost", "from_MUID": "NODE_A", "to_MUID": "GHOST", "type": "link"}}},
+    {"action": "add_relation", "params": {"relation_data": {
+        "LID": "l_copy", "from_MUID": "00000000-aaaa-4bbb-8ccc-000000000001",
+        "to_MUID": "00000000-aaaa-4bbb-8ccc-000000000008", "type": "link"}}},
+    {"action": "update_relation", "params": {"lid": "l_00000004", "updates": {"to_MUID": "ANOTHER_GHOST"}}},
+    {"action": "update_relations_by_query", "params": {"query": {"type": "depends_on"}, "updates": {"weight": 1}}},
+    {"action": "update_graph_properties", "params": {"updates": {"graph_version": "4.0"}}},
+]
+
+
+def _stored_issues(sg_file):
+    return graph_io.load_graph_from_file(sg_file)[1].get('validation_issues')
+
+def _full_issues(sg_file):
+    """The issues of a full run, without writing anything."""
+    return validator.validate_file(sg_file, 'json')
+
+
+def test_incremental_validation_equals_a_full_run(sg_file, apply_recipe, capsys):
+    validator.validate_file(sg_file)
+    apply_recipe(sg_file, _MIXED_RECIPE)
+    capsys.readouterr()
+
+    issues = validator.validate_file(sg_file)
+    assert "Incremental validation" in capsys.readouterr().out
+    assert issues == _full_issues(sg_file)
+    assert _stored_issues(sg_file) == issues
+    assert {issue['issue_code'] for issue in issues} == {
+        'DANGLING_RELATION', 'DUPLICATE_NODE', 'POTENTIAL_PRE_MIGRATION_DUPLICATE', 'DUPLICATE_RELATION'
+    }
+
+    validator.validate_file(sg_file, full=True)
+    assert _stored_issues(sg_file) == issues
+
+def test_incremental_validation_over_several_recipes(sg_file, apply_recipe):
+    validator.validate_file(sg_file)
+    for step in range(0, len(_MIXED_RECIPE), 3):
+        apply_recipe(sg_file, _MIXED_RECIPE[step:step + 3])
+        assert validator.validate_file(sg_file) == _full_issues(sg_file)
+
+@pytest.mark.parametrize("fallback", [
+    # A removal shifts the list positions the stored issues refer to.
+    {"action": "delete_node", "params": {"muid": "NODE_B", "on_relations": "keep"}},
+    # A rename also rewrites the MUIDs inside the stored issues.
+    {"action": "rename_muids", "params": {"mapping": {"NODE_A": "NODE_D"}}},
+])
+def test_changes_that_need_a_full_run(sg_file, apply_recipe, capsys, fallback):
+    validator.validate_file(sg_file)
+    apply_recipe(sg_file, _MIXED_RECIPE[:4] + [fallback])
+    capsys.readouterr()
+
+    issues = validator.validate_file(sg_file)
+    assert "Incremental validation" not in capsys.readouterr().out
+    assert issues == _full_issues(sg_file)
+
+def test_unchanged_graph_is_validated_without_loading_the_log(sg_file, apply_recipe, monkeypatch):
+    apply_recipe(sg_file, _MIXED_RECIPE[:4])
+    issues = validator.validate_file(sg_file)
+    before = sg_file.read_bytes()
+
+    def fail(self):
+        raise AssertionError("the log was loaded")
+
+    monkeypatch.setattr(LSGManager, '_load_log', fail)
+    assert validator.validate_file(sg_file) == issues
+    assert sg_file.read_bytes() == before
+
+    monkeypatch.undo()
+    apply_recipe(sg_file, _MIXED_RECIPE[4:])
+    assert validator.validate_file(sg_file) == _full_issues(sg_file)
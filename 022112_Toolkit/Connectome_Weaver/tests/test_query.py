@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+test_query.py
+
+Tests of the recipe query compiler (core/query.py): the operators, and that
+narrowing the candidates through the graph's indexes selects exactly what a
+full scan would.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import pytest
+
+from weaverSG.core.graph_model import as_graph
+from weaverSG.core.query import QueryError, compile_query
+
+_NODE_QUERIES = [
+    ({"type": "artifact"}, [0, 3, 6, 9, 12, 15, 18, 21, 26]),
+    ({"MUID": "NODE_A"}, [24, 26]),
+    ({"MUID": {"$in": ["NODE_B", "NODE_A", "UNKNOWN"]}}, [24, 25, 26]),
+    ({"weight": {"$gte": 3}}, [3, 4, 8, 9, 13, 14, 18, 19, 23]),
+    ({"weight": {"$gt": "a"}}, []),
+    ({"content": {"$exists": False}}, [25]),
+    ({"MUID": {"$is_uuid": False}}, [24, 25, 26, 27]),
+    ({"$or": [{"type": "artifact", "weight": 0}, {"MUID": "NODE_B"}]}, [0, 15, 25]),
+    ({"$not": {"type": "concept"}}, [0, 3, 6, 9, 12, 15, 18, 21, 26]),
+    ({"type": "concept", "weight": {"$ne": 1}, "content": {"$regex": "^Node 1"}}, [10, 13, 14, 17, 19]),
+    # $not and $nin also match entities without the field.
+    ({"$and": [{"type": {"$in": ["concept"]}}, {"weight": {"$not": {"$lt": 4}}}]}, [4, 14, 19, 24, 25, 27]),
+    ({"weight": {"$nin": [0, 1, 2, 3]}, "type": "artifact"}, [9, 26]),
+    ({}, list(range(28))),
+]
+
+
+def _positions(entities, selected):
+    positions = {id(entity): i for i, entity in enumerate(entities)}
+    return [positions[id(entity)] for entity in selected]
+
+
+@pytest.mark.parametrize("query, expected", _NODE_QUERIES)
+def test_node_queries(graph_data, query, expected):
+    graph = as_graph(graph_data)
+    compiled = compile_query(query)
+
+    selected = compiled.select(graph, 'node')
+    assert _positions(graph.nodes, selected) == expected
+    assert selected == [node for node in graph.nodes if compiled.matches(node)]
+
+def test_relation_queries(graph_data):
+    graph = as_graph(graph_data)
+
+    selected = compile_query({"from_MUID": "NODE_B", "LID": {"$exists": False}}).select(graph, 'relation')
+    assert _positions(graph.relations, selected) == [21]
+    selected = compile_query({"to_MUID": {"$in": ["MISSING_NODE", "ALSO_MISSING"]}}).select(graph, 'relation')
+    assert _positions(graph.relations, selected) == [21, 22]
+
+def test_field_references(graph_data):
+    graph = as_graph(graph_data)
+    graph.add_node({"MUID": "SELF", "alias": "SELF", "rank": 2, "limit": 3})
+    graph.add_node({"MUID": "OTHER", "alias": "SELF", "rank": 4, "limit": 3})
+
+    assert [node['MUID'] for node in compile_query({"alias": {"$eq": {"$field": "MUID"}}}).select(graph, 'node')] == ["SELF"]
+    assert [node['MUID'] for node in compile_query({"rank": {"$lt": {"$field": "limit"}}}).select(graph, 'node')] == ["SELF"]
+    # A reference to a missing field never matches.
+    assert compile_query({"rank": {"$lt": {"$field": "missing"}}}).select(graph, 'node') == []
+    assert compile_query({"alias": {"$eq": {"$field": "MUID"}}}).fields == {"alias", "MUID"}
+
+def test_index_narrowing_follows_updates(graph_data):
+    graph = as_graph(graph_data)
+    query = compile_query({"type": "artifact", "MUID": {"$in": ["NODE_A", "NODE_B"]}})
+    assert _positions(graph.nodes, query.select(graph, 'node')) == [26]
+
+    graph.update_node(graph.nodes[25], {"type": "artifact"})
+    graph.update_node(graph.nodes[26], {"MUID": "NODE_C"})
+    graph.add_node({"MUID": "NODE_A", "type": "artifact"})
+
+    selected = query.select(graph, 'node')
+    assert sorted(_positions(graph.nodes, selected)) == [25, 28]
+    assert {id(node) for node in selected} == {id(node) for node in graph.nodes if query.matches(node)}
+
+def test_unhashable_values(graph_data):
+    graph = as_graph(graph_data)
+    graph.add_node({"MUID": "TAGGED", "tags": ["a", "b"]})
+
+    selected = compile_query({"tags": {"$in": [["a", "b"], ["c"]]}}).select(graph, 'node')
+    assert [node['MUID'] for node in selected] == ["TAGGED"]
+    assert [node['MUID'] for node in compile_query({"tags": ["a", "b"]}).select(graph, 'node')] == ["TAGGED"]
+
+def test_equal_queries_have_equal_signatures():
+    assert compile_query({"a": 1, "b": {"$in": [1, 2]}}).signature == compile_query({"b": {"$in": [1, 2]}, "a": 1}).signature
+
+@pytest.mark.parametrize("query", [
+    ["type", "concept"],
+    {"$xor": [{"type": "concept"}]},
+    {"type": {"$like": "concept"}},
+    {"type": {"$in": "concept"}},
+    {"$or": []},
+    {"$not": [{"type": "concept"}]},
+    {"content": {"$regex": "("}},
+    {"content": {"$not": "x"}},
+    {"rank": {"$lt": {"$field": 1}}},
+])
+def test_malformed_queries_are_rejected(query):
+    with pytest.raises(QueryError):
+        compile_query(query)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+test_undo_journal.py
+
+Tests of the undo journal of SemanticGraph (savepoint, rollback, diff_since):
+a rollback must restore the graph exactly, including list order, the graph-level
+keys and the indexes.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import copy
+import json
+
+import pytest
+
+from weaverSG.core import operations
+from weaverSG.core.graph_model import SemanticGraph, as_graph
+
+
+def _dump(graph_data):
+    """A canonical text form that also catches changes of list order and key order."""
+    return json.dumps(graph_data, ensure_ascii=False)
+
+def _mutate(graph: SemanticGraph) -> None:
+    """Applies every kind of mutation the journal records."""
+    nodes, relations = graph.nodes, graph.relations
+    graph.add_node({"MUID": "NEW_1", "type": "concept"})
+    graph.add_node({"MUID": "NEW_2", "type": "concept"}, position=3)
+    assert graph.find_node("NEW_2") is nodes[3]  # rebuilds the indexes dropped by the insert
+    graph.remove_node(nodes[5])
+    graph.remove_nodes(nodes[7:25])  # more than the batch threshold: compaction
+    graph.update_node(nodes[0], {"MUID": "NODE_A", "content": "renamed", "extra": [1, 2]})
+    graph.delete_node_fields(nodes[1], ["content", "weight"])
+    graph.add_relation({"LID": "l_new", "from_MUID": "NEW_1", "to_MUID": "NEW_2", "type": "link"})
+    graph.add_relation({"LID": "l_new_2", "from_MUID": "NEW_2", "to_MUID": "NEW_1", "type": "link"}, position=0)
+    assert graph.find_relation("l_new_2") is relations[0]
+    graph.remove_relation(relations[4])
+    graph.remove_relations(relations[:18])
+    graph.update_relation(relations[0], {"to_MUID": "NODE_B", "type": "depends_on"})
+    graph.delete_relation_fields(relations[1], ["type"])
+    graph['validation_issues'] = [{"issue_code": "TEST"}]
+    graph.update(graph_version='4.0')
+    del graph['graph_notes']
+
+
+def test_rollback_restores_the_graph_exactly(graph_data):
+    original = copy.deepcopy(graph_data)
+    graph = as_graph(graph_data)
+    graph.find_node("NODE_A")  # build the indexes before the changes
+
+    savepoint = graph.savepoint()
+    _mutate(graph)
+    assert _dump(graph) != _dump(original)
+
+    assert graph.rollback(savepoint) > 0
+    assert _dump(graph) == _dump(original)
+
+def test_rollback_restores_the_indexes(graph_data):
+    graph = as_graph(graph_data)
+    graph.find_relation("l_legacy")
+    graph.find_node("NODE_A")
+    savepoint = graph.savepoint()
+    _mutate(graph)
+    graph.rollback(savepoint)
+
+    assert graph.find_node("NODE_A") is graph.nodes[24]
+    assert not graph.has_node("NEW_1")
+    assert graph.find_relation("l_new") is None
+    for node in graph.nodes:
+        if 'MUID' in node:
+            assert node in graph.lookup_nodes('type', node['type'])
+    for relation in graph.relations:
+        assert relation in graph.lookup_relations('from_MUID', relation['from_MUID'])
+
+def test_nested_savepoints_roll_back_independently(graph_data):
+    original = copy.deepcopy(graph_data)
+    graph = as_graph(graph_data)
+
+    outer = graph.savepoint()
+    graph.add_node({"MUID": "OUTER", "type": "concept"})
+    graph.remove_relation(graph.relations[0])
+    intermediate = copy.deepcopy(dict(graph))
+
+    inner = graph.savepoint()
+    _mutate(graph)
+    graph.rollback(inner)
+    assert _dump(graph) == _dump(intermediate)
+
+    graph.rollback(outer)
+    assert _dump(graph) == _dump(original)
+
+def test_rollback_of_recipe_operations(graph_data):
+    original = copy.deepcopy(graph_data)
+    graph = as_graph(graph_data)
+    savepoint = graph.savepoint()
+
+    operations.delete_node(graph, "00000000-aaaa-4bbb-8ccc-000000000001", on_relations='cascade')
+    operations.delete_nodes_by_query(graph, {"type": "artifact"}, on_relations='keep')
+    operations.update_relations_by_query(graph, {"type": "link"}, {"weight": 3})
+    operations.rename_muids(graph, {"NODE_B": "NODE_C"})
+    graph.rollback(savepoint)
+
+    assert _dump(graph) == _dump(original)
+
+def test_unknown_savepoint_is_rejected(graph_data):
+    graph = as_graph(graph_data)
+    with pytest.raises(ValueError):
+        graph.rollback(0)
+    graph.savepoint()
+    with pytest.raises(ValueError):
+        graph.rollback(1)
+
+def test_diff_since_reports_net_changes(graph_data):
+    graph = as_graph(graph_data)
+    removed = graph.nodes[2]
+    updated = graph.nodes[3]
+    original_content = updated['content']
+
+    savepoint = graph.savepoint()
+    graph.add_node({"MUID": "TEMP", "type": "concept"})
+    graph.remove_node(graph.find_node("TEMP"))
+    graph.add_node({"MUID": "KEPT", "type": "concept"})
+    graph.update_node(updated, {"content": "changed"})
+    graph.update_node(removed, {"content": "changed before removal"})
+    graph.remove_node(removed)
+    graph['graph_version'] = '4.0'
+
+    diff = graph.diff_since(savepoint)
+    assert [node['MUID'] for node in diff['nodes']['added']] == ["KEPT"]
+    assert diff['nodes']['removed'] == [{**removed, "content": "Node 2"}]
+    assert diff['nodes']['removed_at'] == [2]
+    assert diff['nodes']['changed'] == [(updated, {"content": {"old": original_content, "new": "changed"}})]
+    assert diff['relations'] == {'added': [], 'removed': [], 'removed_at': [], 'changed': []}
+    assert diff['graph'] == {"graph_version": {"new": '4.0'}}
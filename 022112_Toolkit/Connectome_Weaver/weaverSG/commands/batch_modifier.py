@@ -6,18 +6,55 @@ This module implements the 'batch-modify' command for weaverSG.
 It processes a YAML recipe file containing a list of operations and applies them
 sequentially to a Semantic Graph.
 
+Operations modify the graph in place. Instead of copying the graph before each
+step, the graph's undo journal records what the steps touch, so a recipe that
+fails part-way is rolled back to its pre-recipe state in memory.
+
+The recipe is first compiled by the recipe planner (core/recipe_planner.py),
+which fuses consecutive per-entity steps into single passes over the nodes or
+relations. '--explain' prints that plan without touching the graph.
+
+With '--dry-run', the recipe is executed in memory only: the structural diff
+it would produce is printed, and no backup, save or log transaction is made.
+
+Streaming recipes (JSON lines, or multi-document YAML with one operation per
+document) are consumed as a generator and executed in chunks. With
+'--commit-every K', every K steps are committed as their own transaction,
+which records the recipe steps it covers ('recipe_progress'); '--resume'
+continues after the last step committed for the recipe's id.
+
+Recipes are idempotent: the content hash of a recipe's operations (including
+the bytes of the entity files its bulk actions read) is stored in its transaction, and a completed recipe is indexed in the LSG (see
+LSGManager.mark_recipe_applied). Applying a recipe whose id and hash are
+already indexed is skipped without executing a step, unless '--force' is given.
+
+With '--glob', the recipe is parsed once and applied to many SG files in
+parallel worker processes (see core/parallel_runner.py).
+
 Membra Open Development License (MODL) v1.0
 Copyright (c) Rustam Kunafin 2025. All rights reserved.
 Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
 """
 
-import copy
+import time
 from pathlib import Path
-from typing import Dict, Any, List, Callable, Tuple
+from typing import Dict, Any, List, Callable, Optional, Tuple, Iterator
 
 from ..core.lsg_manager import LSGManager
+from ..core import graph_delta
+from ..core import graph_diff
 from ..core import operations
+from ..core import parallel_runner
+from ..core import recipe_planner
 from ..core import utils
+from ..core.graph_model import as_graph
+
+# Bulk actions and their entity parameter: a list, or a .jsonl/.csv path relative to the recipe.
+BULK_ENTITY_PARAMS = {
+    'add_nodes': 'nodes',
+    'upsert_nodes': 'nodes',
+    'add_relations': 'relations',
+}
 
 def _execute_operation(
     graph_data: Dict[str, Any], op_details: Dict[str, Any]
@@ -52,6 +89,14 @@ def _execute_operation(
         'add_relation': operations.add_relation,
         'update_relation': operations.update_relation,
         'update_relations_by_query': operations.update_relations_by_query,
+        # Query-based operations (see core/query.py)
+        'update_nodes_by_query': operations.update_nodes_by_query,
+        'delete_nodes_by_query': operations.delete_nodes_by_query,
+        'delete_relations_by_query': operations.delete_relations_by_query,
+        # Bulk operations (entities inline or from a JSONL/CSV file)
+        'add_nodes': operations.add_nodes,
+        'upsert_nodes': operations.upsert_nodes,
+        'add_relations': operations.add_relations,
         'update_graph_properties': operations.update_graph_properties,
         # Restored schema migration operations
         'add_node_field': operations.add_node_field,
@@ -59,6 +104,7 @@ def _execute_operation(
         'set_field_from_generated_uuid': operations.set_field_from_generated_uuid,
         'add_lid_to_all_links': operations.add_lid_to_all_links,
         'update_relation_endpoints_after_muid_change': operations.update_relation_endpoints_after_muid_change,
+        'rename_muids': operations.rename_muids,
         # Alias for recipe compatibility
         'add_lid_to_links': operations.add_lid_to_all_links,
     }
@@ -69,78 +115,422 @@ def _execute_operation(
         raise operations.OperationError(f"Unknown action: '{action}'")
 
     params = op_details.get('params', {})
-    
-    # Store old state for the changeset (good practice, though currently unused in simplified changeset)
-    old_graph_data = copy.deepcopy(graph_data)
 
     # Execute the operation based on its specific signature
-    if action == 'update_relations_by_query':
+    if action in ('update_relations_by_query', 'update_nodes_by_query'):
         query = params.get('query')
         updates = params.get('updates')
         if not query or not updates:
-            raise operations.OperationError("Action 'update_relations_by_query' requires 'query' and 'updates' in params.")
+            raise operations.OperationError(f"Action '{action}' requires 'query' and 'updates' in params.")
         new_graph_data = handler(graph_data, query=query, updates=updates)
     elif action in ['add_lid_to_all_links', 'add_lid_to_links']:
         # This is a special case that doesn't fit the standard parameter model
         new_graph_data = handler(graph_data, id_generator_func=utils.generate_lid)
+    elif action == 'rename_muids':
+        # The resolved mapping (e.g. generated MUIDs) is logged, so the LSG can follow the renames
+        mapping = operations.resolve_muid_mapping(graph_data, **params)
+        new_graph_data = handler(graph_data, mapping=mapping)
+        changeset = _build_changeset(action, params)
+        changeset['renamed_entities'] = mapping
+        return new_graph_data, changeset
     else:
         # Generic handler for all other operations that accept params directly
         new_graph_data = handler(graph_data, **params)
 
-    # Create a simplified changeset for the log
-    changeset = {
+    return new_graph_data, _build_changeset(action, params)
+
+def _build_changeset(action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Creates the simplified changeset that is logged for one recipe step."""
+    entity_param = BULK_ENTITY_PARAMS.get(action)
+    if entity_param and isinstance(params, dict) and isinstance(params.get(entity_param), list):
+        # Inline entities of bulk actions are logged by count: the transaction's delta
+        # already holds every added entity, so the changeset does not copy them again.
+        params = {**params, entity_param: {"inline_count": len(params[entity_param])}}
+    return {
         "action": action,
         "params": params,
         "details": f"Executed batch action: {action}"
     }
-    
-    return new_graph_data, changeset
 
-def handle_batch_modify(file_path: Path, recipe_path: Path):
+def _execute_stage(graph_data: Dict[str, Any], stage: recipe_planner.PlanStage) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
     """
-    Handles the batch modification of an SG file based on a recipe.
+    Executes one stage of a recipe plan and generates the changesets of its steps.
+
+    Returns:
+        A tuple of the modified graph data and one changeset per recipe step.
+    """
+    if not stage.is_sweep:
+        position, op_details = stage.steps[0]
+        print(f"  - Executing step {position}: {op_details.get('action')}...")
+        new_graph_data, changeset = _execute_operation(graph_data, op_details)
+        return new_graph_data, [changeset]
+
+    first, last = stage.steps[0][0], stage.steps[-1][0]
+    print(f"  - Executing steps {first}-{last} in one pass over {stage.entity_type}s: {', '.join(stage.actions)}...")
+    new_graph_data = recipe_planner.run_sweep(graph_data, stage)
+    changesets = [_build_changeset(op['action'], op.get('params', {})) for _, op in stage.steps]
+    return new_graph_data, changesets
+
+def _resolve_entity_source(op_details: Any, recipe_dir: Path) -> None:
+    """Resolves the entity file of a bulk action relative to the recipe's directory."""
+    if not isinstance(op_details, dict) or not isinstance(op_details.get('params'), dict):
+        return
+    entity_param = BULK_ENTITY_PARAMS.get(op_details.get('action'))
+    source = op_details['params'].get(entity_param)
+    if isinstance(source, str) and not Path(source).is_absolute():
+        op_details['params'][entity_param] = str(recipe_dir / source)
+
+def _hashed_operations(operations_iter: Iterator[Any], recipe_dir: Path) -> Iterator[Any]:
+    """
+    Yields the operations of a recipe as they enter its content hash.
+
+    A bulk action that reads its entities from a file is extended with the file's
+    digest ('source_digest'), so rewriting the file changes the recipe's hash even
+    though the operation itself is unchanged.
+    """
+    for op_details in operations_iter:
+        if isinstance(op_details, dict) and isinstance(op_details.get('params'), dict):
+            source = op_details['params'].get(BULK_ENTITY_PARAMS.get(op_details.get('action')))
+            if isinstance(source, str):
+                source_path = Path(source) if Path(source).is_absolute() else recipe_dir / source
+                if source_path.is_file():
+                    op_details = {**op_details, 'source_digest': utils.file_digest(source_path)}
+        yield op_details
+
+def _recipe_hash(operations_iter: Iterator[Any], recipe_dir: Path) -> str:
+    """Computes the content hash of a recipe's operations and of the entity files they read."""
+    return utils.recipe_hash(_hashed_operations(operations_iter, recipe_dir))
+
+def _load_recipe(recipe_path: Path) -> Dict[str, Any]:
+    """
+    Loads a recipe file and checks that it holds a list of operations.
+
+    Entity files of bulk actions are resolved relative to the recipe's directory.
+    A streaming recipe is read completely. The content hash of the operations,
+    as written, and of the entity files they read is stored under 'content_hash'.
+    """
+    if utils.is_streaming_recipe(recipe_path):
+        header, operations_iter = utils.open_recipe_stream(recipe_path)
+        recipe = {**header, 'operations': list(operations_iter)}
+    else:
+        recipe = utils.load_yaml_file(recipe_path)
+    if not isinstance(recipe.get('operations'), list):
+        raise utils.RecipeFileError("Recipe must contain a list under the 'operations' key.")
+    recipe['content_hash'] = _recipe_hash(iter(recipe['operations']), recipe_path.parent)
+    for op_details in recipe['operations']:
+        _resolve_entity_source(op_details, recipe_path.parent)
+    return recipe
+
+def _print_plan(recipe: Dict[str, Any]) -> None:
+    """Prints the execution plan of a recipe (for '--explain')."""
+    print(f"Recipe '{recipe.get('id', 'unknown_batch_recipe')}':")
+    for line in recipe_planner.describe_plan(recipe_planner.plan_recipe(recipe['operations'])):
+        print(line)
+
+def _already_applied(lsg_manager: LSGManager, recipe_id: str, content_hash: str) -> bool:
+    """Checks the LSG's applied-recipe index and reports a recipe that is skipped."""
+    if lsg_manager.find_applied_recipe(recipe_id, content_hash) is None:
+        return False
+    print(f"Recipe '{recipe_id}' ({content_hash[:19]}...) was already applied to this graph. Skipping; use --force to re-apply.")
+    return True
+
+def apply_recipe_to_file(file_path: Path, recipe: Dict[str, Any], dry_run: bool = False, diff_limit: int = 50, force: bool = False) -> int:
+    """
+    Applies a loaded recipe to one SG file as a single logged transaction.
 
     Args:
         file_path (Path): The path to the main SG file.
-        recipe_path (Path): The path to the YAML recipe file.
+        recipe (Dict[str, Any]): The parsed recipe, with a list under 'operations'.
+        dry_run (bool): If True, the recipe runs in memory only and the resulting
+                        structural diff is printed; nothing is backed up, saved or logged.
+        diff_limit (int): The maximum number of diff entries listed per category (0 = all).
+        force (bool): If True, apply the recipe even if the LSG shows it was already applied.
+
+    Returns:
+        The number of operations applied (0 if the recipe has none or was already
+        applied; nothing is saved then).
+
+    Raises:
+        operations.OperationError: If an operation is unknown or fails. The in-memory
+                                   graph is rolled back and nothing is saved.
+        graph_io.GraphFileError: If the SG or LSG cannot be loaded or saved.
     """
-    print(f"Starting batch modification for '{file_path}' using recipe '{recipe_path}'.")
+    # Compile the recipe into passes over the graph
+    plan = recipe_planner.plan_recipe(recipe['operations'])
+
+    # Initialize the manager for the graph
+    lsg_manager = LSGManager(file_path)
+
+    recipe_id = recipe.get('id', 'unknown_batch_recipe')
+    content_hash = recipe.get('content_hash') or _recipe_hash(iter(recipe['operations']), Path.cwd())
+    if not force and not dry_run and _already_applied(lsg_manager, recipe_id, content_hash):
+        return 0
+
+    all_changesets = []
 
+    # Track the changes of all steps so that a failing recipe can be undone as a whole
+    sg_data = as_graph(lsg_manager.sg_data)
+    savepoint = sg_data.savepoint()
     try:
-        # Load the recipe first to fail early if it's invalid
-        recipe = utils.load_yaml_file(recipe_path)
-        operations_list = recipe.get('operations')
-        if not isinstance(operations_list, list):
-            raise utils.RecipeFileError("Recipe must contain a list under the 'operations' key.")
-
-        # Initialize the manager for the graph
-        lsg_manager = LSGManager(file_path)
-        
-        all_changesets = []
-        
-        # Sequentially execute each operation from the recipe
-        for i, op_details in enumerate(operations_list):
-            print(f"  - Executing step {i+1}: {op_details.get('action')}...")
-            
+        # Sequentially execute each stage (a single step or a fused sweep) of the plan
+        for stage in plan:
             # Pass the current state of the graph data to the executor
-            new_sg_data, changeset = _execute_operation(lsg_manager.sg_data, op_details)
-            
+            new_sg_data, changesets = _execute_stage(lsg_manager.sg_data, stage)
+
             # Update the manager's graph data with the new state
             lsg_manager.sg_data = new_sg_data
-            all_changesets.append(changeset)
-
-        # Record all accumulated changes as a single transaction
-        if all_changesets:
-            recipe_id = recipe.get('id', 'unknown_batch_recipe')
-            lsg_manager.record_transaction(all_changesets, recipe_id=recipe_id)
-            
-            # Save all changes to disk
-            lsg_manager.save_changes()
-            print(f"\nBatch modification successful. {len(all_changesets)} operation(s) applied and logged.")
+            all_changesets.extend(changesets)
+        if dry_run:
+            diff = sg_data.diff_since(savepoint)
         else:
-            print("\nRecipe contained no operations. No changes made.")
+            delta = graph_delta.compute_delta(sg_data, savepoint)
+    except Exception:
+        reverted = sg_data.rollback(savepoint)
+        lsg_manager.sg_data = sg_data
+        print(f"  - Recipe failed; rolled back {reverted} in-memory change(s).")
+        raise
+    finally:
+        sg_data.release_savepoints()
+
+    if dry_run:
+        print(f"\nDry run: {len(all_changesets)} operation(s) executed in memory. Structural diff:")
+        for line in graph_diff.describe_diff(diff, diff_limit):
+            print(f"  {line}")
+        print("No files were written and no transaction was recorded.")
+        return len(all_changesets)
+
+    # Record all accumulated changes as a single transaction
+    if all_changesets:
+        lsg_manager.record_transaction(all_changesets, recipe_id=recipe_id, delta=delta, attributes={'recipe_hash': content_hash})
+        lsg_manager.mark_recipe_applied(recipe_id, content_hash)
+
+        # Save all changes to disk
+        lsg_manager.save_changes()
+        print(f"\nBatch modification successful. {len(all_changesets)} operation(s) applied and logged.")
+    else:
+        print("\nRecipe contained no operations. No changes made.")
+    return len(all_changesets)
+
+def _find_recipe_progress(lsg_manager: LSGManager, recipe_id: str, content_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the progress recorded by the latest transaction of a recipe, or None
+    if the log has none. A transaction without 'recipe_progress' applied the whole
+    recipe at once and counts as complete.
+
+    Progress is matched by recipe id, so a recipe can be fixed and resumed; a
+    changed content hash is reported.
+    """
+    transactions = lsg_manager.lsg_data.lookup_nodes('type', 'Transaction') or []
+    for transaction in reversed(transactions):
+        if transaction.get('recipe_id') == recipe_id:
+            if transaction.get('recipe_hash', content_hash) != content_hash:
+                print(f"Warning: recipe '{recipe_id}' changed since transaction {transaction['MUID']}; resuming by step number.")
+            return transaction.get('recipe_progress') or {'complete': True}
+    return None
+
+def _chunks(operations_iter: Iterator[Dict[str, Any]], size: int, skip: int) -> Iterator[Tuple[int, List[Dict[str, Any]], bool]]:
+    """
+    Groups a stream of operations into chunks of at most 'size' (0 = one chunk),
+    after skipping the first 'skip' operations.
+
+    Yields:
+        (position of the chunk's first step, operations, whether it is the last chunk).
+    """
+    chunk: List[Dict[str, Any]] = []
+    first = skip + 1
+    position = 0
+    for position, op_details in enumerate(operations_iter, start=1):
+        if position <= skip:
+            continue
+        if size and len(chunk) == size:
+            yield first, chunk, False
+            chunk, first = [], position
+        chunk.append(op_details)
+    if chunk or position <= skip:
+        yield first, chunk, True
+
+def apply_recipe_stream(file_path: Path, recipe_path: Path, commit_every: int = 0, resume: bool = False,
+                        dry_run: bool = False, diff_limit: int = 50, force: bool = False) -> int:
+    """
+    Applies a streaming recipe to one SG file, committing every 'commit_every' steps.
+
+    Operations are read lazily and executed in chunks; each chunk is planned like
+    a recipe of its own (see recipe_planner.py) and, unless dry_run, recorded as
+    one transaction with its 'recipe_progress' ({first_step, last_step, complete})
+    and saved. A failing chunk is rolled back in memory; the chunks committed
+    before it stay, and '--resume' continues after them. The content hash is
+    computed in a first streaming pass over the recipe; the last chunk marks
+    the recipe as applied.
+
+    Args:
+        file_path (Path): The path to the main SG file.
+        recipe_path (Path): The path to the recipe file.
+        commit_every (int): The number of steps per transaction (0 = a single transaction).
+        resume (bool): If True, skip the steps already committed for the recipe's id.
+        dry_run (bool): If True, run every step in memory and only print the structural diff.
+        diff_limit (int): The maximum number of diff entries listed per category (0 = all).
+        force (bool): If True, apply the recipe even if the LSG shows it was already applied.
+
+    Returns:
+        The number of operations applied.
+
+    Raises:
+        utils.RecipeFileError: If the recipe cannot be read.
+        operations.OperationError: If an operation is unknown or fails.
+        graph_io.GraphFileError: If the SG or LSG cannot be loaded or saved.
+    """
+    content_hash = _recipe_hash(utils.open_recipe_stream(recipe_path)[1], recipe_path.parent)
+    header, operations_iter = utils.open_recipe_stream(recipe_path)
+    recipe_id = header.get('id', 'unknown_batch_recipe')
+    lsg_manager = LSGManager(file_path)
+    if not force and not dry_run and _already_applied(lsg_manager, recipe_id, content_hash):
+        return 0
+
+    skip = 0
+    if resume:
+        progress = _find_recipe_progress(lsg_manager, recipe_id, content_hash)
+        if progress is None:
+            print(f"No committed steps of recipe '{recipe_id}' found in the log. Starting from step 1.")
+        elif progress.get('complete'):
+            print(f"Recipe '{recipe_id}' was already applied completely. Nothing to resume.")
+            return 0
+        else:
+            skip = progress['last_step']
+            print(f"Resuming recipe '{recipe_id}' after step {skip}.")
+
+    sg_data = as_graph(lsg_manager.sg_data)
+    base = sg_data.savepoint() if dry_run else None
+    applied = commits = 0
+    try:
+        for first, chunk, is_last in _chunks(operations_iter, commit_every, skip):
+            last = first + len(chunk) - 1
+            steps = f"step {first}" if first == last else f"steps {first}-{last}"
+            for op_details in chunk:
+                _resolve_entity_source(op_details, recipe_path.parent)
+            savepoint = sg_data.savepoint()
+            changesets = []
+            try:
+                for stage in recipe_planner.plan_recipe(chunk, start=first):
+                    lsg_manager.sg_data, stage_changesets = _execute_stage(lsg_manager.sg_data, stage)
+                    changesets.extend(stage_changesets)
+                delta = None if dry_run else graph_delta.compute_delta(sg_data, savepoint)
+            except Exception:
+                reverted = sg_data.rollback(savepoint)
+                lsg_manager.sg_data = sg_data
+                print(f"  - {steps.capitalize()} failed; rolled back {reverted} in-memory change(s).")
+                if commits:
+                    print(f"  - Steps up to {first - 1} are committed. Re-run with --resume to continue from step {first}.")
+                raise
+            applied += len(changesets)
+            if dry_run or not changesets:
+                continue
+
+            progress = {'first_step': first, 'last_step': last, 'complete': is_last}
+            lsg_manager.record_transaction(
+                changesets, recipe_id=recipe_id, delta=delta,
+                attributes={'recipe_hash': content_hash, 'recipe_progress': progress}
+            )
+            if is_last:
+                lsg_manager.mark_recipe_applied(recipe_id, content_hash)
+            # Only the first commit backs up the SG as it was before the recipe.
+            lsg_manager.save_changes(backup=not commits)
+            sg_data.release_savepoints()
+            commits += 1
+            print(f"  - Committed {steps}.")
+
+        if dry_run:
+            diff = sg_data.diff_since(base)
+    finally:
+        sg_data.release_savepoints()
+
+    if dry_run:
+        print(f"\nDry run: {applied} operation(s) executed in memory. Structural diff:")
+        for line in graph_diff.describe_diff(diff, diff_limit):
+            print(f"  {line}")
+        print("No files were written and no transaction was recorded.")
+    elif applied:
+        print(f"\nBatch modification successful. {applied} operation(s) applied and logged in {commits} transaction(s).")
+    else:
+        print("\nRecipe contained no operations to apply. No changes made.")
+    return applied
+
+def handle_batch_modify(file_path: Path, recipe_path: Path, explain: bool = False, dry_run: bool = False, diff_limit: int = 50,
+                        commit_every: int = 0, resume: bool = False, force: bool = False):
+    """
+    Handles the batch modification of an SG file based on a recipe.
+
+    Streaming recipes, and any recipe run with commit_every or resume, are
+    executed by apply_recipe_stream().
+
+    Args:
+        file_path (Path): The path to the main SG file.
+        recipe_path (Path): The path to the YAML (or JSON-lines) recipe file.
+        explain (bool): If True, only print the execution plan of the recipe.
+        dry_run (bool): If True, only print the structural diff the recipe would produce.
+        diff_limit (int): The maximum number of diff entries listed per category (0 = all).
+        commit_every (int): Commit a transaction every this many steps (0 = one transaction).
+        resume (bool): If True, continue after the last step committed for the recipe.
+        force (bool): If True, apply the recipe even if it was already applied.
+    """
+    print(f"Starting batch modification for '{file_path}' using recipe '{recipe_path}'.")
+
+    try:
+        if not explain and (commit_every or resume or utils.is_streaming_recipe(recipe_path)):
+            apply_recipe_stream(file_path, recipe_path, commit_every=commit_every, resume=resume,
+                                dry_run=dry_run, diff_limit=diff_limit, force=force)
+            return
+
+        # Load the recipe first to fail early if it's invalid
+        recipe = _load_recipe(recipe_path)
+        if explain:
+            _print_plan(recipe)
+            return
+
+        apply_recipe_to_file(file_path, recipe, dry_run=dry_run, diff_limit=diff_limit, force=force)
 
     except (utils.RecipeFileError, operations.OperationError, FileNotFoundError) as e:
         print(f"\nAn error occurred during batch modification: {e}")
     except Exception as e:
         print(f"\nAn unexpected error occurred: {e}")
+
+def handle_batch_modify_glob(pattern: str, recipe_path: Path, jobs: Optional[int] = None, explain: bool = False,
+                             dry_run: bool = False, diff_limit: int = 50, force: bool = False):
+    """
+    Applies a recipe to every SG file matching a glob pattern, in parallel.
+
+    The recipe is parsed once. Each file is modified in its own worker process as
+    its own transaction; a per-file summary is printed at the end.
+
+    Args:
+        pattern (str): A glob pattern for the SG files, e.g. 'graphs/**/*.md'.
+        recipe_path (Path): The path to the YAML recipe file.
+        jobs (Optional[int]): The number of worker processes (default: CPU count).
+        explain (bool): If True, only print the execution plan of the recipe.
+        dry_run (bool): If True, only print the structural diff the recipe would produce per file.
+        diff_limit (int): The maximum number of diff entries listed per category (0 = all).
+        force (bool): If True, apply the recipe even to files where it was already applied.
+    """
+    print(f"Starting batch modification for files matching '{pattern}' using recipe '{recipe_path}'.")
+
+    try:
+        recipe = _load_recipe(recipe_path)
+        # Compile once up front so that an invalid recipe fails before any file is touched
+        recipe_planner.plan_recipe(recipe['operations'])
+        if explain:
+            _print_plan(recipe)
+            return
+        files = parallel_runner.find_graph_files(pattern)
+    except (utils.RecipeFileError, operations.OperationError, parallel_runner.NoMatchingFilesError) as e:
+        print(f"\nAn error occurred during batch modification: {e}")
+        return
+    except Exception as e:
+        print(f"\nAn unexpected error occurred: {e}")
+        return
+
+    print(f"Applying the recipe to {len(files)} file(s)...")
+    started = time.perf_counter()
+    results = parallel_runner.run_for_files(apply_recipe_to_file, files, jobs, recipe, dry_run, diff_limit, force)
+    parallel_runner.print_summary(
+        results, time.perf_counter() - started,
+        describe=lambda applied: f"{applied} operation(s) applied"
+    )
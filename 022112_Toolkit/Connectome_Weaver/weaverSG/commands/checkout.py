@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+checkout.py
+
+This module implements the 'checkout' command for weaverSG.
+It reconstructs the state of a Semantic Graph as it was right after a given
+transaction (or at a given point in time) and writes it to a separate file.
+The SG file and its log are left untouched.
+
+The history is read from the LSG, following the breadcrumb transactions that
+'archive-log' leaves at the start of each new log back through the archived
+logs. The state is rebuilt by replaying the recorded transaction deltas from
+the nearest known state: the current SG (replayed backwards) or one of the
+checkpoints written by the LSGManager (replayed in either direction).
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from ..core import checkpoints
+from ..core import graph_delta
+from ..core import graph_io
+from ..core.lsg_manager import LSGManager, LAST_TRANSACTION_KEY
+
+# Log-management actions that change the log but not the graph's state.
+LOG_ACTIONS = ('archive_log', 'log_bundled', 'log_detached')
+
+# Reconstructed graphs are full copies of an SG (same MUIDs), so by default they
+# go to a hidden directory that --glob and --root scans do not enter.
+CHECKOUT_DIR_NAME = '.weaver_checkouts'
+
+
+class CheckoutError(Exception):
+    """Raised when the requested state cannot be reconstructed."""
+    pass
+
+
+# --- History ---
+
+def _transactions_of(log_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [node for node in log_data.get('nodes', []) if node.get('type') == 'Transaction']
+
+def _archive_breadcrumb(transactions: List[Dict[str, Any]]) -> Optional[str]:
+    """Returns the archive file named by the breadcrumb transaction that starts a log, if any."""
+    if not transactions:
+        return None
+    for change in transactions[0].get('changeset', []):
+        if change.get('action') == 'archive_log':
+            return change.get('details', {}).get('archive_file')
+    return None
+
+def _resolve_archive(sg_path: Path, archive_file: str) -> Optional[Path]:
+    """Finds an archived log, as recorded or (if the files were moved) next to the SG."""
+    for candidate in (Path(archive_file), sg_path.parent / Path(archive_file).name):
+        if candidate.is_file():
+            return candidate
+    return None
+
+def collect_transactions(sg_path: Path, log_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Returns the full transaction history of an SG, oldest first.
+
+    Archived logs are followed through their breadcrumbs, so the history spans
+    every log the SG has had. A missing archive ends the history there.
+
+    Args:
+        sg_path (Path): The path to the main SG file.
+        log_data (Dict[str, Any]): The current log graph.
+
+    Returns:
+        The Transaction nodes in the order they were recorded.
+    """
+    segments = [_transactions_of(log_data)]
+    seen = set()
+    archive_file = _archive_breadcrumb(segments[0])
+    while archive_file:
+        archive_path = _resolve_archive(sg_path, archive_file)
+        if archive_path is None:
+            print(f"Warning: archived log '{archive_file}' not found; earlier history is unavailable.")
+            break
+        if archive_path.resolve() in seen:
+            break
+        seen.add(archive_path.resolve())
+        _, archive_data = graph_io.load_graph_from_file(archive_path)
+        segments.append(_transactions_of(archive_data))
+        archive_file = _archive_breadcrumb(segments[-1])
+    return [transaction for segment in reversed(segments) for transaction in segment]
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parses an ISO 8601 timestamp as a naive local time, as transactions record it."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
+
+def resolve_target(transactions: List[Dict[str, Any]], at: str) -> int:
+    """
+    Resolves a transaction ID or a timestamp to a position in the history.
+
+    Args:
+        transactions (List[Dict[str, Any]]): The history, oldest first.
+        at (str): A transaction MUID, or an ISO 8601 timestamp meaning the latest
+                  transaction recorded at or before it.
+
+    Returns:
+        The number k of transactions whose effects make up the state, i.e. the
+        state right after transactions[k - 1] (0 is the state before the first).
+
+    Raises:
+        CheckoutError: If 'at' is neither a known transaction nor a timestamp.
+    """
+    for index, transaction in enumerate(transactions):
+        if transaction.get('MUID') == at:
+            return index + 1
+    try:
+        moment = _parse_timestamp(at)
+    except ValueError:
+        raise CheckoutError(f"'{at}' is neither a transaction in the log nor an ISO 8601 timestamp.")
+    target = 0
+    for index, transaction in enumerate(transactions):
+        try:
+            recorded = _parse_timestamp(transaction.get('timestamp', ''))
+        except (TypeError, ValueError):
+            continue
+        if recorded <= moment:
+            target = index + 1
+    return target
+
+
+# --- Replay ---
+
+def _is_neutral(transaction: Dict[str, Any]) -> bool:
+    """Whether a transaction without a delta is known not to change the graph's state."""
+    changeset = transaction.get('changeset', [])
+    return bool(changeset) and all(change.get('action') in LOG_ACTIONS for change in changeset)
+
+def _replay_cost(transactions: List[Dict[str, Any]], start: int, target: int) -> Optional[int]:
+    """Returns the number of deltas to replay between two positions, or None if a transaction has no delta."""
+    cost = 0
+    for transaction in transactions[min(start, target):max(start, target)]:
+        if 'delta' in transaction:
+            cost += 1
+        elif not _is_neutral(transaction):
+            return None
+    return cost
+
+def _replay(graph_data: Dict[str, Any], transactions: List[Dict[str, Any]], start: int, target: int) -> Dict[str, Any]:
+    """Moves a state from one position in the history to another by applying deltas."""
+    if start <= target:
+        for transaction in transactions[start:target]:
+            if 'delta' in transaction:
+                graph_data = graph_delta.apply_delta(graph_data, transaction['delta'])
+    else:
+        for transaction in reversed(transactions[target:start]):
+            if 'delta' in transaction:
+                graph_data = graph_delta.apply_delta(graph_data, graph_delta.invert_delta(transaction['delta']))
+    return graph_data
+
+def _sources(sg_path: Path, lsg_manager: LSGManager, transactions: List[Dict[str, Any]]) -> List[Tuple[int, str, Callable[[], Dict[str, Any]]]]:
+    """Returns the known states as (position, label, loader): the current SG and every usable checkpoint."""
+    sources = [(len(transactions), "current SG", lambda: checkpoints.graph_state(lsg_manager.sg_data))]
+    positions = {transaction.get('MUID'): index + 1 for index, transaction in enumerate(transactions)}
+    for tid, path in checkpoints.list_checkpoints(sg_path).items():
+        if tid in positions:
+            sources.append((positions[tid], f"checkpoint {path.name}", lambda path=path: checkpoints.read_checkpoint(path)['graph_data']))
+    return sources
+
+def reconstruct(sg_path: Path, lsg_manager: LSGManager, transactions: List[Dict[str, Any]], target: int) -> Tuple[Dict[str, Any], str, int]:
+    """
+    Rebuilds the state of the SG after the first 'target' transactions.
+
+    The known states are tried in order of the number of deltas to replay; a
+    state whose replay fails (e.g. an SG edited outside weaverSG) is skipped.
+
+    Returns:
+        A tuple (graph_data, source label, number of deltas replayed).
+
+    Raises:
+        CheckoutError: If no known state can reach the target.
+    """
+    candidates = []
+    for position, label, loader in _sources(sg_path, lsg_manager, transactions):
+        cost = _replay_cost(transactions, position, target)
+        if cost is not None:
+            candidates.append((cost, position, label, loader))
+    if not candidates:
+        raise CheckoutError("No checkpoint or current state can reach the target: a transaction in between has no recorded delta.")
+
+    for cost, position, label, loader in sorted(candidates, key=lambda candidate: candidate[0]):
+        try:
+            return _replay(loader(), transactions, position, target), label, cost
+        except (graph_delta.DeltaError, checkpoints.CheckpointError) as e:
+            print(f"Warning: could not replay from {label}: {e}")
+    raise CheckoutError("Every known state failed to replay to the target.")
+
+
+# --- Command ---
+
+def handle_checkout(file_path: Path, at: str, output: Optional[Path] = None):
+    """
+    Handles the reconstruction of a past state of the given SG file.
+
+    Args:
+        file_path (Path): The path to the main SG file.
+        at (str): A transaction MUID, or an ISO 8601 timestamp.
+        output (Optional[Path]): Where to write the reconstructed graph. Defaults to
+                                 '.weaver_checkouts/<name>_at_<transaction>.md' next to the SG.
+    """
+    print(f"Starting checkout of '{at}' for: {file_path}")
+
+    try:
+        lsg_manager = LSGManager(file_path)
+        transactions = collect_transactions(file_path, lsg_manager.lsg_data)
+        if not transactions:
+            print("The log has no transactions. Nothing to check out.")
+            return
+
+        target = resolve_target(transactions, at)
+        label = transactions[target - 1]['MUID'] if target else "initial"
+        if output is None:
+            output = file_path.parent / CHECKOUT_DIR_NAME / f"{file_path.stem}_at_{label}{file_path.suffix}"
+        if output.resolve() == file_path.resolve():
+            print("Error: the output file must differ from the SG file.")
+            return
+
+        graph_data, source, replayed = reconstruct(file_path, lsg_manager, transactions, target)
+        if target:
+            transaction = transactions[target - 1]
+            print(f"Reconstructed the state after transaction {transaction['MUID']} ({transaction.get('timestamp')}).")
+        else:
+            print("Reconstructed the state before the first recorded transaction.")
+        print(f"Started from the {source} and replayed {replayed} delta(s).")
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # The reconstructed graph has no log, so it does not carry the SG's last transaction.
+        metadata = {key: value for key, value in lsg_manager.sg_metadata.items() if key != LAST_TRANSACTION_KEY}
+        graph_io.save_graph_to_file(output, metadata, graph_data)
+        print(f"Successfully saved the reconstructed graph to: {output}")
+
+    except CheckoutError as e:
+        print(f"\nError: {e}")
+    except graph_io.GraphFileError as e:
+        print(f"\nAn error occurred during checkout: {e}")
+    except Exception as e:
+        print(f"\nAn unexpected error occurred during checkout: {e}")
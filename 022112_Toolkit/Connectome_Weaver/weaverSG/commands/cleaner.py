@@ -4,7 +4,8 @@ cleaner.py
 
 This module implements the 'cleanup-backups' command for weaverSG.
 Its purpose is to find and safely delete timestamped backup files (*_backup_*.md)
-that are created by the LSGManager during save operations. It supports both
+that are created by the LSGManager during save operations, together with the
+checkpoints it writes under '.weaver_checkpoints'. It supports both
 interactive and automated (non-interactive) modes.
 
 Membra Open Development License (MODL) v1.0
@@ -16,6 +17,8 @@ import os
 from pathlib import Path
 from typing import List
 
+from ..core import checkpoints
+
 def find_backup_files(directory: Path) -> List[Path]:
     """
     Finds all weaverSG backup files in a given directory.
@@ -33,11 +36,36 @@ def find_backup_files(directory: Path) -> List[Path]:
     pattern = "*_backup_*.md"
     return list(directory.glob(pattern))
 
+def find_checkpoint_files(directory: Path) -> List[Path]:
+    """
+    Finds the checkpoints of all SGs in a given directory.
+
+    Checkpoints are stored as '.weaver_checkpoints/<SG name>/<TID>.json.gz'.
+
+    Args:
+        directory (Path): The directory to search in.
+
+    Returns:
+        A list of Path objects for all found checkpoint files.
+    """
+    return sorted((directory / checkpoints.CHECKPOINT_DIR_NAME).glob("*/*.json.gz"))
+
+def _remove_empty_checkpoint_dirs(directory: Path) -> None:
+    """Removes the checkpoint directories that the cleanup left empty."""
+    root = directory / checkpoints.CHECKPOINT_DIR_NAME
+    if not root.is_dir():
+        return
+    for sg_dir in root.iterdir():
+        if sg_dir.is_dir() and not any(sg_dir.iterdir()):
+            sg_dir.rmdir()
+    if not any(root.iterdir()):
+        root.rmdir()
+
 def handle_cleanup(file_path: Path, auto_confirm: bool = False):
     """
     Handles the backup cleanup process for the directory of the given file.
 
-    It finds all backup files, asks for user confirmation (unless auto_confirm
+    It finds all backup files and checkpoints, asks for user confirmation (unless auto_confirm
     is True), and then deletes them.
 
     Args:
@@ -50,14 +78,17 @@ def handle_cleanup(file_path: Path, auto_confirm: bool = False):
     print(f"Searching for backup files in: {target_directory}")
 
     backup_files = find_backup_files(target_directory)
+    checkpoint_files = find_checkpoint_files(target_directory)
 
-    if not backup_files:
+    if not backup_files and not checkpoint_files:
         print("No backup files found. Nothing to do.")
         return
 
     print("\nThe following backup files will be deleted:")
     for bf in backup_files:
         print(f"  - {bf.name}")
+    if checkpoint_files:
+        print(f"  - {len(checkpoint_files)} checkpoint(s) in {checkpoints.CHECKPOINT_DIR_NAME}/")
 
     # If not in auto-confirm mode, ask the user for confirmation.
     if not auto_confirm:
@@ -85,5 +116,18 @@ def handle_cleanup(file_path: Path, auto_confirm: bool = False):
         except OSError as e:
             print(f"  - Error deleting {bf.name}: {e}")
             error_count += 1
+    for cf in checkpoint_files:
+        try:
+            cf.unlink()
+            deleted_count += 1
+        except OSError as e:
+            print(f"  - Error deleting {cf}: {e}")
+            error_count += 1
+    if checkpoint_files:
+        print(f"  - Deleted checkpoints in {checkpoints.CHECKPOINT_DIR_NAME}/")
+        try:
+            _remove_empty_checkpoint_dirs(target_directory)
+        except OSError:
+            pass
     
     print(f"\nCleanup complete. {deleted_count} file(s) deleted, {error_count} error(s).")
@@ -6,7 +6,10 @@ This module implements the 'archive-log' command for weaverSG.
 It safely archives the current Log Semantic Graph (LSG) file by renaming it
 with a timestamp. It then creates a new, empty LSG file and adds an initial
 transaction that points to the archived file, ensuring the chain of history
-is maintained.
+is maintained. A pending log journal is compacted into the LSG file first.
+The SG's checkpoints all follow transactions of the archived log (or of
+earlier ones) and are deleted; 'checkout' can still reach those states by
+replaying the archived logs.
 
 Membra Open Development License (MODL) v1.0
 Copyright (c) Rustam Kunafin 2025. All rights reserved.
@@ -17,7 +20,9 @@ import os
 from pathlib import Path
 from datetime import datetime
 
+from ..core import checkpoints
 from ..core import graph_io
+from ..core.lsg_manager import LSGManager
 from ..core import utils
 from ..core import operations
 
@@ -31,6 +36,16 @@ def handle_archive_log(file_path: Path):
     print(f"Starting log archival process for: {file_path}")
 
     lsg_path = file_path.with_name(f"LSG_{file_path.name}")
+    journal_path = lsg_path.with_name(f"{lsg_path.stem}.journal.jsonl")
+
+    # Journaled transactions belong to the log being archived, so fold them in first.
+    if journal_path.is_file():
+        try:
+            LSGManager(file_path).compact_log()
+            print(f"Compacted log journal into {lsg_path} before archiving.")
+        except Exception as e:
+            print(f"\nAn error occurred while compacting the log journal: {e}")
+            return
 
     if not lsg_path.is_file():
         print(f"Log file not found at {lsg_path}. Nothing to archive.")
@@ -79,6 +94,10 @@ def handle_archive_log(file_path: Path):
         print(f"Created new empty log file at: {lsg_path}")
         print("A breadcrumb transaction pointing to the archive has been added.")
 
+        removed = checkpoints.prune_checkpoints(file_path, 0)
+        if removed:
+            print(f"Removed {len(removed)} checkpoint(s) of the archived log.")
+
     except OSError as e:
         print(f"\nAn OS error occurred during file operation: {e}")
     except Exception as e:
@@ -44,7 +44,7 @@ def handle_bundle_log(file_path: Path):
             print("Error: Graph file already contains a bundled log ('log_history'). Cannot bundle.")
             return
         
-        if not lsg_manager.lsg_path.is_file():
+        if not lsg_manager.lsg_path.is_file() and not lsg_manager.journal_path.is_file():
             print(f"Error: Log file not found at {lsg_manager.lsg_path}. Nothing to bundle.")
             return
 
@@ -68,8 +68,9 @@ def handle_bundle_log(file_path: Path):
         graph_io.save_graph_to_file(lsg_manager.sg_path, lsg_manager.sg_metadata, lsg_manager.sg_data)
         print(f"Successfully saved bundled graph to: {lsg_manager.sg_path}")
 
-        # 4. Delete the now-redundant external LSG file
-        lsg_manager.lsg_path.unlink()
+        # 4. Delete the now-redundant external LSG file and its journal
+        lsg_manager.lsg_path.unlink(missing_ok=True)
+        lsg_manager.journal_path.unlink(missing_ok=True)
         print(f"Successfully deleted external log file: {lsg_manager.lsg_path}")
         
     except Exception as e:
@@ -94,7 +95,7 @@ def handle_detach_log(file_path: Path):
             print("Error: No 'log_history' found in the graph file. Nothing to detach.")
             return
             
-        if lsg_manager.lsg_path.is_file():
+        if lsg_manager.lsg_path.is_file() or lsg_manager.journal_path.is_file():
             print(f"Error: An external log file already exists at {lsg_manager.lsg_path}. Cannot detach.")
             return
 
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+log_compactor.py
+
+This module implements the 'compact-log' command for weaverSG.
+Transactions are committed by appending them to the LSG's JSON-lines journal
+('LSG_<name>.journal.jsonl'). This command folds the journal back into the
+canonical 'LSG_<name>.md' graph file and removes the journal.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+from pathlib import Path
+
+from ..core.lsg_manager import LSGManager
+from ..core import graph_io
+
+def handle_compact_log(file_path: Path):
+    """
+    Handles the compaction of the LSG journal associated with the given SG file.
+
+    Args:
+        file_path (Path): The path to the main SG file.
+    """
+    print(f"Starting log compaction for: {file_path}")
+
+    try:
+        lsg_manager = LSGManager(file_path)
+
+        if lsg_manager.is_log_bundled:
+            print("The log is bundled into the graph file. Nothing to compact.")
+            return
+
+        if not lsg_manager.journal_path.is_file():
+            print(f"No log journal found at {lsg_manager.journal_path}. Nothing to compact.")
+            return
+
+        lsg_manager.compact_log()
+        print(f"Successfully compacted log journal into: {lsg_manager.lsg_path}")
+
+    except graph_io.GraphFileError as e:
+        print(f"\nAn error occurred during log compaction: {e}")
+    except Exception as e:
+        print(f"\nAn unexpected error occurred during log compaction: {e}")
@@ -12,29 +12,27 @@ Copyright (c) Rustam Kunafin 2025. All rights reserved.
 Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
 """
 
-import copy
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional
 
 from ..core.lsg_manager import LSGManager
+from ..core import graph_delta
 from ..core import operations
 from ..core import utils
+from ..core.graph_model import as_graph
 
-def _find_relation_by_lid(graph_data: Dict[str, Any], lid: str) -> Optional[Tuple[Dict[str, Any], int]]:
+def _find_relation_by_lid(graph_data: Dict[str, Any], lid: str) -> Optional[Dict[str, Any]]:
     """
-    Finds a relation and its index by its LID.
+    Finds a relation by its LID using the graph's LID index.
 
     Args:
         graph_data: The dictionary representing the graph.
         lid: The Link ID (LID) of the relation to find.
 
     Returns:
-        A tuple containing the relation dictionary and its index, or None if not found.
+        The relation dictionary, or None if not found.
     """
-    for i, relation in enumerate(graph_data.get('relations', [])):
-        if relation.get('LID') == lid:
-            return relation, i
-    return None
+    return as_graph(graph_data).find_relation(lid)
 
 def handle_promote_relation(file_path: Path, lid: str):
     """
@@ -50,12 +48,10 @@ def handle_promote_relation(file_path: Path, lid: str):
         lsg_manager = LSGManager(file_path)
 
         # Find the target relation
-        find_result = _find_relation_by_lid(lsg_manager.sg_data, lid)
-        if find_result is None:
+        original_relation = _find_relation_by_lid(lsg_manager.sg_data, lid)
+        if original_relation is None:
             raise operations.RelationNotFoundError(f"Relation with LID '{lid}' not found.")
         
-        original_relation, _ = find_result
-        
         # Validate that it's a promotable 'link'
         if original_relation.get('class') != 'link':
             raise operations.OperationError(
@@ -70,25 +66,22 @@ def handle_promote_relation(file_path: Path, lid: str):
             "legacy_LID": lid
         }
         
-        # Create a deep copy for the changeset to record the state before the update
-        old_state = copy.deepcopy(original_relation)
-        new_state = copy.deepcopy(original_relation)
-        new_state.update(updates)
-
         changeset = [{
             "action": "promote_relation",
             "entity_id": lid,
             "entity_type": "relation",
-            "details": f"Promoted link {lid} to bind {new_muid}",
-            "old_state": old_state,
-            "new_state": new_state
+            "details": f"Promoted link {lid} to bind {new_muid}"
         }]
 
-        # Apply the update using the operations module
-        lsg_manager.sg_data = operations.update_relation(lsg_manager.sg_data, lid, updates)
-        
+        # Apply the update using the operations module, recording the changed fields
+        sg_data = as_graph(lsg_manager.sg_data)
+        savepoint = sg_data.savepoint()
+        lsg_manager.sg_data = operations.update_relation(sg_data, lid, updates)
+        delta = graph_delta.compute_delta(sg_data, savepoint)
+        sg_data.release_savepoints()
+
         # Record the transaction
-        lsg_manager.record_transaction(changeset, recipe_id="promote_relation")
+        lsg_manager.record_transaction(changeset, recipe_id="promote_relation", delta=delta)
 
         # Save all changes
         lsg_manager.save_changes()
@@ -12,137 +12,342 @@ Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440
 """
 
 import json
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Optional, Set
 from collections import defaultdict
 import copy
 
 # Assuming lsg_manager and operations are available from parent packages
 from ..core.lsg_manager import LSGManager
+from ..core import corpus_index
+from ..core import graph_delta
 from ..core import graph_io
 from ..core import operations
+from ..core import parallel_runner
+from ..core import utils
+from ..core.graph_model import as_graph
+from ..core import validation_rules
+from ..core.validation_rules import (
+    ValidationRule, alias_duplicate_issues, dangling_relation_issue, duplicate_node_issue,
+    duplicate_relation_issue, index_nodes, relation_signature
+)
+from .checkout import LOG_ACTIONS
+
+# The graph key holding the last transaction covered by 'validation_issues'.
+WATERMARK_KEY = "validation_watermark"
+VALIDATION_RECIPE_ID = "validation_run"
 
 # --- Private Validation Functions ---
 
-def _find_duplicate_nodes(nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Finds duplicate nodes and reports them in the v3 issue format."""
+def _validate_full(graph_data: Dict[str, Any], rules: Optional[List[ValidationRule]] = None,
+                   timings: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Runs the given rules (default: the default rules) over the whole graph."""
+    if rules is None:
+        rules = validation_rules.select_rules()
+    return validation_rules.run_rules(graph_data, rules, timings)
+
+def _merge_unselected(old_issues: List[Dict[str, Any]], new_issues: List[Dict[str, Any]],
+                      selected: List[ValidationRule]) -> List[Dict[str, Any]]:
     """
-    Finds duplicate nodes based on MUID (strict duplicates) and alias (potential pre-migration duplicates).
-    Reports them in the v3 issue format.
+    Combines the issues of the rules just run with the stored issues of the rules
+    that were not, in rule order; issues of rules no longer registered come last.
     """
-    issues = []
-
-    # --- Check for strict duplicates by MUID ---
-    muid_groups = defaultdict(list)
-    for i, node in enumerate(nodes):
-        if 'MUID' in node:
-            muid_groups[node['MUID']].append(i)
-
-    for muid, indices in muid_groups.items():
-        if len(indices) > 1:
-            # For strict duplicates by MUID, report as ERROR
-            issue_details = {
-                "node_signature": {"MUID": muid},
-                "first_occurrence": nodes[indices[0]],
-                "duplicate_indices": indices
-            }
-            count = len(indices)
-            issues.append({
-                "issue_code": "DUPLICATE_NODE",
-                "severity": "ERROR", # Strict duplicates are errors
-                "message": f"Обнаружено {count} узла(ов) с одинаковым MUID.",
-                "details": issue_details
-            })
-
-    # --- Check for potential pre-migration duplicates by alias ---
-    # Only check if 'alias' field exists in at least one node (present after schema migration)
-    if any('alias' in node and node['alias'] for node in nodes):
-        alias_groups = defaultdict(list)
-        for i, node in enumerate(nodes):
-            # Group by non-empty alias
-            if 'alias' in node and node['alias']:
-                 # Store MUID and index for nodes with this alias
-                alias_groups[node['alias']].append({'muid': node.get('MUID'), 'index': i})
-
-        for alias_value, node_infos in alias_groups.items():
-            # A potential duplicate group exists if more than one node shares the same alias
-            # AND not all nodes in the group have the same MUID (which would be a strict MUID duplicate, already caught above)
-            if len(node_infos) > 1 and len(set(ni['muid'] for ni in node_infos if ni['muid'])) > 1:
-                # For potential duplicates by alias, report as WARNING
-                issue_details = {
-                    "alias_signature": {"alias": alias_value},
-                    "nodes_info": node_infos # List of {'muid': ..., 'index': ...} for nodes with this alias
-                }
-                count = len(node_infos)
-                issues.append({
-                    "issue_code": "POTENTIAL_PRE_MIGRATION_DUPLICATE",
-                    "severity": "WARNING", # Potential duplicates are warnings
-                    "message": f"Обнаружено {count} узла(ов) с одинаковым alias (вероятно, дубликаты до миграции).",
-                    "details": issue_details
-                })
-    return issues
+    selected_codes = {rule.issue_code for rule in selected}
+    issues_by_code = defaultdict(list)
+    for issue in old_issues:
+        if issue.get('issue_code') not in selected_codes:
+            issues_by_code[issue.get('issue_code')].append(issue)
+    for issue in new_issues:
+        issues_by_code[issue['issue_code']].append(issue)
+    merged = []
+    for code in dict.fromkeys(rule.issue_code for rule in validation_rules.get_rules()):
+        merged.extend(issues_by_code.pop(code, []))
+    for issues in issues_by_code.values():
+        merged.extend(issues)
+    return merged
 
-def _find_duplicate_relations(relations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Finds duplicate relations and reports them in the v3 issue format."""
-    issues = []
-    relation_signatures = defaultdict(list)
-    for i, rel in enumerate(relations):
-        signature = (rel.get('from_MUID'), rel.get('to_MUID'), rel.get('type'))
-        relation_signatures[signature].append(i)
-
-    for sig, indices in relation_signatures.items():
-        if len(indices) > 1:
-            issue_details = {
-                "relation_signature": {
-                    "from_MUID": sig[0],
-                    "to_MUID": sig[1],
-                    "type": sig[2]
-                },
-                "first_occurrence": relations[indices[0]],
-                "duplicate_indices": indices
-            }
-            count = len(indices)
-            issues.append({
-                "issue_code": "DUPLICATE_RELATION",
-                "severity": "ERROR",
-                "message": f"Обнаружено {count} идентичных связей.",
-                "details": issue_details
-            })
-    return issues
+# --- Incremental Validation ---
 
-def _find_dangling_relations(nodes: List[Dict[str, Any]], relations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Checks for relations pointing to non-existent nodes, reports in v3 format."""
-    issues = []
-    existing_muids: Set[str] = {node['MUID'] for node in nodes if 'MUID' in node}
-    
-    for i, rel in enumerate(relations):
-        dangling_endpoints = []
-        from_muid = rel.get('from_MUID')
-        to_muid = rel.get('to_MUID')
-
-        if from_muid and from_muid not in existing_muids:
-            dangling_endpoints.append({"direction": "from", "muid": from_muid})
-        
-        if to_muid and to_muid not in existing_muids:
-            dangling_endpoints.append({"direction": "to", "muid": to_muid})
-
-        if dangling_endpoints:
-            issue_details = {
-                "relation": rel,
-                "relation_index": i,
-                "dangling_endpoints": dangling_endpoints
-            }
-            issues.append({
-                "issue_code": "DANGLING_RELATION",
-                "severity": "ERROR",
-                "message": "Связь ссылается на несуществующий узел.",
-                "details": issue_details
-            })
-    return issues
+def _changes_since(lsg_manager: LSGManager, watermark: Any) -> Optional[Dict[str, Set[Any]]]:
+    """
+    Collects what the transactions recorded after the watermark added or changed.
+
+    Returns:
+        The identifiers touched since the watermark (see graph_delta.touched_identifiers),
+        or None if only a full run can be trusted: the watermark is missing or no
+        longer in the log (e.g. archived), a transaction has no delta or removes a
+        node or relation, or the stored issues were changed by something else than
+        a validation run.
+    """
+    if not isinstance(watermark, dict) or not watermark.get('transaction'):
+        return None
+    # Nothing was saved since the watermark: no need to load the log.
+    if watermark['transaction'] == lsg_manager.saved_last_transaction_id():
+        return {'muids': set(), 'lids': set()}
+    transactions = lsg_manager.lsg_data.lookup_nodes('type', 'Transaction') or []
+    positions = [index for index, transaction in enumerate(transactions) if transaction.get('MUID') == watermark['transaction']]
+    if not positions:
+        return None
+
+    changes: Dict[str, Set[Any]] = {'muids': set(), 'lids': set()}
+    for transaction in transactions[positions[-1] + 1:]:
+        if 'delta' not in transaction:
+            changeset = transaction.get('changeset', [])
+            if changeset and all(change.get('action') in LOG_ACTIONS for change in changeset):
+                continue
+            return None
+        touched = graph_delta.touched_identifiers(transaction['delta'])
+        if touched is None:
+            return None
+        if transaction.get('recipe_id') != VALIDATION_RECIPE_ID and touched['keys'] & {'validation_issues', WATERMARK_KEY}:
+            return None
+        changes['muids'] |= touched['muids']
+        changes['lids'] |= touched['lids']
+    return changes
+
+def _validate_incremental(graph_data: Dict[str, Any], old_issues: List[Dict[str, Any]], changes: Dict[str, Set[Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Re-checks only the entities touched since the last validation and merges the
+    result into its issues.
+
+    The touched nodes and their incident relations are re-checked, and so are the
+    duplicate groups they belonged to. As nothing was removed since the watermark,
+    the list positions of the untouched entities (and so their issues) are
+    unchanged, and the merged list equals the result of a full run.
+
+    Returns:
+        The merged issues, or None if a full run is needed instead.
+    """
+    graph = as_graph(graph_data)
+    nodes = graph.get('nodes', [])
+    relations = graph.get('relations', [])
+
+    touched_nodes = []
+    touched_relations = []
+    for muid in changes['muids']:
+        touched_nodes.extend(graph.lookup_nodes('MUID', muid) or [])
+        touched_relations.extend(graph.incident_relations(muid))
+    for lid in changes['lids']:
+        touched_relations.extend(graph.lookup_relations('LID', lid) or [])
+
+    node_positions: Dict[int, int] = {}
+    if touched_nodes:
+        node_positions = {id(node): i for i, node in enumerate(nodes)}
+    relation_positions: Dict[int, int] = {}
+    if touched_relations:
+        relation_positions = {id(rel): i for i, rel in enumerate(relations)}
+    node_indices = {node_positions[id(node)] for node in touched_nodes}
+    relation_indices = {relation_positions[id(rel)] for rel in touched_relations}
+
+    # The duplicate groups to re-check: those of the touched entities now, and
+    # those they were part of at the last validation.
+    muid_keys = {node['MUID'] for node in touched_nodes if 'MUID' in node}
+    signature_keys = {relation_signature(rel) for rel in touched_relations}
+    issues_by_code = defaultdict(list)
+    for issue in old_issues:
+        code, details = issue.get('issue_code'), issue.get('details', {})
+        if code == 'DANGLING_RELATION':
+            if details.get('relation_index') in relation_indices:
+                continue
+        elif code == 'DUPLICATE_NODE':
+            if node_indices.intersection(details.get('duplicate_indices', [])):
+                muid_keys.add(details['node_signature']['MUID'])
+                continue
+        elif code == 'DUPLICATE_RELATION':
+            if relation_indices.intersection(details.get('duplicate_indices', [])):
+                signature = details['relation_signature']
+                signature_keys.add((signature['from_MUID'], signature['to_MUID'], signature['type']))
+                continue
+        elif code != 'POTENTIAL_PRE_MIGRATION_DUPLICATE':
+            return None
+        issues_by_code[code].append(issue)
+
+    for i in sorted(relation_indices):
+        issue = dangling_relation_issue(i, relations[i], graph.has_node)
+        if issue:
+            issues_by_code['DANGLING_RELATION'].append(issue)
+
+    duplicate_nodes = [issue for issue in issues_by_code['DUPLICATE_NODE'] if issue['details']['node_signature']['MUID'] not in muid_keys]
+    for muid in muid_keys:
+        group = graph.lookup_nodes('MUID', muid)
+        if group is None:
+            return None
+        if len(group) > 1:
+            indices = sorted(node_positions[id(node)] for node in group)
+            duplicate_nodes.append(duplicate_node_issue(muid, indices, nodes))
+
+    duplicate_relations = [
+        issue for issue in issues_by_code['DUPLICATE_RELATION']
+        if relation_signature(issue['details']['relation_signature']) not in signature_keys
+    ]
+    for signature in signature_keys:
+        candidates = graph.lookup_relations('from_MUID', signature[0]) if signature[0] is not None else None
+        if candidates is None:
+            candidates = relations
+        group = [rel for rel in candidates if relation_signature(rel) == signature]
+        if len(group) > 1:
+            indices = sorted(relation_positions[id(rel)] for rel in group)
+            duplicate_relations.append(duplicate_relation_issue(signature, indices, relations))
+
+    alias_duplicates = alias_duplicate_issues(index_nodes(nodes, muids=False)['alias_duplicates'], nodes) if touched_nodes else issues_by_code['POTENTIAL_PRE_MIGRATION_DUPLICATE']
+
+    all_issues = sorted(issues_by_code['DANGLING_RELATION'], key=lambda issue: issue['details']['relation_index'])
+    all_issues.extend(sorted(duplicate_nodes, key=lambda issue: issue['details']['duplicate_indices'][0]))
+    all_issues.extend(alias_duplicates)
+    all_issues.extend(sorted(duplicate_relations, key=lambda issue: issue['details']['duplicate_indices'][0]))
+    return all_issues
 
 # --- Public Command Handler (Corrected Logic) ---
 
-def handle_validation(file_path: Path, output_format: str = 'human'):
+def validate_file(file_path: Path, output_format: str = 'human', full: bool = False,
+                  timings: Optional[Dict[str, Any]] = None, rules: Optional[List[str]] = None,
+                  skip_rules: Optional[List[str]] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Validates one SG file and returns the issues found.
+
+    In 'human' mode the report is printed and, if the issues changed, they are
+    saved into the graph's 'validation_issues' and logged as a transaction,
+    together with the watermark: the last transaction they cover (the validation
+    transaction itself). The next run then re-checks only what the transactions
+    after the watermark touched (see _validate_incremental) and falls back to a
+    full run when the watermark is missing, was archived, or the changes since
+    include removals. When the watermark is still the last transaction saved
+    with the SG (see LSGManager.saved_last_transaction_id), the log is not loaded
+    at all. In 'json' mode only the SG is loaded, the selected rules are run
+    over the whole graph and nothing is printed or written.
+
+    The rules come from the registry in core/validation_rules.py. When only some
+    of them run, the stored issues of the others are kept, and the watermark only
+    moves when every default rule ran.
+
+    Args:
+        file_path (Path): Path to the main SG file.
+        output_format (str): 'human' or 'json'.
+        full (bool): If True, always check the whole graph.
+        timings (Optional[Dict[str, Any]]): If given, filled with the wall time of
+            the passes and rules of a full run (see validation_rules.run_rules).
+        rules (Optional[List[str]]): Names of the rules to run (default: the default rules).
+        skip_rules (Optional[List[str]]): Names of rules to leave out.
+
+    Returns:
+        The issues found by the rules that ran, or None if the graph is empty.
+
+    Raises:
+        graph_io.GraphFileError: If the file cannot be loaded or saved.
+        validation_rules.ValidationRuleError: If a rule name is unknown.
+    """
+    selected = validation_rules.select_rules(rules, skip_rules)
+
+    # In JSON mode, we only need to load the file, not the full manager
+    if output_format == 'json':
+        _, graph_data = graph_io.load_graph_from_file(file_path)
+    else:
+        lsg_manager = LSGManager(file_path)
+        graph_data = lsg_manager.sg_data
+
+    if not graph_data:
+        return None # Error is already logged by the manager or loader
+
+    # Make a deep copy to get the old state before any changes
+    old_issues = copy.deepcopy(graph_data.get('validation_issues', []))
+
+    # --- Machine-Readable Output Handling ---
+    if output_format == 'json':
+        return _validate_full(graph_data, selected, timings)
+
+    # Only the built-in rules can be re-checked incrementally.
+    selected_codes = {rule.issue_code for rule in selected}
+    issues = None
+    old_watermark = graph_data.get(WATERMARK_KEY)
+    if not full and [rule.name for rule in selected] == [rule.name for rule in validation_rules.BUILTIN_RULES]:
+        changes = _changes_since(lsg_manager, old_watermark)
+        if changes is not None:
+            old_selected = [issue for issue in old_issues if issue.get('issue_code') in selected_codes]
+            issues = _validate_incremental(graph_data, old_selected, changes)
+    if issues is None:
+        issues = _validate_full(graph_data, selected, timings)
+    else:
+        print(f"Incremental validation: re-checked the changes since transaction {old_watermark['transaction']}.")
+    # The stored issues of the rules that did not run are kept as they are.
+    all_issues = _merge_unselected(old_issues, issues, selected)
+
+    # --- Human-Readable Output and File Modification ---
+
+    # CORRECTED LOGIC: First, always print the report if issues are found.
+    if not issues:
+        print("Validation complete. No issues found.")
+    else:
+        print(f"\nValidation found {len(issues)} issue(s):")
+        for issue in issues:
+            # Human-readable summary, as provided by the rule that reported the issue
+            details_summary = validation_rules.summarize_issue(issue)
+            print(f"  - [{issue['severity']}] {issue['issue_code']}: {issue['message']} ({details_summary})")
+    if len(all_issues) > len(issues):
+        print(f"Kept {len(all_issues) - len(issues)} stored issue(s) of rules that were not run.")
+
+    # Second, decide if the file needs to be updated. The watermark only moves when
+    # every default rule ran; a graph validated before watermarks existed gets
+    # one, so that the next run can be incremental.
+    default_rules = {rule.name for rule in validation_rules.get_rules() if rule.default}
+    covers_default_rules = default_rules <= {rule.name for rule in selected}
+    last_transaction = None
+    if covers_default_rules:
+        last_transaction = lsg_manager.saved_last_transaction_id() or lsg_manager.last_transaction_id()
+    if old_issues == all_issues and (old_watermark is not None or last_transaction is None):
+        print("\nNo changes in issues found. File will not be modified.")
+        return issues
+
+    # If we are here, it means the issues list has changed.
+    print("\nUpdating graph data with new validation results...")
+
+    # The watermark names the validation transaction itself, which is then the last
+    # transaction saved with the SG: the next run can skip loading the log.
+    transaction_id = utils.generate_transaction_id()
+    updates = {"validation_issues": all_issues}
+    if covers_default_rules:
+        updates[WATERMARK_KEY] = {"transaction": transaction_id}
+    sg_data = as_graph(lsg_manager.sg_data)
+    savepoint = sg_data.savepoint()
+    lsg_manager.sg_data = operations.update_graph_properties(sg_data, updates)
+    # Only the issues that appeared or disappeared are logged, not both full lists.
+    delta = graph_delta.compute_delta(sg_data, savepoint)
+    sg_data.release_savepoints()
+
+    changeset = [{
+        "action": "update_graph_properties",
+        "entity_id": "graph_data",
+        "entity_type": "graph_data",
+        "details": f"Updated validation_issues block. Found {len(all_issues)} issues."
+    }]
+
+    lsg_manager.record_transaction(changeset, recipe_id=VALIDATION_RECIPE_ID, delta=delta, transaction_id=transaction_id)
+    lsg_manager.save_changes()
+
+    print("Validation results have been saved to the graph data and logged.")
+    return issues
+
+def _validate_file_timed(file_path: Path, rules: Optional[List[str]] = None,
+                         skip_rules: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """Validates one SG file in 'json' mode and returns {'issues': [...], 'timings': {...}}."""
+    timings: Dict[str, Any] = {}
+    all_issues = validate_file(file_path, 'json', timings=timings, rules=rules, skip_rules=skip_rules)
+    if all_issues is None:
+        return None
+    return {"issues": all_issues, "timings": timings}
+
+def _print_timings(timings: Dict[str, Any]) -> None:
+    """Prints the wall time of each pass and rule of a full run."""
+    if not timings:
+        return
+    print("\nTimings:")
+    for name, seconds in timings['passes'].items():
+        print(f"  pass over {name}: {seconds * 1000:.1f} ms")
+    for name, rule in timings['rules'].items():
+        print(f"  rule {name}: {rule['seconds'] * 1000:.1f} ms, {rule['issues']} issue(s)")
+
+def handle_validation(file_path: Path, output_format: str = 'human', full: bool = False, timings: bool = False,
+                      rules: Optional[List[str]] = None, skip_rules: Optional[List[str]] = None):
     """
     Orchestrates the validation process for a given SG file.
     This is the main entry point called by the CLI handler.
@@ -150,87 +355,135 @@ def handle_validation(file_path: Path, output_format: str = 'human'):
     Args:
         file_path (Path): Path to the main SG file.
         output_format (str): 'human' for readable summary, 'json' for machine-readable output.
+        full (bool): If True, check the whole graph even if an incremental run is possible.
+        timings (bool): Report the wall time of each pass and rule and its issue count. In
+                        'json' mode, {"issues": [...], "timings": {...}} is printed instead
+                        of the bare list of issues.
+        rules (Optional[List[str]]): Names of the rules to run (default: the default rules).
+        skip_rules (Optional[List[str]]): Names of rules to leave out.
     """
     try:
         if output_format != 'json':
             print(f"Starting validation for: {file_path}")
 
-        # In JSON mode, we only need to load the file, not the full manager
-        if output_format == 'json':
-            _, graph_data = graph_io.load_graph_from_file(file_path)
+        if output_format == 'json' and timings:
+            all_issues = _validate_file_timed(file_path, rules, skip_rules)
         else:
-            lsg_manager = LSGManager(file_path)
-            graph_data = lsg_manager.sg_data
+            run_timings: Dict[str, Any] = {}
+            all_issues = validate_file(file_path, output_format, full, run_timings if timings else None, rules, skip_rules)
+            if timings:
+                _print_timings(run_timings)
 
-        if not graph_data:
-            return # Error is already logged by the manager or loader
+        if output_format == 'json' and all_issues is not None:
+            print(json.dumps(all_issues, indent=2, ensure_ascii=False))
+
+    except validation_rules.ValidationRuleError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        if output_format != 'json':
+            print(f"\nAn unexpected error occurred during validation: {e}")
 
-        # Make a deep copy to get the old state before any changes
-        old_issues = copy.deepcopy(graph_data.get('validation_issues', []))
+def handle_validation_glob(pattern: str, output_format: str = 'human', jobs: Optional[int] = None, full: bool = False,
+                           timings: bool = False, rules: Optional[List[str]] = None, skip_rules: Optional[List[str]] = None):
+    """
+    Validates every SG file matching a glob pattern, in parallel.
 
-        nodes = graph_data.get('nodes', [])
-        relations = graph_data.get('relations', [])
-        
-        all_issues = []
-        all_issues.extend(_find_dangling_relations(nodes, relations))
-        all_issues.extend(_find_duplicate_nodes(nodes))
-        all_issues.extend(_find_duplicate_relations(relations))
+    In 'human' mode each file's report is printed, followed by a per-file summary.
+    In 'json' mode a single JSON object is printed that maps each file to its list
+    of issues (or to {"error": ...} if the file could not be validated); with
+    timings, to {"issues": [...], "timings": {...}}.
 
-        # --- Machine-Readable Output Handling ---
+    Args:
+        pattern (str): A glob pattern for the SG files, e.g. 'graphs/**/*.md'.
+        output_format (str): 'human' or 'json'.
+        jobs (Optional[int]): The number of worker processes (default: CPU count).
+        full (bool): If True, check every graph as a whole (see validate_file).
+        timings (bool): In 'json' mode, report the wall time of each pass and rule per file.
+        rules (Optional[List[str]]): Names of the rules to run (default: the default rules).
+        skip_rules (Optional[List[str]]): Names of rules to leave out.
+    """
+    try:
+        validation_rules.select_rules(rules, skip_rules)
+    except validation_rules.ValidationRuleError as e:
+        print(f"Error: {e}")
+        return
+    try:
+        files = parallel_runner.find_graph_files(pattern)
+    except parallel_runner.NoMatchingFilesError as e:
         if output_format == 'json':
-            print(json.dumps(all_issues, indent=2, ensure_ascii=False))
-            return
+            print(json.dumps({}, indent=2))
+        else:
+            print(f"Error: {e}")
+        return
 
-        # --- Human-Readable Output and File Modification ---
-        
-        # CORRECTED LOGIC: First, always print the report if issues are found.
-        if not all_issues:
-            print("Validation complete. No issues found.")
+    if output_format == 'json':
+        if timings:
+            results = parallel_runner.run_for_files(_validate_file_timed, files, jobs, rules, skip_rules, echo_output=False)
         else:
-            print(f"\nValidation found {len(all_issues)} issue(s):")
-            for issue in all_issues:
-                # Human-readable summary generation...
-                details_summary = ""
-                if issue['issue_code'] == 'DUPLICATE_NODE':
-                    count = len(issue['details']['duplicate_indices'])
-                    details_summary = f"MUID: {issue['details']['node_signature']['MUID']} (found {count} times)"
-                elif issue['issue_code'] == 'DUPLICATE_RELATION':
-                    count = len(issue['details']['duplicate_indices'])
-                    sig = issue['details']['relation_signature']
-                    details_summary = f"From: {sig['from_MUID']}, To: {sig['to_MUID']}, Type: {sig['type']} (found {count} times)"
-                elif issue['issue_code'] == 'DANGLING_RELATION':
-                    endpoints = issue['details']['dangling_endpoints']
-                    dangling_info = ', '.join([f"{e['direction']}:{e['muid']}" for e in endpoints])
-                    # CORRECTED: Added specific relation details to the summary
-                    rel = issue['details']['relation']
-                    details_summary = f"Missing MUID(s): {dangling_info} in relation from '{rel.get('from_MUID')}' to '{rel.get('to_MUID')}'"
-                print(f"  - [{issue['severity']}] {issue['issue_code']}: {issue['message']} ({details_summary})")
-
-        # Second, decide if the file needs to be updated.
-        if old_issues == all_issues:
-            print("\nNo changes in issues found. File will not be modified.")
-            return
-
-        # If we are here, it means the issues list has changed.
-        print("\nUpdating graph data with new validation results...")
-        
-        updates = {"validation_issues": all_issues}
-        lsg_manager.sg_data = operations.update_graph_properties(lsg_manager.sg_data, updates)
-        
-        changeset = [{
-            "action": "update_graph_properties",
-            "entity_id": "graph_data",
-            "entity_type": "graph_data",
-            "details": f"Updated validation_issues block. Found {len(all_issues)} issues.",
-            "old_state": {"validation_issues": old_issues},
-            "new_state": {"validation_issues": all_issues}
-        }]
-        
-        lsg_manager.record_transaction(changeset, recipe_id="validation_run")
-        lsg_manager.save_changes()
-        
-        print("Validation results have been saved to the graph data and logged.")
+            results = parallel_runner.run_for_files(validate_file, files, jobs, 'json', False, None, rules, skip_rules, echo_output=False)
+        report = {
+            result['file']: result['value'] if result['status'] == 'ok' else {"error": result['error']}
+            for result in results
+        }
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
 
-    except Exception as e:
-        if output_format != 'json':
-            print(f"\nAn unexpected error occurred during validation: {e}")
+    print(f"Starting validation for {len(files)} file(s) matching '{pattern}'.")
+    started = time.perf_counter()
+    results = parallel_runner.run_for_files(validate_file, files, jobs, output_format, full, None, rules, skip_rules)
+    parallel_runner.print_summary(
+        results, time.perf_counter() - started,
+        describe=lambda issues: f"{len(issues or [])} issue(s)"
+    )
+
+def handle_validation_corpus(root: Path, output_format: str = 'human', jobs: Optional[int] = None):
+    """
+    Validates the MUIDs of a whole corpus of Markdown documents (see corpus_index.py).
+
+    Every .md file under root (except logs, archives and backups) is scanned in
+    parallel: plain documents for the 'muid:' of their frontmatter, SGs in full.
+    The global MUID registry is then checked for MUIDs defined in more than one
+    file and for relation endpoints defined nowhere in the corpus. No file is
+    modified.
+
+    In 'json' mode a single object {"issues": [...], "errors": {file: error}} is printed.
+
+    Args:
+        root (Path): The root directory of the corpus.
+        output_format (str): 'human' or 'json'.
+        jobs (Optional[int]): The number of worker processes (default: CPU count).
+    """
+    try:
+        files = parallel_runner.find_files_under(root)
+    except parallel_runner.NoMatchingFilesError as e:
+        if output_format == 'json':
+            print(json.dumps({"issues": [], "errors": {}}, indent=2))
+        else:
+            print(f"Error: {e}")
+        return
+
+    if output_format != 'json':
+        print(f"Starting corpus validation for {len(files)} file(s) under '{root}'.")
+    started = time.perf_counter()
+    results = parallel_runner.run_for_files(corpus_index.scan_file, files, jobs, echo_output=False)
+    records = {result['file']: result['value'] for result in results if result['status'] == 'ok'}
+    errors = {result['file']: result['error'] for result in results if result['status'] != 'ok'}
+    registry = corpus_index.build_registry(records)
+    issues = corpus_index.find_corpus_issues(records, registry)
+
+    if output_format == 'json':
+        print(json.dumps({"issues": issues, "errors": errors}, indent=2, ensure_ascii=False))
+        return
+
+    graphs = sum(1 for record in records.values() if record['kind'] == 'graph')
+    print(f"Scanned {len(records)} file(s) ({graphs} SG(s), {len(records) - graphs} document(s)) "
+          f"in {time.perf_counter() - started:.2f} s; the registry holds {len(registry)} MUID(s).")
+    for file, error in errors.items():
+        print(f"Warning: could not scan {file}: {error}")
+
+    if not issues:
+        print("Validation complete. No issues found.")
+        return
+    print(f"\nValidation found {len(issues)} issue(s):")
+    for issue in issues:
+        print(f"  - [{issue['severity']}] {issue['issue_code']}: {issue['message']} ({corpus_index.summarize_corpus_issue(issue)})")
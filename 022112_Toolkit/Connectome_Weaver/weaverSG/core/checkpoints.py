@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+checkpoints.py
+
+This module stores compressed snapshots ("checkpoints") of a Semantic Graph as
+it was right after a given transaction, for the 'checkout' command.
+
+Reconstructing an old state replays the transaction deltas recorded in the
+LSG (see graph_delta.py). Checkpoints bound that work: 'checkout' starts from
+the checkpoint (or the current SG) closest to the requested transaction and
+only replays the deltas in between.
+
+A checkpoint is a gzip-compressed JSON document
+{"transaction": <TID>, "timestamp": ..., "graph_data": {...}}, stored as
+'.weaver_checkpoints/<SG name>/<TID>.json.gz' next to the SG. The bundled
+'log_history' is not part of a checkpoint. LSGManager writes one automatically
+every CHECKPOINT_INTERVAL transactions (WEAVERSG_CHECKPOINT_INTERVAL; 0 disables).
+Only the newest CHECKPOINT_KEEP checkpoints of an SG are kept
+(WEAVERSG_CHECKPOINT_KEEP; 0 keeps all): older ones are pruned whenever a new
+one is written. 'archive-log' and 'cleanup-backups' remove them as well.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import gzip
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List
+
+from . import serialization
+
+CHECKPOINT_DIR_NAME = '.weaver_checkpoints'
+CHECKPOINT_INTERVAL_ENV_VAR = 'WEAVERSG_CHECKPOINT_INTERVAL'
+DEFAULT_CHECKPOINT_INTERVAL = 50
+CHECKPOINT_KEEP_ENV_VAR = 'WEAVERSG_CHECKPOINT_KEEP'
+DEFAULT_CHECKPOINT_KEEP = 5
+
+_CHECKPOINT_SUFFIX = '.json.gz'
+
+# Top-level SG keys that belong to the log rather than to the graph's state.
+LOG_KEYS = ('log_history',)
+
+
+class CheckpointError(Exception):
+    """Raised when a checkpoint cannot be read."""
+    pass
+
+
+def get_interval() -> int:
+    """Returns the number of transactions between automatic checkpoints (0 = disabled)."""
+    try:
+        return max(0, int(os.environ.get(CHECKPOINT_INTERVAL_ENV_VAR) or DEFAULT_CHECKPOINT_INTERVAL))
+    except ValueError:
+        return DEFAULT_CHECKPOINT_INTERVAL
+
+def get_keep() -> int:
+    """Returns the number of checkpoints kept per SG (0 = all)."""
+    try:
+        return max(0, int(os.environ.get(CHECKPOINT_KEEP_ENV_VAR) or DEFAULT_CHECKPOINT_KEEP))
+    except ValueError:
+        return DEFAULT_CHECKPOINT_KEEP
+
+def checkpoint_dir(sg_path: Path) -> Path:
+    """Returns the directory holding the checkpoints of an SG file."""
+    return sg_path.parent / CHECKPOINT_DIR_NAME / sg_path.name
+
+def graph_state(graph_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the SG data without the keys that belong to the log."""
+    return {key: value for key, value in graph_data.items() if key not in LOG_KEYS}
+
+def list_checkpoints(sg_path: Path) -> Dict[str, Path]:
+    """Returns the checkpoints of an SG file as {transaction ID: checkpoint path}."""
+    directory = checkpoint_dir(sg_path)
+    if not directory.is_dir():
+        return {}
+    return {
+        path.name[:-len(_CHECKPOINT_SUFFIX)]: path
+        for path in directory.iterdir()
+        if path.name.endswith(_CHECKPOINT_SUFFIX)
+    }
+
+def prune_checkpoints(sg_path: Path, keep: int) -> List[Path]:
+    """
+    Deletes all but the newest 'keep' checkpoints of an SG file.
+
+    Checkpoints are ordered by modification time, then by name (transaction IDs
+    start with their timestamp). With keep=0 every checkpoint is deleted, and the
+    emptied checkpoint directory is removed.
+
+    Returns:
+        The deleted checkpoint files.
+    """
+    paths = sorted(list_checkpoints(sg_path).values(), key=lambda path: (path.stat().st_mtime_ns, path.name))
+    doomed = paths[:max(0, len(paths) - keep)]
+    for path in doomed:
+        path.unlink(missing_ok=True)
+    if doomed and keep == 0:
+        for directory in (checkpoint_dir(sg_path), checkpoint_dir(sg_path).parent):
+            try:
+                directory.rmdir()
+            except OSError:
+                break
+    return doomed
+
+def write_checkpoint(sg_path: Path, transaction: Dict[str, Any], graph_data: Dict[str, Any]) -> Path:
+    """
+    Writes the state of an SG right after a transaction as a checkpoint.
+
+    The file is written to a temporary name and renamed into place, so a
+    checkpoint is either complete or absent. Afterwards only the newest
+    get_keep() checkpoints of the SG are kept.
+
+    Args:
+        sg_path (Path): The path to the main SG file.
+        transaction (Dict[str, Any]): The Transaction node the state follows.
+        graph_data (Dict[str, Any]): The SG data after the transaction.
+
+    Returns:
+        The path of the checkpoint.
+    """
+    directory = checkpoint_dir(sg_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{transaction['MUID']}{_CHECKPOINT_SUFFIX}"
+    document = {
+        'transaction': transaction['MUID'],
+        'timestamp': transaction.get('timestamp'),
+        'graph_data': graph_state(graph_data),
+    }
+    encoded = serialization.get_codec().dumps_json_line(document).encode('utf-8')
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(encoded)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    keep = get_keep()
+    if keep:
+        prune_checkpoints(sg_path, keep)
+    return path
+
+def read_checkpoint(path: Path) -> Dict[str, Any]:
+    """
+    Reads a checkpoint.
+
+    Returns:
+        The checkpoint document, with 'transaction', 'timestamp' and 'graph_data'.
+
+    Raises:
+        CheckpointError: If the file cannot be read or is not a checkpoint.
+    """
+    try:
+        with gzip.open(path, 'rb') as f:
+            document = serialization.get_codec().loads_json(f.read())
+    except Exception as e:
+        raise CheckpointError(f"Could not read checkpoint {path}: {e}") from e
+    if not isinstance(document, dict) or not isinstance(document.get('graph_data'), dict):
+        raise CheckpointError(f"Not a checkpoint file: {path}")
+    return document
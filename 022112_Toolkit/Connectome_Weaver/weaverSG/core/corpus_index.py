@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+corpus_index.py
+
+This module builds the global MUID registry of a corpus of Markdown documents,
+for the '--root' mode of validate.
+
+Every document of the corpus names itself with a 'muid:' in its YAML
+frontmatter, and the nodes of Semantic Graphs carry MUIDs that relations in
+other documents may refer to. The corpus is scanned file by file (in parallel
+worker processes, see parallel_runner.py):
+- A plain document is read only up to the end of its frontmatter.
+- An SG (a frontmatter followed directly by a ```json block with 'nodes') is
+  loaded in full through graph_io, so the graph cache applies. Its frontmatter
+  MUID, its node MUIDs and the relation endpoints that are not nodes of the
+  same graph are kept.
+
+The registry maps each MUID to the places that define it. Two checks run over it:
+- CROSS_FILE_DUPLICATE_MUID: a MUID defined in more than one file.
+- UNRESOLVED_REFERENCE: a relation endpoint that is defined nowhere in the corpus.
+Duplicates within a single SG are left to the per-file DUPLICATE_NODE rule.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from . import graph_io
+from . import serialization
+
+_FRONTMATTER_DELIMITER = b'---'
+_JSON_FENCE_OPEN = b'```json'
+
+
+# --- Scanning ---
+
+def read_frontmatter(file_path: Path) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Reads the YAML frontmatter of a Markdown file, without reading its body.
+
+    Args:
+        file_path (Path): The Markdown file.
+
+    Returns:
+        A tuple (frontmatter, is_graph): the parsed frontmatter (None if the file
+        does not start with one), and whether the first thing after it is a
+        ```json block, i.e. whether the file may be an SG.
+
+    Raises:
+        graph_io.GraphFileParseError: If the frontmatter is not closed or not a YAML mapping.
+    """
+    with file_path.open('rb') as f:
+        if f.readline().strip() != _FRONTMATTER_DELIMITER:
+            return None, False
+        lines = []
+        for line in f:
+            if line.strip() == _FRONTMATTER_DELIMITER:
+                break
+            lines.append(line)
+        else:
+            raise graph_io.GraphFileParseError("The YAML frontmatter section is not closed.")
+        is_graph = False
+        for line in f:
+            if line.strip():
+                is_graph = line.lstrip().startswith(_JSON_FENCE_OPEN)
+                break
+
+    try:
+        frontmatter = serialization.get_codec().load_yaml(b''.join(lines).decode('utf-8'))
+    except Exception as e:
+        raise graph_io.GraphFileParseError(f"Error parsing YAML frontmatter: {e}") from e
+    if frontmatter is None:
+        frontmatter = {}
+    if not isinstance(frontmatter, dict):
+        raise graph_io.GraphFileParseError("The YAML frontmatter is not a dictionary.")
+    return frontmatter, is_graph
+
+def _as_muid(value: Any) -> Optional[str]:
+    """Normalizes a MUID read from YAML or JSON (which may yield numbers) to a string."""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    text = str(value).strip()
+    return text or None
+
+def scan_file(file_path: Path) -> Dict[str, Any]:
+    """
+    Collects what one file of the corpus contributes to the MUID registry.
+
+    This is the per-file worker of the corpus scan; it runs in a worker process.
+
+    Args:
+        file_path (Path): The Markdown file.
+
+    Returns:
+        A record with 'kind' ('graph' or 'document'), 'muid' (the frontmatter MUID or
+        None), 'nodes' (the node MUIDs, in order) and 'references': one
+        {'relation_index', 'relation', 'endpoints'} entry per relation with an
+        endpoint that is not a node of the same graph.
+    """
+    frontmatter, is_graph = read_frontmatter(file_path)
+    record = {
+        'kind': 'document',
+        'muid': _as_muid((frontmatter or {}).get('muid')),
+        'nodes': [],
+        'references': [],
+    }
+    if not is_graph:
+        return record
+
+    _, graph_data = graph_io.load_graph_from_file(file_path)
+    nodes = graph_data.get('nodes')
+    if not isinstance(nodes, list):
+        return record
+    record['kind'] = 'graph'
+    record['nodes'] = [_as_muid(node.get('MUID')) if isinstance(node, dict) else None for node in nodes]
+
+    local = set(record['nodes'])
+    relations = graph_data.get('relations')
+    for i, rel in enumerate(relations if isinstance(relations, list) else []):
+        if not isinstance(rel, dict):
+            continue
+        endpoints = []
+        for direction in ('from', 'to'):
+            muid = _as_muid(rel.get(f'{direction}_MUID'))
+            if muid and muid not in local:
+                endpoints.append({"direction": direction, "muid": muid})
+        if endpoints:
+            record['references'].append({'relation_index': i, 'relation': rel, 'endpoints': endpoints})
+    return record
+
+
+# --- Registry ---
+
+def build_registry(records: Dict[str, Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Builds the global MUID registry from the scan records.
+
+    Args:
+        records (Dict[str, Dict[str, Any]]): The scan_file() record of each file, by file path.
+
+    Returns:
+        {MUID: [occurrence, ...]} in scan order, where an occurrence is
+        {'file', 'kind': 'frontmatter'} or {'file', 'kind': 'node', 'node_index'}.
+    """
+    registry: Dict[str, List[Dict[str, Any]]] = {}
+    for file, record in records.items():
+        if record['muid']:
+            registry.setdefault(record['muid'], []).append({'file': file, 'kind': 'frontmatter'})
+        for i, muid in enumerate(record['nodes']):
+            if muid:
+                registry.setdefault(muid, []).append({'file': file, 'kind': 'node', 'node_index': i})
+    return registry
+
+def find_corpus_issues(records: Dict[str, Dict[str, Any]],
+                       registry: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> List[Dict[str, Any]]:
+    """
+    Checks the corpus for MUIDs defined in several files and for references to
+    MUIDs defined nowhere.
+
+    Args:
+        records (Dict[str, Dict[str, Any]]): The scan_file() record of each file, by file path.
+        registry (Optional[Dict]): The registry of the records (built if not given).
+
+    Returns:
+        The issues, in the v3 format: duplicates first, then unresolved references,
+        each in scan order.
+    """
+    if registry is None:
+        registry = build_registry(records)
+
+    issues = []
+    for muid, occurrences in registry.items():
+        files = dict.fromkeys(occurrence['file'] for occurrence in occurrences)
+        if len(files) > 1:
+            issues.append({
+                "issue_code": "CROSS_FILE_DUPLICATE_MUID",
+                "severity": "ERROR",
+                "message": f"MUID определен в {len(files)} файлах корпуса.",
+                "details": {"MUID": muid, "occurrences": occurrences}
+            })
+
+    for file, record in records.items():
+        for reference in record['references']:
+            unresolved = [endpoint for endpoint in reference['endpoints'] if endpoint['muid'] not in registry]
+            if unresolved:
+                issues.append({
+                    "issue_code": "UNRESOLVED_REFERENCE",
+                    "severity": "ERROR",
+                    "message": "Связь ссылается на MUID, которого нет ни в одном файле корпуса.",
+                    "details": {
+                        "file": file,
+                        "relation": reference['relation'],
+                        "relation_index": reference['relation_index'],
+                        "unresolved_endpoints": unresolved
+                    }
+                })
+    return issues
+
+def summarize_corpus_issue(issue: Dict[str, Any]) -> str:
+    """Returns the short description of a corpus issue for the human-readable report."""
+    details = issue.get('details', {})
+    if issue.get('issue_code') == 'CROSS_FILE_DUPLICATE_MUID':
+        files = ', '.join(dict.fromkeys(occurrence['file'] for occurrence in details.get('occurrences', [])))
+        return f"MUID: {details.get('MUID')}, files: {files}"
+    if issue.get('issue_code') == 'UNRESOLVED_REFERENCE':
+        muids = ', '.join(f"{endpoint['direction']} {endpoint['muid']}" for endpoint in details.get('unresolved_endpoints', []))
+        return f"{details.get('file')}, relation index: {details.get('relation_index')}, {muids}"
+    return "Details not available"
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+graph_cache.py
+
+This module provides an opt-in, persistent on-disk cache of parsed graph files.
+
+Parsing the YAML frontmatter and the JSON body of a large SG or LSG dominates
+the start-up time of every command. When the cache is enabled, the parsed
+(metadata, graph_data) tuple of every loaded file is stored as a pickle, and the
+next load of the unchanged file unpickles it instead of parsing the file again.
+
+An entry is keyed on the resolved path of the graph file. It is only used when
+the file's stat (mtime, size and inode) is unchanged and the SHA-256 hash of its
+content matches the hash recorded in the entry, so an edit that preserves the
+mtime is still detected. The cache directory is bounded by a total size; the
+least recently used entries are evicted first.
+
+The cache is enabled with configure() (the CLI's --cache-dir / --cache-max-mb
+options) or with the WEAVERSG_CACHE_DIR / WEAVERSG_CACHE_MAX_MB environment
+variables. Since entries are pickles, the cache directory must only be writable
+by trusted users.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from .graph_model import SemanticGraph
+
+CACHE_DIR_ENV_VAR = 'WEAVERSG_CACHE_DIR'
+CACHE_MAX_MB_ENV_VAR = 'WEAVERSG_CACHE_MAX_MB'
+DEFAULT_MAX_MB = 512
+
+# Bumped whenever the layout of an entry changes; older entries are then ignored.
+_ENTRY_FORMAT = 1
+_ENTRY_SUFFIX = '.graphcache'
+
+
+class _GraphPickler(pickle.Pickler):
+    """Pickles SemanticGraph objects as plain dicts, i.e. without their indexes."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, SemanticGraph):
+            return dict, (dict(obj),)
+        return NotImplemented
+
+
+class GraphCache:
+    """
+    A size-bounded LRU cache of parsed graph files in a directory.
+
+    Each entry is one file holding two consecutive pickles: a small header
+    (source path, stat key and content hash) and the (metadata, graph_data)
+    payload. The header is checked before the payload is unpickled. An entry's
+    mtime records its last use and drives the LRU eviction.
+
+    Attributes:
+        cache_dir (Path): The directory holding the entries.
+        max_bytes (int): The total size the entries may occupy.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def __repr__(self) -> str:
+        return f"GraphCache({str(self.cache_dir)!r}, max_bytes={self.max_bytes})"
+
+    def _entry_path(self, file_path: Path) -> Path:
+        key = hashlib.sha256(str(file_path.resolve()).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}{_ENTRY_SUFFIX}"
+
+    @staticmethod
+    def _header_for(file_path: Path, stat: os.stat_result, content_hash: str) -> Dict[str, Any]:
+        return {
+            'format': _ENTRY_FORMAT,
+            'path': str(file_path.resolve()),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'inode': stat.st_ino,
+            'sha256': content_hash,
+        }
+
+    def get(self, file_path: Path, stat: os.stat_result, content_hash: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Returns the cached (metadata, graph_data) of a file, or None on a miss.
+
+        Args:
+            file_path (Path): The graph file.
+            stat (os.stat_result): The current stat of the file.
+            content_hash (str): The SHA-256 hex digest of the file's current content.
+        """
+        entry_path = self._entry_path(file_path)
+        expected_header = self._header_for(file_path, stat, content_hash)
+        try:
+            with entry_path.open('rb') as f:
+                if pickle.load(f) != expected_header:
+                    return None
+                metadata, graph_data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A truncated or foreign entry is treated as a miss and dropped.
+            entry_path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return metadata, graph_data
+
+    def put(self, file_path: Path, stat: os.stat_result, content_hash: str, metadata: Dict[str, Any], graph_data: Dict[str, Any]) -> None:
+        """
+        Stores the parsed content of a file and evicts old entries if needed.
+
+        Failures are reported as a warning on stderr; the cache never makes a
+        command fail.
+
+        Args:
+            file_path (Path): The graph file.
+            stat (os.stat_result): The stat of the file the data was parsed from.
+            content_hash (str): The SHA-256 hex digest of that content.
+            metadata (Dict[str, Any]): The parsed YAML metadata.
+            graph_data (Dict[str, Any]): The parsed JSON graph data.
+        """
+        entry_path = self._entry_path(file_path)
+        tmp_name = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix='.', suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickler = _GraphPickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickler.dump(self._header_for(file_path, stat, content_hash))
+                pickler.clear_memo()
+                pickler.dump((metadata, graph_data))
+                entry_size = f.tell()
+            if entry_size > self.max_bytes:
+                os.unlink(tmp_name)
+                return
+            os.replace(tmp_name, entry_path)
+            tmp_name = None
+            self._evict(keep=entry_path)
+        except Exception as e:
+            print(f"Warning: Could not write graph cache entry for {file_path}: {e}", file=sys.stderr)
+        finally:
+            if tmp_name is not None:
+                Path(tmp_name).unlink(missing_ok=True)
+
+    def _evict(self, keep: Path) -> None:
+        """Removes the least recently used entries until the total size fits max_bytes."""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                entry_stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry))
+            total += entry_stat.st_size
+        entries.sort(key=lambda item: item[0])
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+# --- Active Cache ---
+
+_active_cache: Optional[GraphCache] = None
+_configured = False
+
+def configure(cache_dir: Optional[Path] = None, max_mb: Optional[int] = None) -> Optional[GraphCache]:
+    """
+    Enables or disables the graph cache.
+
+    Args:
+        cache_dir (Optional[Path]): The cache directory. If None, the WEAVERSG_CACHE_DIR
+                                    environment variable is used; if that is unset
+                                    too, caching is disabled.
+        max_mb (Optional[int]): The size bound in megabytes. If None, the
+                                WEAVERSG_CACHE_MAX_MB environment variable is used,
+                                falling back to DEFAULT_MAX_MB.
+
+    Returns:
+        The active GraphCache, or None if caching is disabled.
+
+    Raises:
+        ValueError: If the size bound is not a positive integer.
+    """
+    global _active_cache, _configured
+    directory = cache_dir or os.environ.get(CACHE_DIR_ENV_VAR)
+    if max_mb is None:
+        max_mb = int(os.environ.get(CACHE_MAX_MB_ENV_VAR) or DEFAULT_MAX_MB)
+    if max_mb <= 0:
+        raise ValueError(f"The graph cache size must be a positive number of megabytes, got {max_mb}.")
+    _active_cache = GraphCache(Path(directory), max_mb * 1024 * 1024) if directory else None
+    _configured = True
+    return _active_cache
+
+def get_cache() -> Optional[GraphCache]:
+    """Returns the active cache (None if disabled), configuring it from the environment on first use."""
+    if not _configured:
+        return configure()
+    return _active_cache
@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+"""
+graph_delta.py
+
+This module defines the field-level delta format recorded with every
+transaction, in the style of JSON Patch (RFC 6902), and applies deltas to a
+graph for replay and undo.
+
+A delta is a list of operations. Each operation has an 'op' ('add', 'remove'
+or 'replace') and a 'path', plus the new 'value' (add, replace) and the
+previous value 'old' (remove, replace), so that every delta can be inverted:
+
+    {"op": "replace", "path": "/nodes/NODE_1/content", "old": "a", "value": "b"}
+    {"op": "add",     "path": "/nodes/NODE_2", "value": {...the whole node...}}
+    {"op": "remove",  "path": "/relations/l_1a2b3c4d", "old": {...}, "index": 7}
+    {"op": "add",     "path": "/validation_issues/3", "value": {...}}
+
+An entity removal also records the entity's position in its list ('index',
+counted in the list as it was right before the removal). Inverting it yields
+an addition with that 'index', which re-inserts the entity where it was
+instead of appending it; additions without 'index' append.
+
+Paths address entities by identifier rather than by list position:
+- a node:      /nodes/<MUID>
+- a relation:  /relations/<LID>, or /relations/by-endpoints/<from_MUID>/<type>/<to_MUID>
+               for a relation without a LID
+- a field:     <entity path>/<field>
+- a top-level key /<key>; list-valued keys other than 'nodes' and 'relations'
+  are diffed per element (/<key>/<index>), with the common head and tail of
+  the old and new list left out.
+Path segments are escaped as in JSON Pointer ('~' -> '~0', '/' -> '~1').
+
+Deltas are computed from the undo journal of a SemanticGraph (diff_since()),
+so their cost is proportional to what changed, not to the size of the graph.
+
+Added and removed entities are recorded in full (as copies taken when the
+delta is computed). A delta is therefore self-contained: replaying it needs
+neither the recipe nor the entity files a bulk action read, which may have
+changed or disappeared since. The price is that a bulk import stores every
+imported entity in the log, once, in its transaction's delta.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import copy
+from collections.abc import Hashable
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from .graph_diff import _original_entity
+from .graph_model import SemanticGraph, as_graph
+
+_ENTITY_COLLECTIONS = ('nodes', 'relations')
+_BY_ENDPOINTS = 'by-endpoints'
+_ENDPOINT_FIELDS = ('from_MUID', 'type', 'to_MUID')
+_MISSING = object()
+
+
+class DeltaError(Exception):
+    """Raised when a delta cannot be applied to a graph."""
+    pass
+
+
+# --- Paths ---
+
+def _escape(segment: Any) -> str:
+    return str(segment).replace('~', '~0').replace('/', '~1')
+
+def _unescape(segment: str) -> str:
+    return segment.replace('~1', '/').replace('~0', '~')
+
+def entity_path(collection: str, entity: Dict[str, Any]) -> str:
+    """Returns the delta path of a node ('nodes') or relation ('relations')."""
+    if collection == 'nodes':
+        return f"/nodes/{_escape(entity.get('MUID'))}"
+    if 'LID' in entity:
+        return f"/relations/{_escape(entity['LID'])}"
+    return f"/relations/{_BY_ENDPOINTS}/" + '/'.join(_escape(entity.get(field)) for field in _ENDPOINT_FIELDS)
+
+def _parse_path(path: str) -> Tuple[str, Optional[Dict[str, str]], Optional[str]]:
+    """
+    Splits a path into (key, entity identity, field).
+
+    For entity paths the identity holds the identifying fields ({'MUID': ...},
+    {'LID': ...} or the three endpoint fields); for other keys it is None and
+    the field is the list index, if any.
+    """
+    if not path.startswith('/'):
+        raise DeltaError(f"Invalid delta path: '{path}'")
+    segments = [_unescape(segment) for segment in path[1:].split('/')]
+    key, rest = segments[0], segments[1:]
+    if key not in _ENTITY_COLLECTIONS:
+        if len(rest) > 1:
+            raise DeltaError(f"Invalid delta path: '{path}'")
+        return key, None, rest[0] if rest else None
+    if key == 'relations' and rest and rest[0] == _BY_ENDPOINTS:
+        if len(rest) not in (4, 5):
+            raise DeltaError(f"Invalid delta path: '{path}'")
+        return key, dict(zip(_ENDPOINT_FIELDS, rest[1:4])), rest[4] if len(rest) == 5 else None
+    if len(rest) not in (1, 2):
+        raise DeltaError(f"Invalid delta path: '{path}'")
+    identity = {'MUID' if key == 'nodes' else 'LID': rest[0]}
+    return key, identity, rest[1] if len(rest) == 2 else None
+
+
+# --- Computing deltas ---
+
+def _field_ops(path: str, changes: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    ops = []
+    for field, change in changes.items():
+        op = {'path': f"{path}/{_escape(field)}"}
+        if 'old' in change and 'new' in change:
+            op.update(op='replace', old=change['old'], value=change['new'])
+        elif 'new' in change:
+            op.update(op='add', value=change['new'])
+        else:
+            op.update(op='remove', old=change['old'])
+        ops.append(op)
+    return ops
+
+def _list_ops(key: str, old: List[Any], new: List[Any]) -> List[Dict[str, Any]]:
+    """Diffs two lists as a run of removals followed by insertions between their common head and tail."""
+    head = 0
+    limit = min(len(old), len(new))
+    while head < limit and old[head] == new[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and old[len(old) - 1 - tail] == new[len(new) - 1 - tail]:
+        tail += 1
+    ops = [
+        {'op': 'remove', 'path': f"/{_escape(key)}/{index}", 'old': old[index]}
+        for index in range(len(old) - tail - 1, head - 1, -1)
+    ]
+    ops.extend(
+        {'op': 'add', 'path': f"/{_escape(key)}/{index}", 'value': new[index]}
+        for index in range(head, len(new) - tail)
+    )
+    return ops
+
+def compute_delta(graph: SemanticGraph, savepoint: int = 0) -> List[Dict[str, Any]]:
+    """
+    Computes the delta of the changes made to a graph since a savepoint.
+
+    The operations are ordered so that the delta can be applied in sequence:
+    top-level keys, removed relations and nodes, changed nodes and relations,
+    then added nodes and relations.
+
+    Args:
+        graph (SemanticGraph): A graph with an active savepoint.
+        savepoint (int): A value returned by graph.savepoint().
+
+    Returns:
+        The list of delta operations (empty if nothing changed). The values are
+        copies, so later changes to the graph do not alter a recorded delta.
+    """
+    diff = graph.diff_since(savepoint)
+    ops: List[Dict[str, Any]] = []
+    for key, change in diff['graph'].items():
+        old, new = change.get('old', _MISSING), change.get('new', _MISSING)
+        if key not in _ENTITY_COLLECTIONS and isinstance(old, list) and isinstance(new, list):
+            ops.extend(_list_ops(key, old, new))
+        elif old is _MISSING:
+            ops.append({'op': 'add', 'path': f"/{_escape(key)}", 'value': new})
+        elif new is _MISSING:
+            ops.append({'op': 'remove', 'path': f"/{_escape(key)}", 'old': old})
+        else:
+            ops.append({'op': 'replace', 'path': f"/{_escape(key)}", 'old': old, 'value': new})
+    for collection in ('relations', 'nodes'):
+        ops.extend(
+            {'op': 'remove', 'path': entity_path(collection, entity), 'old': entity, 'index': position}
+            for entity, position in zip(diff[collection]['removed'], diff[collection]['removed_at'])
+        )
+    for collection in _ENTITY_COLLECTIONS:
+        for entity, changes in diff[collection]['changed']:
+            ops.extend(_field_ops(entity_path(collection, _original_entity(entity, changes)), changes))
+    for collection in _ENTITY_COLLECTIONS:
+        ops.extend({'op': 'add', 'path': entity_path(collection, entity), 'value': entity} for entity in diff[collection]['added'])
+    return copy.deepcopy(ops)
+
+
+# --- Inspecting deltas ---
+
+_REFERENCE_FIELDS = {'MUID': 'muids', 'from_MUID': 'muids', 'to_MUID': 'muids', 'LID': 'lids'}
+
+def _collect_reference(touched: Dict[str, Set[Any]], field: str, value: Any) -> None:
+    if field in _REFERENCE_FIELDS and value is not None and isinstance(value, Hashable):
+        touched[_REFERENCE_FIELDS[field]].add(value)
+
+def touched_identifiers(delta: List[Dict[str, Any]]) -> Optional[Dict[str, Set[Any]]]:
+    """
+    Collects the identifiers of everything a delta adds or changes.
+
+    Args:
+        delta (List[Dict[str, Any]]): A delta as returned by compute_delta().
+
+    Returns:
+        A dict with 'muids' (the MUIDs of the added and changed nodes and the
+        endpoints of the added and changed relations, before and after each
+        change), 'lids' (the LIDs of the added and changed relations, likewise)
+        and 'keys' (the changed top-level keys). None if the delta removes a node
+        or a relation, or cannot be parsed.
+    """
+    touched: Dict[str, Set[Any]] = {'muids': set(), 'lids': set(), 'keys': set()}
+    for op in delta:
+        try:
+            key, identity, field = _parse_path(op['path'])
+        except (DeltaError, KeyError):
+            return None
+        if identity is None:
+            touched['keys'].add(key)
+            continue
+        for identity_field, value in identity.items():
+            _collect_reference(touched, identity_field, value)
+        if field is not None:
+            _collect_reference(touched, field, op.get('old'))
+            _collect_reference(touched, field, op.get('value'))
+        elif op.get('op') == 'add' and isinstance(op.get('value'), dict):
+            for entity_field, value in op['value'].items():
+                _collect_reference(touched, entity_field, value)
+        else:
+            return None
+    return touched
+
+
+# --- Entity runs ---
+
+def _entity_runs(delta: List[Dict[str, Any]]) -> List[Tuple[int, int, str]]:
+    """
+    Splits a delta into the runs of operations that refer to one existing entity.
+
+    compute_delta() emits the field operations of an entity consecutively, each
+    field once, so a run ends where the entity path changes or a field repeats
+    (the next entity is then a duplicate with the same identifier). An entity
+    removal is a run of its own; additions and top-level keys belong to no run.
+
+    Returns:
+        (start, end, entity path) triples, with end exclusive.
+    """
+    runs = []
+    base, fields = None, set()
+    for position, op in enumerate(delta):
+        _, identity, field = _parse_path(op['path'])
+        if identity is None or field is None:
+            base = None
+            if identity is not None and op['op'] == 'remove':
+                runs.append((position, position + 1, op['path']))
+            continue
+        op_base = op['path'][:op['path'].rindex('/')]
+        if op_base != base or field in fields:
+            base, fields = op_base, set()
+            runs.append((position, position + 1, op_base))
+        fields.add(field)
+        runs[-1] = (runs[-1][0], position + 1, op_base)
+    return runs
+
+
+# --- Inverting deltas ---
+
+def _identity_after(collection: str, identity: Dict[str, Any], ops: List[Dict[str, Any]]) -> str:
+    """Returns the path of an entity after the given field operations were applied to it."""
+    current = dict(identity)
+    for op in ops:
+        field = _parse_path(op['path'])[2]
+        if op['op'] == 'remove':
+            current.pop(field, None)
+        else:
+            current[field] = op['value']
+    return entity_path(collection, current)
+
+def invert_delta(delta: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Returns the delta that undoes the given one.
+
+    The operations are reversed, additions and removals are swapped and the
+    old and new values of replacements are exchanged. Field operations are
+    re-addressed to the entity's identifier after the original delta, since
+    they may have changed it (e.g. a MUID migration).
+    """
+    paths = [op['path'] for op in delta]
+    for start, end, base in _entity_runs(delta):
+        if paths[start] == base:
+            continue  # an entity removal
+        collection, identity, _ = _parse_path(base)
+        renamed = _identity_after(collection, identity, delta[start:end])
+        for position in range(start, end):
+            paths[position] = renamed + paths[position][len(base):]
+
+    inverse = []
+    for op, path in zip(reversed(delta), reversed(paths)):
+        if op['op'] == 'add':
+            inverse.append({'op': 'remove', 'path': path, 'old': op['value']})
+        elif op['op'] == 'remove':
+            inverse.append({'op': 'add', 'path': path, 'value': op['old']})
+        else:
+            inverse.append({'op': 'replace', 'path': path, 'old': op['value'], 'value': op['old']})
+        if 'index' in op:
+            inverse[-1]['index'] = op['index']
+    return inverse
+
+
+# --- Applying deltas ---
+
+def _candidates(graph: SemanticGraph, collection: str, identity: Dict[str, str]) -> List[Dict[str, Any]]:
+    if collection == 'nodes':
+        return graph.lookup_nodes('MUID', identity['MUID']) or []
+    if 'LID' in identity:
+        return graph.lookup_relations('LID', identity['LID']) or []
+    return [
+        relation for relation in graph.lookup_relations('from_MUID', identity['from_MUID']) or []
+        if 'LID' not in relation
+        and str(relation.get('type')) == identity['type']
+        and str(relation.get('to_MUID')) == identity['to_MUID']
+    ]
+
+def _fits(entity: Dict[str, Any], ops: List[Dict[str, Any]]) -> bool:
+    """Checks whether an entity holds the previous values that a run of operations expects."""
+    for op in ops:
+        field = _parse_path(op['path'])[2]
+        if field is None:
+            if entity != op['old']:
+                return False
+        elif op['op'] == 'add':
+            if field in entity:
+                return False
+        elif entity.get(field, _MISSING) != op['old']:
+            return False
+    return True
+
+def _resolve_entities(graph: SemanticGraph, delta: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Finds the entity each removal or field operation refers to, before anything is changed.
+
+    Resolving all targets up front keeps a delta that swaps identifiers between
+    entities unambiguous. Among entities sharing an identifier (duplicates), the
+    first one not yet claimed that holds the expected previous values is chosen.
+
+    Returns:
+        The target entity per operation (None for additions and top-level keys).
+    """
+    targets: List[Optional[Dict[str, Any]]] = [None] * len(delta)
+    claimed = set()
+    for start, end, base in _entity_runs(delta):
+        collection, identity, _ = _parse_path(base)
+        candidates = [entity for entity in _candidates(graph, collection, identity) if id(entity) not in claimed]
+        if not candidates:
+            raise DeltaError(f"No entity found for delta path '{base}'.")
+        ops = delta[start:end]
+        target = next((entity for entity in candidates if _fits(entity, ops)), candidates[0])
+        claimed.add(id(target))
+        targets[start:end] = [target] * (end - start)
+    return targets
+
+def apply_delta(graph_data: Dict[str, Any], delta: List[Dict[str, Any]], check: bool = True) -> Dict[str, Any]:
+    """
+    Applies a delta to a graph, through the graph's mutation methods.
+
+    Args:
+        graph_data: The dictionary representing the graph.
+        delta: The delta operations, in order.
+        check: If True, every 'remove' and 'replace' verifies that the graph holds
+               the recorded previous value and raises DeltaError if not.
+
+    Returns:
+        The modified graph (continue with the returned object).
+
+    Raises:
+        DeltaError: If a path cannot be resolved or, with check, a value does not match.
+    """
+    graph = as_graph(graph_data)
+    targets = _resolve_entities(graph, delta)
+    for op, target in zip(delta, targets):
+        kind = op.get('op')
+        if kind not in ('add', 'remove', 'replace'):
+            raise DeltaError(f"Unsupported delta operation: '{kind}'")
+        collection, identity, field = _parse_path(op['path'])
+        if identity is None:
+            _apply_key_op(graph, op, collection, field, check)
+        elif field is None:
+            if kind == 'add':
+                position = op.get('index')
+                if position is not None and not (isinstance(position, int) and 0 <= position <= len(graph.get(collection, []))):
+                    raise DeltaError(f"Entity index out of range in delta operation at '{op['path']}'.")
+                (graph.add_node if collection == 'nodes' else graph.add_relation)(dict(op['value']), position)
+            elif kind == 'remove':
+                if check and target != op['old']:
+                    raise DeltaError(f"Entity at '{op['path']}' does not match the delta.")
+                (graph.remove_node if collection == 'nodes' else graph.remove_relation)(target)
+            else:
+                raise DeltaError(f"Entities are added or removed, not replaced: '{op['path']}'")
+        else:
+            if check and kind != 'add' and target.get(field, _MISSING) != op['old']:
+                raise DeltaError(f"Field at '{op['path']}' does not match the delta.")
+            _apply_field_op(graph, collection, target, field, op)
+    return graph
+
+def _apply_field_op(graph: SemanticGraph, collection: str, entity: Dict[str, Any], field: str, op: Dict[str, Any]) -> None:
+    if op['op'] == 'remove':
+        (graph.delete_node_fields if collection == 'nodes' else graph.delete_relation_fields)(entity, [field])
+    else:
+        (graph.update_node if collection == 'nodes' else graph.update_relation)(entity, {field: op['value']})
+
+def _apply_key_op(graph: SemanticGraph, op: Dict[str, Any], key: str, index: Optional[str], check: bool) -> None:
+    kind = op['op']
+    if index is None:
+        if check and kind != 'add' and graph.get(key, _MISSING) != op['old']:
+            raise DeltaError(f"Key '/{key}' does not match the delta.")
+        if kind == 'remove':
+            del graph[key]
+        else:
+            graph[key] = op['value']
+        return
+    items = list(graph.get(key, []))
+    try:
+        position = int(index)
+    except ValueError as e:
+        raise DeltaError(f"Invalid list index in delta path '{op['path']}'.") from e
+    if kind == 'add':
+        if not 0 <= position <= len(items):
+            raise DeltaError(f"List index out of range in delta path '{op['path']}'.")
+        items.insert(position, op['value'])
+    else:
+        if not 0 <= position < len(items) or (check and items[position] != op['old']):
+            raise DeltaError(f"List element at '{op['path']}' does not match the delta.")
+        if kind == 'remove':
+            del items[position]
+        else:
+            items[position] = op['value']
+    graph[key] = items
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+graph_diff.py
+
+This module renders a structural diff of a Semantic Graph, as produced by
+SemanticGraph.diff_since(), as compact human-readable text: per-collection
+counts of added, removed and changed entities, followed by the entities
+themselves with field-level detail.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import json
+from typing import Dict, Any, List
+
+# Longest rendering of a single field value before it is shortened.
+_MAX_VALUE_LENGTH = 80
+
+_ENTITY_KINDS = (('nodes', 'node'), ('relations', 'relation'))
+
+
+def _format_value(value: Any) -> str:
+    """Renders a field value as compact JSON, shortening long values."""
+    if isinstance(value, list) and len(value) > 3:
+        return f"[{len(value)} items]"
+    try:
+        text = json.dumps(value, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        text = repr(value)
+    if len(text) > _MAX_VALUE_LENGTH:
+        text = text[:_MAX_VALUE_LENGTH - 3] + '...'
+    return text
+
+def _format_change(field: str, change: Dict[str, Any]) -> str:
+    if 'old' not in change:
+        return f"{field}: + {_format_value(change['new'])}"
+    if 'new' not in change:
+        return f"{field}: - {_format_value(change['old'])}"
+    return f"{field}: {_format_value(change['old'])} -> {_format_value(change['new'])}"
+
+def entity_label(kind: str, entity: Dict[str, Any]) -> str:
+    """Returns a short identifying label for a node or relation."""
+    if kind == 'node':
+        return f"node {entity.get('MUID', '<no MUID>')}"
+    endpoints = f"{entity.get('from_MUID')} -[{entity.get('type')}]-> {entity.get('to_MUID')}"
+    if 'LID' in entity:
+        return f"relation {entity['LID']} ({endpoints})"
+    return f"relation ({endpoints})"
+
+def _original_entity(entity: Dict[str, Any], changes: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Reconstructs the identifying fields of a changed entity as they were before the change."""
+    original = dict(entity)
+    for field, change in changes.items():
+        if 'old' in change:
+            original[field] = change['old']
+        else:
+            original.pop(field, None)
+    return original
+
+def count_changes(diff: Dict[str, Any]) -> int:
+    """Returns the total number of changed entities and top-level keys in a diff."""
+    total = len(diff.get('graph', {}))
+    for collection, _ in _ENTITY_KINDS:
+        entries = diff.get(collection, {})
+        total += sum(len(entries.get(category, [])) for category in ('added', 'removed', 'changed'))
+    return total
+
+def describe_diff(diff: Dict[str, Any], limit: int = 50) -> List[str]:
+    """
+    Renders a structural diff as lines of text.
+
+    Args:
+        diff (Dict[str, Any]): A diff as returned by SemanticGraph.diff_since().
+        limit (int): The maximum number of entries listed per category; 0 lists all.
+
+    Returns:
+        The lines of the rendering, starting with a one-line summary per collection.
+    """
+    if not count_changes(diff):
+        return ["No structural changes."]
+
+    lines = []
+    for collection, _ in _ENTITY_KINDS:
+        entries = diff[collection]
+        lines.append(
+            f"{collection}: {len(entries['added'])} added, {len(entries['removed'])} removed, "
+            f"{len(entries['changed'])} changed"
+        )
+    if diff['graph']:
+        lines.append(f"graph properties changed: {', '.join(diff['graph'])}")
+
+    def listed(items: List[Any]) -> List[Any]:
+        return items if not limit else items[:limit]
+
+    def overflow(items: List[Any]) -> None:
+        if limit and len(items) > limit:
+            lines.append(f"    ... and {len(items) - limit} more")
+
+    for collection, kind in _ENTITY_KINDS:
+        entries = diff[collection]
+        for entity in listed(entries['added']):
+            lines.append(f"  + {entity_label(kind, entity)}")
+        overflow(entries['added'])
+        for entity in listed(entries['removed']):
+            lines.append(f"  - {entity_label(kind, entity)}")
+        overflow(entries['removed'])
+        for entity, changes in listed(entries['changed']):
+            lines.append(f"  ~ {entity_label(kind, _original_entity(entity, changes))}")
+            lines.extend(f"      {_format_change(field, change)}" for field, change in changes.items())
+        overflow(entries['changed'])
+    for key, change in diff['graph'].items():
+        lines.append(f"  ~ graph.{_format_change(key, change)}")
+    return lines
@@ -4,9 +4,10 @@ graph_io.py
 
 Core module for handling low-level input/output operations for Semantic Graphs (SG).
 This module is responsible for:
-- Loading graph data from .md files.
+- Loading graph data from .md files (through the optional parsed-graph cache).
 - Parsing YAML frontmatter and JSON graph content.
-- Saving graph data back to .md files.
+- Saving graph data back to .md files (atomically, skipping unchanged files).
+- Appending to and reading append-only JSON-lines journals (used for LSGs).
 - Creating backups of graph files before modification.
 
 This version incorporates robust error handling, type hinting,
@@ -17,13 +18,19 @@ Copyright (c) Rustam Kunafin 2025. All rights reserved.
 Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
 """
 
+import hashlib
 import json
-import re
+import mmap
+import os
 import shutil
+import tempfile
 import yaml
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterator, List, Tuple
+
+from . import graph_cache
+from . import serialization
 
 # --- Custom Exceptions for Clearer Error Reporting ---
 
@@ -44,11 +51,69 @@ class GraphFileSaveError(GraphFileError):
     pass
 
 
+# --- File Layout Markers ---
+
+_FRONTMATTER_DELIMITER = b'---'
+_JSON_FENCE_OPEN = b'```json'
+_JSON_FENCE_CLOSE = b'\n```'
+_ASCII_WHITESPACE = b' \t\n\r\f\v'
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _locate_sections(buffer) -> Tuple[int, int, int, int]:
+    """
+    Finds the byte offsets of the YAML frontmatter and of the JSON block body.
+
+    The buffer is scanned once from left to right and nothing is copied. The
+    offsets follow the historical parsing rules: the frontmatter lies between
+    the first two '---' markers, and the JSON body is the text between the
+    newline ending a "```json" opening line and the next "\n```".
+
+    Args:
+        buffer: A bytes-like object supporting find() (bytes or mmap).
+
+    Returns:
+        A tuple (yaml_start, yaml_end, json_start, json_end).
+
+    Raises:
+        GraphFileParseError: If either section cannot be found.
+    """
+    yaml_start = buffer.find(_FRONTMATTER_DELIMITER)
+    yaml_end = buffer.find(_FRONTMATTER_DELIMITER, yaml_start + 3) if yaml_start != -1 else -1
+    if yaml_end == -1:
+        raise GraphFileParseError("File does not contain a valid YAML frontmatter section.")
+    yaml_start += 3
+
+    search_from = yaml_end + 3
+    while True:
+        fence = buffer.find(_JSON_FENCE_OPEN, search_from)
+        if fence == -1:
+            raise GraphFileParseError("Could not find a ```json ... ``` block in the file.")
+        # Skip the whitespace after the fence; the body starts after its last newline.
+        position = fence + len(_JSON_FENCE_OPEN)
+        json_start = -1
+        while position < len(buffer) and buffer[position] in _ASCII_WHITESPACE:
+            if buffer[position] == 0x0A:
+                json_start = position + 1
+            position += 1
+        if json_start != -1:
+            json_end = buffer.find(_JSON_FENCE_CLOSE, json_start)
+            if json_end != -1:
+                return yaml_start, yaml_end, json_start, json_end
+        search_from = fence + 1
+
+
 def load_graph_from_file(file_path: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
     Loads a Semantic Graph from a specified .md file.
 
     The file is expected to have a YAML frontmatter section and a JSON content block.
+    The file is memory-mapped and the section boundaries are located by offset, so
+    the JSON body is handed to the active codec (see serialization.py) as a single
+    zero-copy view of the mapping. When the graph cache is enabled (see
+    graph_cache.py), an unchanged file is not parsed at all: its cached content is
+    returned instead, and a freshly parsed file is added to the cache.
 
     Args:
         file_path (Path): The path to the .md file.
@@ -65,35 +130,39 @@ def load_graph_from_file(file_path: Path) -> Tuple[Dict[str, Any], Dict[str, Any
     if not file_path.is_file():
         raise GraphFileNotFoundError(f"Graph file not found at: {file_path}")
 
+    codec = serialization.get_codec()
+    cache = graph_cache.get_cache()
     try:
-        with file_path.open('r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Split the content into YAML frontmatter and the rest
-        parts = content.split('---', 2)
-        if len(parts) < 3:
-            raise GraphFileParseError("File does not contain a valid YAML frontmatter section.")
-
-        yaml_content = parts[1]
-        rest_of_content = parts[2]
+        with file_path.open('rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size == 0:
+                raise GraphFileParseError("File does not contain a valid YAML frontmatter section.")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if cache is not None:
+                    # Hashing the mapping that is parsed below ties the entry to exactly this content.
+                    content_hash = hashlib.sha256(mapped).hexdigest()
+                    cached = cache.get(file_path, stat, content_hash)
+                    if cached is not None:
+                        return cached
+                yaml_start, yaml_end, json_start, json_end = _locate_sections(mapped)
+                with memoryview(mapped) as view:
+                    yaml_content = str(view[yaml_start:yaml_end], 'utf-8')
+                    graph_data = codec.loads_json(view[json_start:json_end])
 
         # Parse YAML metadata
-        metadata = yaml.safe_load(yaml_content)
+        metadata = codec.load_yaml(yaml_content)
         if not isinstance(metadata, dict):
             raise GraphFileParseError("Failed to parse YAML metadata or it is not a dictionary.")
 
-        # Find and parse the JSON block
-        json_match = re.search(r'```json\s*\n(.*?)\n```', rest_of_content, re.DOTALL)
-        if not json_match:
-            raise GraphFileParseError("Could not find a ```json ... ``` block in the file.")
-
-        json_content = json_match.group(1)
-        graph_data = json.loads(json_content)
         if not isinstance(graph_data, dict):
             raise GraphFileParseError("Failed to parse JSON graph data or it is not a dictionary.")
 
+        if cache is not None:
+            cache.put(file_path, stat, content_hash, metadata, graph_data)
         return metadata, graph_data
 
+    except GraphFileParseError:
+        raise
     except yaml.YAMLError as e:
         raise GraphFileParseError(f"Error parsing YAML frontmatter: {e}") from e
     except json.JSONDecodeError as e:
@@ -103,48 +172,140 @@ def load_graph_from_file(file_path: Path) -> Tuple[Dict[str, Any], Dict[str, Any
         raise GraphFileParseError(f"An unexpected error occurred while loading the graph: {e}") from e
 
 
-def save_graph_to_file(file_path: Path, metadata: Dict[str, Any], graph_data: Dict[str, Any]) -> None:
+def render_graph(metadata: Dict[str, Any], graph_data: Dict[str, Any]) -> bytes:
+    """
+    Serializes a graph into the standard .md file format.
+
+    The metadata is written as YAML frontmatter and the graph data as a JSON
+    block, both with the active codec.
+
+    Args:
+        metadata (Dict[str, Any]): The dictionary containing the graph's metadata.
+        graph_data (Dict[str, Any]): The dictionary containing the graph's nodes and relations.
+
+    Returns:
+        The UTF-8 encoded file content.
+    """
+    codec = serialization.get_codec()
+
+    # Serialize metadata to a clean YAML string
+    yaml_string = codec.dump_yaml(metadata)
+
+    # Serialize graph data to a formatted JSON string
+    json_string = codec.dumps_json(graph_data)
+
+    # Assemble the full file content
+    file_content = (
+        f"---\n"
+        f"{yaml_string.strip()}\n"
+        f"---\n\n"
+        f"```json\n"
+        f"{json_string}\n"
+        f"```\n"
+    )
+    return file_content.encode('utf-8')
+
+
+def _file_has_content(file_path: Path, content: bytes) -> bool:
+    """Checks whether a file already holds exactly the given content (size, then hash)."""
+    try:
+        if file_path.stat().st_size != len(content):
+            return False
+        existing_hash = hashlib.sha256()
+        with file_path.open('rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+                existing_hash.update(chunk)
+    except FileNotFoundError:
+        return False
+    return existing_hash.digest() == hashlib.sha256(content).digest()
+
+
+def _write_atomically(file_path: Path, content: bytes) -> None:
+    """
+    Replaces a file's content atomically.
+
+    The content is written to a temporary file in the same directory, flushed to
+    disk with fsync and then moved over the target with os.replace(), so readers
+    and crashes only ever see the old or the new complete file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if file_path.exists():
+            shutil.copymode(file_path, tmp_path)
+        else:
+            # mkstemp creates files as 0600; use the permissions a plain open() would.
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _fsync_directory(file_path.parent)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persists a rename by syncing its directory (a no-op where unsupported)."""
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def save_graph_to_file(file_path: Path, metadata: Dict[str, Any], graph_data: Dict[str, Any], backup: bool = False) -> bool:
     """
     Saves the Semantic Graph data to a specified .md file.
 
-    This function serializes the metadata to YAML and the graph data to JSON,
-    then writes them into the file in the standard format.
+    This function serializes the metadata to YAML and the graph data to JSON
+    with the active codec. If the file already holds exactly this content, it is
+    left untouched. Otherwise the new content replaces the file atomically, so a
+    crash mid-write can never leave a truncated graph behind. A written graph is
+    also stored in the graph cache (if enabled), so the next load does not have to
+    parse it.
 
     Args:
         file_path (Path): The path to the target .md file.
         metadata (Dict[str, Any]): The dictionary containing the graph's metadata.
         graph_data (Dict[str, Any]): The dictionary containing the graph's nodes and relations.
+        backup (bool): If True, a timestamped backup of the existing file is created
+                       before it is overwritten (never when the write is skipped).
+
+    Returns:
+        True if the file was written, False if it was already up to date.
 
     Raises:
         GraphFileSaveError: If an error occurs during the file writing process.
+        GraphFileError: If the requested backup cannot be created.
     """
     try:
-        # Serialize metadata to a clean YAML string
-        yaml_string = yaml.dump(
-            metadata,
-            allow_unicode=True,
-            sort_keys=False,
-            default_flow_style=False,
-            indent=2
-        )
-
-        # Serialize graph data to a formatted JSON string
-        json_string = json.dumps(graph_data, indent=2, ensure_ascii=False)
-
-        # Assemble the full file content
-        file_content = (
-            f"---\n"
-            f"{yaml_string.strip()}\n"
-            f"---\n\n"
-            f"```json\n"
-            f"{json_string}\n"
-            f"```\n"
-        )
-
-        # Write the content to the file
-        with file_path.open('w', encoding='utf-8') as f:
-            f.write(file_content)
+        file_content = render_graph(metadata, graph_data)
 
+        if _file_has_content(file_path, file_content):
+            return False
+
+        if backup and file_path.is_file():
+            create_backup(file_path)
+
+        _write_atomically(file_path, file_content)
+        cache = graph_cache.get_cache()
+        if cache is not None:
+            content_hash = hashlib.sha256(file_content).hexdigest()
+            cache.put(file_path, file_path.stat(), content_hash, metadata, graph_data)
+        return True
+
+    except GraphFileError:
+        raise
     except (yaml.YAMLError, TypeError) as e:
         raise GraphFileSaveError(f"Error serializing data to YAML or JSON: {e}") from e
     except IOError as e:
@@ -153,6 +314,70 @@ def save_graph_to_file(file_path: Path, metadata: Dict[str, Any], graph_data: Di
         raise GraphFileSaveError(f"An unexpected error occurred while saving the graph: {e}") from e
 
 
+def append_journal_records(journal_path: Path, records: List[Dict[str, Any]]) -> None:
+    """
+    Appends records to a JSON-lines journal file and flushes them to disk.
+
+    Each record is written as one line. The whole batch is written with a single
+    append followed by fsync, so a commit costs O(size of the records) regardless
+    of how large the journal already is.
+
+    Args:
+        journal_path (Path): The path to the .jsonl journal file (created if missing).
+        records (List[Dict[str, Any]]): The records to append.
+
+    Raises:
+        GraphFileSaveError: If the records cannot be serialized or written.
+    """
+    if not records:
+        return
+    try:
+        codec = serialization.get_codec()
+        payload = ''.join(codec.dumps_json_line(record) + '\n' for record in records).encode('utf-8')
+        with journal_path.open('ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+    except TypeError as e:
+        raise GraphFileSaveError(f"Error serializing journal records: {e}") from e
+    except OSError as e:
+        raise GraphFileSaveError(f"Error appending to journal at {journal_path}: {e}") from e
+
+
+def read_journal_records(journal_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the records of a JSON-lines journal file in order.
+
+    A final line without a trailing newline is the remains of an interrupted
+    append; it is skipped with a warning instead of failing the whole load.
+
+    Args:
+        journal_path (Path): The path to the .jsonl journal file.
+
+    Raises:
+        GraphFileNotFoundError: If the journal does not exist.
+        GraphFileParseError: If a complete line cannot be parsed.
+    """
+    if not journal_path.is_file():
+        raise GraphFileNotFoundError(f"Journal file not found at: {journal_path}")
+
+    codec = serialization.get_codec()
+    with journal_path.open('rb') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = codec.loads_json(line)
+            except ValueError as e:
+                if not line.endswith(b'\n'):
+                    print(f"Warning: Ignoring incomplete last record in journal {journal_path}.")
+                    return
+                raise GraphFileParseError(f"Error parsing journal {journal_path} at line {line_number}: {e}") from e
+            if not isinstance(record, dict):
+                raise GraphFileParseError(f"Journal {journal_path} line {line_number} is not a JSON object.")
+            yield record
+
+
 def create_backup(file_path: Path) -> Path:
     """
     Creates a timestamped backup of the given file.
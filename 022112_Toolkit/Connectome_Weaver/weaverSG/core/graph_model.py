@@ -0,0 +1,598 @@
+# -*- coding: utf-8 -*-
+"""
+graph_model.py
+
+This module defines the SemanticGraph class, the in-memory container for the
+data of a Semantic Graph (SG) or a Log Semantic Graph (LSG).
+
+SemanticGraph is a dict subclass: it holds exactly the same top-level keys
+('nodes', 'relations', 'validation_issues', ...) as the parsed JSON block and
+therefore serializes to the same JSON. On top of that it maintains hash indexes
+(MUID -> nodes, LID -> relations) so that lookups by identifier cost O(1)
+instead of a linear scan over the entity lists. Relations are additionally
+indexed by their 'from_MUID' and 'to_MUID' endpoints, which gives an out/in
+adjacency index: the relations incident to a node are found in O(degree).
+Both kinds are also indexed by 'type', which query selection (query.py) uses.
+
+The indexes are built lazily on the first lookup and are kept in sync by the
+mutation methods of this class. Code that changes entities must go through
+these methods (or call invalidate_indexes()) to keep the indexes valid.
+
+The same methods feed an optional undo journal. After savepoint() each mutation
+records just enough to revert it (the touched entity and the previous values of
+the changed fields), and rollback() restores the graph to the savepoint without
+ever copying the whole graph. The journal also yields the net structural diff
+since a savepoint (diff_since()), e.g. for a dry run.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+from typing import Dict, Any, List, Optional, Iterable
+
+# Fields that are indexed for each entity kind.
+NODE_INDEXED_FIELDS = ('MUID', 'type')
+RELATION_INDEXED_FIELDS = ('LID', 'from_MUID', 'to_MUID', 'type')
+# Identity fields: find_node()/find_relation() return the first entity of their
+# buckets, so these buckets are kept in list order when an update re-indexes an entity.
+_IDENTITY_FIELDS = ('MUID', 'LID')
+
+# Up to this many relations are removed one by one, more are removed by compaction.
+_BATCH_REMOVE_THRESHOLD = 16
+
+# Marks a field or key that did not exist before a change, in undo records.
+_MISSING = object()
+
+
+class SemanticGraph(dict):
+    """
+    An indexed, dict-compatible container for the data of a Semantic Graph.
+
+    Indexes map a field value to the list of entities holding that value, in
+    insertion order. A list (rather than a single entity) is kept per value so
+    that graphs containing duplicate MUIDs, which the validator reports, are
+    still handled correctly: the first entity of a MUID or LID bucket is the one
+    a linear scan would have found. Buckets of the other fields follow list order
+    until an update moves an entity into them, which appends it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._node_indexes: Optional[Dict[str, Dict[Any, List[Dict[str, Any]]]]] = None
+        self._relation_indexes: Optional[Dict[str, Dict[Any, List[Dict[str, Any]]]]] = None
+        # Undo records since the first savepoint; None while no savepoint is active.
+        self._undo_journal: Optional[List[tuple]] = None
+
+    def __reduce__(self):
+        # Copies and pickles carry the graph data, not the indexes or the undo journal.
+        return self.__class__, (dict(self),)
+
+    # --- dict overrides: replacing a whole collection invalidates its indexes ---
+
+    def __setitem__(self, key, value):
+        self._record_keys((key,))
+        super().__setitem__(key, value)
+        self._invalidate_for_keys((key,))
+
+    def __delitem__(self, key):
+        self._record_keys((key,))
+        super().__delitem__(key)
+        self._invalidate_for_keys((key,))
+
+    def update(self, *args, **kwargs):
+        updates = dict(*args, **kwargs)
+        self._record_keys(updates.keys())
+        super().update(updates)
+        self._invalidate_for_keys(updates.keys())
+
+    def pop(self, key, *args):
+        self._record_keys((key,))
+        value = super().pop(key, *args)
+        self._invalidate_for_keys((key,))
+        return value
+
+    def clear(self):
+        self._record_keys(list(self.keys()))
+        super().clear()
+        self.invalidate_indexes()
+
+    def _invalidate_for_keys(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            if key == 'nodes':
+                self._node_indexes = None
+            elif key == 'relations':
+                self._relation_indexes = None
+
+    # --- Collections ---
+
+    @property
+    def nodes(self) -> List[Dict[str, Any]]:
+        """The list of nodes, created on first access if missing."""
+        if 'nodes' not in self:
+            self._record_keys(('nodes',))
+            super().__setitem__('nodes', [])
+        return self['nodes']
+
+    @property
+    def relations(self) -> List[Dict[str, Any]]:
+        """The list of relations, created on first access if missing."""
+        if 'relations' not in self:
+            self._record_keys(('relations',))
+            super().__setitem__('relations', [])
+        return self['relations']
+
+    # --- Index management ---
+
+    def invalidate_indexes(self) -> None:
+        """Drops all indexes. They are rebuilt on the next lookup."""
+        self._node_indexes = None
+        self._relation_indexes = None
+
+    @staticmethod
+    def _build_indexes(entities: List[Dict[str, Any]], fields: Iterable[str]) -> Dict[str, Dict[Any, List[Dict[str, Any]]]]:
+        indexes = {field: {} for field in fields}
+        for entity in entities:
+            _index_entity(indexes, entity)
+        return indexes
+
+    def _get_node_indexes(self) -> Dict[str, Dict[Any, List[Dict[str, Any]]]]:
+        if self._node_indexes is None:
+            self._node_indexes = self._build_indexes(self.get('nodes', []), NODE_INDEXED_FIELDS)
+        return self._node_indexes
+
+    def _get_relation_indexes(self) -> Dict[str, Dict[Any, List[Dict[str, Any]]]]:
+        if self._relation_indexes is None:
+            self._relation_indexes = self._build_indexes(self.get('relations', []), RELATION_INDEXED_FIELDS)
+        return self._relation_indexes
+
+    # --- Lookups ---
+
+    def find_node(self, muid: str) -> Optional[Dict[str, Any]]:
+        """Returns the first node with the given MUID, or None."""
+        bucket = _lookup(self._get_node_indexes()['MUID'], muid)
+        return bucket[0] if bucket else None
+
+    def find_relation(self, lid: str) -> Optional[Dict[str, Any]]:
+        """Returns the first relation with the given LID, or None."""
+        bucket = _lookup(self._get_relation_indexes()['LID'], lid)
+        return bucket[0] if bucket else None
+
+    def has_node(self, muid: str) -> bool:
+        """Checks whether at least one node with the given MUID exists."""
+        return bool(_lookup(self._get_node_indexes()['MUID'], muid))
+
+    def lookup_nodes(self, field: str, value: Any) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns a snapshot list of the nodes whose indexed field equals value.
+
+        Returns None when the field is not indexed or the value is unhashable,
+        in which case the caller has to fall back to a scan.
+        """
+        return _snapshot(self._get_node_indexes(), field, value)
+
+    def lookup_relations(self, field: str, value: Any) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns a snapshot list of the relations whose indexed field equals value.
+
+        Returns None when the field is not indexed or the value is unhashable,
+        in which case the caller has to fall back to a scan.
+        """
+        return _snapshot(self._get_relation_indexes(), field, value)
+
+    def outgoing_relations(self, muid: str) -> List[Dict[str, Any]]:
+        """Returns a snapshot list of the relations whose 'from_MUID' is muid."""
+        return list(_lookup(self._get_relation_indexes()['from_MUID'], muid) or ())
+
+    def incoming_relations(self, muid: str) -> List[Dict[str, Any]]:
+        """Returns a snapshot list of the relations whose 'to_MUID' is muid."""
+        return list(_lookup(self._get_relation_indexes()['to_MUID'], muid) or ())
+
+    def incident_relations(self, muid: str) -> List[Dict[str, Any]]:
+        """Returns the relations touching muid in either direction, each once."""
+        relations = self.outgoing_relations(muid)
+        seen = {id(relation) for relation in relations}
+        relations.extend(r for r in self.incoming_relations(muid) if id(r) not in seen)
+        return relations
+
+    # --- Node mutations ---
+
+    def add_node(self, node: Dict[str, Any], position: Optional[int] = None) -> None:
+        """
+        Appends a node (or inserts it at a list position) and registers it in the indexes.
+
+        An insertion invalidates the indexes instead, as their per-value lists follow
+        the order of the nodes list.
+        """
+        nodes = self.nodes
+        if position is None:
+            nodes.append(node)
+            self._record('append', 'nodes', nodes, node)
+            if self._node_indexes is not None:
+                _index_entity(self._node_indexes, node)
+        else:
+            nodes.insert(position, node)
+            self._record('insert', 'nodes', nodes, position, node)
+            self._node_indexes = None
+
+    def remove_node(self, node: Dict[str, Any]) -> None:
+        """Removes the given node object from the graph."""
+        nodes = self.nodes
+        position = _position_of(nodes, node)
+        del nodes[position]
+        self._record('remove', 'nodes', nodes, [(position, node)])
+        if self._node_indexes is not None:
+            _unindex_entity(self._node_indexes, node)
+
+    def remove_nodes(self, nodes_to_remove: List[Dict[str, Any]]) -> None:
+        """Removes several node objects at once (see remove_relations())."""
+        if len(nodes_to_remove) <= _BATCH_REMOVE_THRESHOLD:
+            for node in nodes_to_remove:
+                self.remove_node(node)
+            return
+        self._compact('nodes', self.nodes, nodes_to_remove)
+        if self._node_indexes is not None:
+            for node in nodes_to_remove:
+                _unindex_entity(self._node_indexes, node)
+
+    def update_node(self, node: Dict[str, Any], updates: Dict[str, Any]) -> None:
+        """Applies field updates to a node, re-indexing it if an indexed field changes."""
+        self._record_fields('nodes', node, updates)
+        _update_entity(self._node_indexes, node, updates, self.nodes)
+
+    def delete_node_fields(self, node: Dict[str, Any], fields: Iterable[str]) -> None:
+        """Removes fields from a node, dropping it from the indexes of removed indexed fields."""
+        fields = [field for field in fields if field in node]
+        self._record_fields('nodes', node, fields)
+        _delete_fields(self._node_indexes, node, fields)
+
+    # --- Relation mutations ---
+
+    def add_relation(self, relation: Dict[str, Any], position: Optional[int] = None) -> None:
+        """Appends a relation (or inserts it at a list position, see add_node()) and registers it in the indexes."""
+        relations = self.relations
+        if position is None:
+            relations.append(relation)
+            self._record('append', 'relations', relations, relation)
+            if self._relation_indexes is not None:
+                _index_entity(self._relation_indexes, relation)
+        else:
+            relations.insert(position, relation)
+            self._record('insert', 'relations', relations, position, relation)
+            self._relation_indexes = None
+
+    def remove_relation(self, relation: Dict[str, Any]) -> None:
+        """Removes the given relation object from the graph."""
+        relations = self.relations
+        position = _position_of(relations, relation)
+        del relations[position]
+        self._record('remove', 'relations', relations, [(position, relation)])
+        if self._relation_indexes is not None:
+            _unindex_entity(self._relation_indexes, relation)
+
+    def remove_relations(self, relations_to_remove: List[Dict[str, Any]]) -> None:
+        """
+        Removes several relation objects at once.
+
+        A handful of relations are deleted one by one; larger batches are removed
+        with a single compaction of the relations list instead of one list scan
+        per relation.
+        """
+        if len(relations_to_remove) <= _BATCH_REMOVE_THRESHOLD:
+            for relation in relations_to_remove:
+                self.remove_relation(relation)
+            return
+        self._compact('relations', self.relations, relations_to_remove)
+        if self._relation_indexes is not None:
+            for relation in relations_to_remove:
+                _unindex_entity(self._relation_indexes, relation)
+
+    def update_relation(self, relation: Dict[str, Any], updates: Dict[str, Any]) -> None:
+        """Applies field updates to a relation, re-indexing it if an indexed field changes."""
+        self._record_fields('relations', relation, updates)
+        _update_entity(self._relation_indexes, relation, updates, self.relations)
+
+    def delete_relation_fields(self, relation: Dict[str, Any], fields: Iterable[str]) -> None:
+        """Removes fields from a relation, dropping it from the indexes of removed indexed fields."""
+        fields = [field for field in fields if field in relation]
+        self._record_fields('relations', relation, fields)
+        _delete_fields(self._relation_indexes, relation, fields)
+
+    def _compact(self, collection: str, entities: List[Dict[str, Any]], entities_to_remove: List[Dict[str, Any]]) -> None:
+        """Removes entities from a list in one pass, recording them for undo."""
+        doomed = {id(entity) for entity in entities_to_remove}
+        if self._undo_journal is not None:
+            removed = [(position, e) for position, e in enumerate(entities) if id(e) in doomed]
+            self._record('remove', collection, entities, removed)
+        entities[:] = [e for e in entities if id(e) not in doomed]
+
+    # --- Undo journal ---
+
+    def savepoint(self) -> int:
+        """
+        Starts (or continues) recording undo information and marks the current state.
+
+        Returns:
+            A savepoint to pass to rollback().
+        """
+        if self._undo_journal is None:
+            self._undo_journal = []
+        return len(self._undo_journal)
+
+    def rollback(self, savepoint: int = 0) -> int:
+        """
+        Reverts every change made through this graph since the given savepoint.
+
+        Only the entities and keys touched after the savepoint are restored, in
+        reverse order. The indexes are rebuilt on the next lookup.
+
+        Args:
+            savepoint (int): A value returned by savepoint(); 0 reverts to the first one.
+
+        Returns:
+            The number of changes that were reverted.
+
+        Raises:
+            ValueError: If no savepoint is active or the savepoint is unknown.
+        """
+        journal = self._undo_journal
+        if journal is None or not 0 <= savepoint <= len(journal):
+            raise ValueError(f"Unknown savepoint: {savepoint}")
+        reverted = len(journal) - savepoint
+        while len(journal) > savepoint:
+            _undo(self, journal.pop())
+        self.invalidate_indexes()
+        return reverted
+
+    def release_savepoints(self) -> None:
+        """Stops recording undo information and drops all savepoints."""
+        self._undo_journal = None
+
+    def changes_since(self, savepoint: int = 0) -> int:
+        """Returns the number of changes recorded since a savepoint (0 if none is active)."""
+        return len(self._undo_journal) - savepoint if self._undo_journal is not None else 0
+
+    def diff_since(self, savepoint: int = 0) -> Dict[str, Any]:
+        """
+        Summarizes the net changes made since a savepoint, from the undo journal.
+
+        Only the entities recorded in the journal are inspected, so the cost is
+        proportional to the number of changes, not to the size of the graph.
+
+        Args:
+            savepoint (int): A value returned by savepoint().
+
+        Returns:
+            A dict with the keys 'nodes' and 'relations', each holding lists
+            'added' and 'removed' (entities, removed ones with their original field
+            values, in the order of removal), 'removed_at' (the list position of each
+            removed entity, counted in the list as it was when that entity was
+            removed) and 'changed' (pairs of the entity and its field changes), and
+            'graph' holding the changed top-level keys. A field change is a dict with
+            'old' and/or 'new'; a side is omitted when the field was absent.
+
+        Raises:
+            ValueError: If no savepoint is active or the savepoint is unknown.
+        """
+        journal = self._undo_journal
+        if journal is None or not 0 <= savepoint <= len(journal):
+            raise ValueError(f"Unknown savepoint: {savepoint}")
+
+        collections = {name: {'added': {}, 'removed': {}, 'removed_at': {}, 'original': {}} for name in ('nodes', 'relations')}
+        original_keys: Dict[str, Any] = {}
+        for record in journal[savepoint:]:
+            kind = record[0]
+            if kind == 'keys':
+                for key, value in record[1].items():
+                    original_keys.setdefault(key, value)
+                continue
+            state = collections[record[1]]
+            if kind in ('append', 'insert'):
+                state['added'][id(record[-1])] = record[-1]
+            elif kind == 'remove':
+                # A batch records positions in the list before the batch; the k-th removed
+                # entity sits k places earlier once the ones before it are gone.
+                for k, (position, entity) in enumerate(record[3]):
+                    if state['added'].pop(id(entity), None) is None:
+                        state['removed'][id(entity)] = entity
+                        state['removed_at'][id(entity)] = position - k
+            elif kind == 'fields' and id(record[2]) not in state['added']:
+                _, original = state['original'].setdefault(id(record[2]), (record[2], {}))
+                for field, value in record[3].items():
+                    original.setdefault(field, value)
+
+        diff: Dict[str, Any] = {}
+        for name, state in collections.items():
+            removed = []
+            for key, entity in state['removed'].items():
+                if key in state['original']:
+                    entity = dict(entity)
+                    _restore(entity, state['original'][key][1])
+                removed.append(entity)
+            changed = []
+            for key, (entity, original) in state['original'].items():
+                if key in state['removed']:
+                    continue
+                field_changes = _field_changes(original, entity)
+                if field_changes:
+                    changed.append((entity, field_changes))
+            diff[name] = {
+                'added': list(state['added'].values()), 'removed': removed,
+                'removed_at': list(state['removed_at'].values()), 'changed': changed
+            }
+        diff['graph'] = _field_changes(original_keys, self)
+        return diff
+
+    def _record(self, kind: str, *details) -> None:
+        if self._undo_journal is not None:
+            self._undo_journal.append((kind, *details))
+
+    def _record_fields(self, collection: str, entity: Dict[str, Any], updates: Iterable[str]) -> None:
+        if self._undo_journal is not None:
+            previous = {field: entity.get(field, _MISSING) for field in updates}
+            self._undo_journal.append(('fields', collection, entity, previous))
+
+    def _record_keys(self, keys: Iterable[str]) -> None:
+        if self._undo_journal is not None:
+            previous = {key: dict.get(self, key, _MISSING) for key in keys}
+            self._undo_journal.append(('keys', previous))
+
+
+def as_graph(graph_data: Dict[str, Any]) -> SemanticGraph:
+    """
+    Returns graph_data as a SemanticGraph.
+
+    A SemanticGraph is returned unchanged. A plain dict is wrapped in a new
+    SemanticGraph that shares its 'nodes' and 'relations' lists, so callers
+    must use the returned object from then on.
+    """
+    if isinstance(graph_data, SemanticGraph):
+        return graph_data
+    return SemanticGraph(graph_data)
+
+
+# --- Internal undo helpers ---
+
+def _undo(graph: SemanticGraph, record: tuple) -> None:
+    """Reverts a single undo record. Indexes are invalidated by the caller."""
+    kind = record[0]
+    if kind == 'append':
+        record[2].pop()
+    elif kind == 'insert':
+        del record[2][record[3]]
+    elif kind == 'remove':
+        entities, removed = record[2], record[3]
+        if len(removed) <= _BATCH_REMOVE_THRESHOLD:
+            for position, entity in removed:
+                entities.insert(position, entity)
+        else:
+            # Merge the removed entities back in one pass instead of one insert each.
+            restored = []
+            remaining = iter(entities)
+            for position, entity in removed:
+                while len(restored) < position:
+                    restored.append(next(remaining))
+                restored.append(entity)
+            restored.extend(remaining)
+            entities[:] = restored
+    elif kind == 'fields':
+        _restore(record[2], record[3])
+    elif kind == 'keys':
+        for key, value in record[1].items():
+            if value is _MISSING:
+                dict.pop(graph, key, None)
+            else:
+                dict.__setitem__(graph, key, value)
+
+def _field_changes(original: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Compares recorded original values with the current ones, keeping only real changes."""
+    changes = {}
+    for field, old in original.items():
+        new = dict.get(current, field, _MISSING)
+        if old is new or (old is not _MISSING and new is not _MISSING and old == new):
+            continue
+        change = {}
+        if old is not _MISSING:
+            change['old'] = old
+        if new is not _MISSING:
+            change['new'] = new
+        changes[field] = change
+    return changes
+
+def _restore(entity: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    for field, value in previous.items():
+        if value is _MISSING:
+            entity.pop(field, None)
+        else:
+            entity[field] = value
+
+
+# --- Internal index helpers ---
+
+def _lookup(index: Dict[Any, List[Dict[str, Any]]], value: Any) -> Optional[List[Dict[str, Any]]]:
+    try:
+        return index.get(value)
+    except TypeError:
+        # Unhashable values are never indexed, so they cannot match.
+        return None
+
+def _snapshot(indexes: Dict[str, Dict[Any, List[Dict[str, Any]]]], field: str, value: Any) -> Optional[List[Dict[str, Any]]]:
+    index = indexes.get(field)
+    if index is None:
+        return None
+    try:
+        return list(index.get(value, ()))
+    except TypeError:
+        return None
+
+def _index_entity(indexes: Dict[str, Dict[Any, List[Dict[str, Any]]]], entity: Dict[str, Any]) -> None:
+    for field, index in indexes.items():
+        if field in entity:
+            try:
+                index.setdefault(entity[field], []).append(entity)
+            except TypeError:
+                pass
+
+def _unindex_entity(indexes: Dict[str, Dict[Any, List[Dict[str, Any]]]], entity: Dict[str, Any]) -> None:
+    for field, index in indexes.items():
+        if field in entity:
+            _unindex_value(index, entity[field], entity)
+
+def _unindex_value(index: Dict[Any, List[Dict[str, Any]]], value: Any, entity: Dict[str, Any]) -> None:
+    bucket = _lookup(index, value)
+    if not bucket:
+        return
+    for i, candidate in enumerate(bucket):
+        if candidate is entity:
+            del bucket[i]
+            break
+    if not bucket:
+        del index[value]
+
+def _update_entity(indexes: Optional[Dict[str, Dict[Any, List[Dict[str, Any]]]]], entity: Dict[str, Any],
+                   updates: Dict[str, Any], entities: List[Dict[str, Any]]) -> None:
+    if indexes is None:
+        entity.update(updates)
+        return
+    for field, value in updates.items():
+        index = indexes.get(field)
+        if index is not None and field in entity:
+            if entity[field] is value or entity[field] == value:
+                entity[field] = value
+                continue
+            _unindex_value(index, entity[field], entity)
+        entity[field] = value
+        if index is not None:
+            try:
+                bucket = index.setdefault(value, [])
+            except TypeError:
+                continue
+            if bucket and field in _IDENTITY_FIELDS:
+                _insert_in_list_order(bucket, entity, entities)
+            else:
+                bucket.append(entity)
+
+def _insert_in_list_order(bucket: List[Dict[str, Any]], entity: Dict[str, Any], entities: List[Dict[str, Any]]) -> None:
+    """Inserts an entity into a bucket of duplicates before the members that follow it in the list."""
+    position = _position_of(entities, entity)
+    for i, member in enumerate(bucket):
+        if _position_of(entities, member) > position:
+            bucket.insert(i, entity)
+            return
+    bucket.append(entity)
+
+def _delete_fields(indexes: Optional[Dict[str, Dict[Any, List[Dict[str, Any]]]]], entity: Dict[str, Any], fields: List[str]) -> None:
+    for field in fields:
+        index = indexes.get(field) if indexes is not None else None
+        if index is not None:
+            _unindex_value(index, entity[field], entity)
+        del entity[field]
+
+def _position_of(entities: List[Dict[str, Any]], entity: Dict[str, Any]) -> int:
+    """Finds the list position of an entity by identity."""
+    # list.index() checks identity before equality, so this is a C-level scan that
+    # stops at the entity itself unless an equal dict appears earlier.
+    position = entities.index(entity)
+    if entities[position] is not entity:
+        position = next(i for i, candidate in enumerate(entities) if candidate is entity)
+    return position
@@ -6,18 +6,57 @@ This module defines the LSGManager class, the core engine for handling
 transactional operations between a Semantic Graph (SG) and its corresponding
 Log Semantic Graph (LSG). It ensures that every change is recorded reliably.
 
+A separate LSG is stored as the canonical 'LSG_<name>.md' graph plus an
+append-only journal 'LSG_<name>.journal.jsonl'. Committing a transaction only
+appends one line (the log nodes and relations it added) to the journal; the
+journal is replayed on load and folded back into the .md file by the
+'compact-log' command.
+
+The log is loaded lazily: constructing a manager only parses the SG, and the
+LSG (or the bundled 'log_history') is loaded on first access, e.g. when a
+transaction is recorded. Read-only commands therefore never pay for the log.
+
+A transaction may carry a field-level 'delta' of the SG (see graph_delta.py),
+which records exactly the changed paths with their old and new values.
+Every CHECKPOINT_INTERVAL transactions a compressed snapshot of the SG is
+written next to it (see checkpoints.py), so that 'checkout' can rebuild past
+states without replaying the whole log.
+
+Recipes applied by 'batch-modify' are indexed in the log by AppliedRecipe
+nodes, one per recipe id and content hash, linked to the transactions that
+applied them. Their MUID is derived from the id and the hash, so checking
+whether a recipe was already applied is a single index lookup.
+
+Every transaction is linked to the HistoryAnchor of each entity its changeset
+touches. A change that renames entities ('renamed_entities': {old ID: new ID},
+e.g. from rename_muids) moves their anchors to the new IDs; the journal
+records such anchor updates alongside the added nodes and relations. An
+entity_ID -> anchor index is kept in memory, so recording a transaction and
+looking up the history of one entity do not scan the log.
+
+Saving the SG also stores the ID of its last transaction in the SG frontmatter
+('last_transaction'), so that a command can tell whether anything was recorded
+since a given transaction without loading the log.
+
 Membra Open Development License (MODL) v1.0
 Copyright (c) Rustam Kunafin 2025. All rights reserved.
 Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 
 # Import revised core modules
+from . import checkpoints
 from . import graph_io
 from . import operations
 from . import utils
+from .graph_model import SemanticGraph, as_graph
+
+APPLIED_RECIPE_TYPE = 'AppliedRecipe'
+# SG frontmatter key holding the ID of the last transaction saved with the SG.
+LAST_TRANSACTION_KEY = 'last_transaction'
 
 class LSGManager:
     """
@@ -34,39 +73,140 @@ class LSGManager:
         Args:
             sg_path (Path): The path to the main SG file.
 
+        The log is not loaded here; see the lsg_data property.
+
         Raises:
             graph_io.GraphFileNotFoundError: If the main SG file does not exist.
         """
         self.sg_path = sg_path
         self.lsg_path = self._get_lsg_path_for_sg(sg_path)
+        self.journal_path = self._get_journal_path_for_lsg(self.lsg_path)
+
+        # Log records added since the last save, persisted by appending them to the journal.
+        self._pending_records: List[Dict[str, Any]] = []
+        # entity_ID -> MUID of its HistoryAnchor, built from the loaded log.
+        self._anchor_index: Optional[Dict[str, str]] = None
 
         # Load main graph data
-        self.sg_metadata, self.sg_data = graph_io.load_graph_from_file(self.sg_path)
+        self.sg_metadata, sg_data = graph_io.load_graph_from_file(self.sg_path)
+        self.sg_data = as_graph(sg_data)
 
-        # Load or initialize log graph data
-        try:
-            self.lsg_metadata, self.lsg_data = graph_io.load_graph_from_file(self.lsg_path)
-            self.is_log_bundled = False # Log was found as a separate file
-        except graph_io.GraphFileNotFoundError:
-            print(f"Log file not found at {self.lsg_path}.")
-            # Check if log history is bundled in the main SG file
+        # The log graph is loaded on first access (see _load_log)
+        self.lsg_file_exists = self.lsg_path.is_file()
+        self._lsg_metadata: Optional[Dict[str, Any]] = None
+        self._lsg_data: Optional[SemanticGraph] = None
+        self._is_log_bundled: Optional[bool] = None
+
+    # --- Lazily loaded log ---
+
+    @property
+    def is_log_bundled(self) -> bool:
+        """Whether the log lives in the SG's 'log_history' (decided without loading the log)."""
+        if self._is_log_bundled is None:
             # Expecting a dictionary with 'nodes' and 'relations' keys under 'log_history'
             bundled_log_data = self.sg_data.get('log_history')
-            if isinstance(bundled_log_data, dict) and 'nodes' in bundled_log_data and 'relations' in bundled_log_data:
-                 print("Found bundled log history in the main SG file.")
-                 self.lsg_data = bundled_log_data # Load the entire dictionary
-                 # Basic metadata for bundled log (can be extended if needed)
-                 self.lsg_metadata = {'title': f"Bundled log for {self.sg_path.name}", 'graph_version': '1.0'}
-                 self.is_log_bundled = True
-            else:
-                print("No bundled log history found. A new log will be created.")
-                self.lsg_metadata, self.lsg_data = self._initialize_lsg()
-                self.is_log_bundled = False # New log was created
+            self._is_log_bundled = (
+                not self.lsg_file_exists
+                and not self.journal_path.is_file()
+                and isinstance(bundled_log_data, dict) and 'nodes' in bundled_log_data and 'relations' in bundled_log_data
+            )
+        return self._is_log_bundled
+
+    @is_log_bundled.setter
+    def is_log_bundled(self, value: bool) -> None:
+        self._is_log_bundled = value
+
+    @property
+    def lsg_data(self) -> SemanticGraph:
+        """The log graph data (a SemanticGraph), loaded on first access."""
+        if self._lsg_data is None:
+            self._load_log()
+        return self._lsg_data
+
+    @lsg_data.setter
+    def lsg_data(self, value: SemanticGraph) -> None:
+        self._lsg_data = value
+
+    @property
+    def lsg_metadata(self) -> Dict[str, Any]:
+        """The log graph metadata, loaded on first access."""
+        if self._lsg_metadata is None:
+            self._load_log()
+        return self._lsg_metadata
+
+    @lsg_metadata.setter
+    def lsg_metadata(self, value: Dict[str, Any]) -> None:
+        self._lsg_metadata = value
+
+    def _load_log(self) -> None:
+        """Loads the log from the LSG file and its journal, from the bundled log_history, or creates a new one."""
+        if not self.is_log_bundled and self.lsg_path.is_file():
+            self._lsg_metadata, lsg_data = graph_io.load_graph_from_file(self.lsg_path)
+            self._lsg_data = as_graph(lsg_data)
+            self._replay_journal()
+            return
+
+        print(f"Log file not found at {self.lsg_path}.")
+        if self.is_log_bundled:
+            print("Found bundled log history in the main SG file.")
+            self._lsg_data = as_graph(self.sg_data['log_history']) # Load the entire dictionary
+            # Basic metadata for bundled log (can be extended if needed)
+            self._lsg_metadata = {'title': f"Bundled log for {self.sg_path.name}", 'graph_version': '1.0'}
+        elif self.journal_path.is_file():
+            print(f"Found log journal at {self.journal_path}. Rebuilding the log from it.")
+            self._lsg_metadata, self._lsg_data = self._initialize_lsg()
+            self._replay_journal()
+        else:
+            print("No bundled log history found. A new log will be created.")
+            self._lsg_metadata, self._lsg_data = self._initialize_lsg()
 
     def _get_lsg_path_for_sg(self, sg_path: Path) -> Path:
         """Determines the conventional path for the LSG file."""
         return sg_path.with_name(f"LSG_{sg_path.name}")
 
+    @staticmethod
+    def _get_journal_path_for_lsg(lsg_path: Path) -> Path:
+        """Determines the conventional path for the LSG's append-only journal."""
+        return lsg_path.with_name(f"{lsg_path.stem}.journal.jsonl")
+
+    def _replay_journal(self) -> None:
+        """
+        Applies the records of the journal to the loaded LSG.
+
+        Records whose transaction is already present in the LSG are skipped. This
+        makes replay idempotent, e.g. after a compaction that was interrupted
+        between writing the .md file and removing the journal.
+        """
+        if not self.journal_path.is_file():
+            return
+        replayed = 0
+        for record in graph_io.read_journal_records(self.journal_path):
+            if self.lsg_data.has_node(record.get('transaction')):
+                continue
+            for node in record.get('nodes', []):
+                self.lsg_data.add_node(node)
+            for relation in record.get('relations', []):
+                self.lsg_data.add_relation(relation)
+            for node_update in record.get('node_updates', []):
+                node = self.lsg_data.find_node(node_update.get('MUID'))
+                if node is not None:
+                    self.lsg_data.update_node(node, node_update.get('updates', {}))
+            replayed += 1
+        if replayed:
+            print(f"Replayed {replayed} journaled transaction(s) from {self.journal_path}.")
+
+    def _add_log_node(self, node: Dict[str, Any]) -> None:
+        """Adds a node to the LSG and to the pending journal record."""
+        self.lsg_data = operations.add_node(self.lsg_data, node)
+        self._pending_records[-1]['nodes'].append(node)
+        if self._anchor_index is not None and node.get('type') == 'HistoryAnchor':
+            self._anchor_index.setdefault(node.get('entity_ID'), node['MUID'])
+
+    def _add_log_relation(self, relation: Dict[str, Any]) -> None:
+        """Adds a relation to the LSG and to the pending journal record."""
+        self.lsg_data = operations.add_relation(self.lsg_data, relation)
+        self._pending_records[-1]['relations'].append(relation)
+
     def _initialize_lsg(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """Creates the basic structure for a new, empty LSG."""
         metadata = {
@@ -74,12 +214,26 @@ class LSGManager:
             'graph_version': "1.0",
             'description': "Transactional log for a Semantic Graph."
         }
-        data = {
+        data = as_graph({
             'nodes': [],
             'relations': []
-        }
+        })
         return metadata, data
 
+    def _get_anchor_index(self) -> Dict[str, str]:
+        """Returns the entity_ID -> HistoryAnchor MUID index, building it on first use."""
+        if self._anchor_index is None:
+            index: Dict[str, str] = {}
+            for node in self.lsg_data.get('nodes', []):
+                if node.get('type') == 'HistoryAnchor':
+                    try:
+                        # The first anchor of an entity wins, as with a linear scan.
+                        index.setdefault(node.get('entity_ID'), node['MUID'])
+                    except (KeyError, TypeError):
+                        continue
+            self._anchor_index = index
+        return self._anchor_index
+
     def _find_or_create_history_anchor(self, entity_id: str, entity_type: str) -> str:
         """
         Finds an existing HistoryAnchor for an entity or creates a new one.
@@ -91,36 +245,47 @@ class LSGManager:
         Returns:
             The MUID of the found or created HistoryAnchor node.
         """
-        # Search for an existing anchor
-        for node in self.lsg_data.get('nodes', []):
-            if node.get('type') == 'HistoryAnchor' and node.get('entity_ID') == entity_id:
-                return node['MUID']
-        
-        # If not found, create a new one
-        anchor_muid = f"ha_{entity_id.replace('-', '_')}"
+        anchor_muid = self._get_anchor_index().get(entity_id)
+        if anchor_muid is not None:
+            return anchor_muid
+
+        # If not found, create a new one. The derived MUID may still be taken by the
+        # anchor of an entity that was renamed away from this ID; a suffix keeps it unique.
+        base_muid = f"ha_{entity_id.replace('-', '_')}"
+        anchor_muid, suffix = base_muid, 1
+        while self.lsg_data.has_node(anchor_muid):
+            suffix += 1
+            anchor_muid = f"{base_muid}_{suffix}"
         anchor_node = {
             "MUID": anchor_muid,
             "type": "HistoryAnchor",
             "entity_ID": entity_id,
             "entity_type": entity_type
         }
-        self.lsg_data = operations.add_node(self.lsg_data, anchor_node)
+        self._add_log_node(anchor_node)
         print(f"Created new History Anchor: {anchor_muid}")
         return anchor_muid
 
-    def record_transaction(self, changeset: List[Dict[str, Any]], recipe_id: str) -> None:
+    def record_transaction(self, changeset: List[Dict[str, Any]], recipe_id: str, delta: Optional[List[Dict[str, Any]]] = None,
+                           attributes: Optional[Dict[str, Any]] = None, transaction_id: Optional[str] = None) -> None:
         """
         Creates and records a new transaction in the LSG.
 
         Args:
             changeset (List[Dict[str, Any]]): A list of change objects describing the operation.
             recipe_id (str): An identifier for the operation/command being performed.
+            delta (Optional[List[Dict[str, Any]]]): The field-level delta of the SG made by
+                                                    the operation (see graph_delta.compute_delta()).
+            attributes (Optional[Dict[str, Any]]): Additional fields stored on the Transaction
+                                                   node (e.g. 'recipe_progress' of a streamed recipe).
+            transaction_id (Optional[str]): The MUID of the transaction, if the caller needs it
+                                            before recording (default: a new transaction ID).
         """
         if not changeset:
             print("No changes to record. Skipping transaction.")
             return
 
-        transaction_muid = utils.generate_transaction_id()
+        transaction_muid = transaction_id or utils.generate_transaction_id()
         timestamp = utils.datetime.now().isoformat()
 
         transaction_node = {
@@ -130,53 +295,264 @@ class LSGManager:
             "recipe_id": recipe_id,
             "changeset": changeset
         }
+        if delta is not None:
+            transaction_node["delta"] = delta
+        if attributes:
+            transaction_node.update(attributes)
         
         # Add the transaction node to the log
-        self.lsg_data = operations.add_node(self.lsg_data, transaction_node)
-
-        # For simplicity, we currently link all transactions to a single graph-level anchor.
-        # This can be expanded to link to entity-specific anchors if needed.
-        # The first change's entity is used to find the anchor.
-        first_change = changeset[0]
-        entity_id = first_change.get('entity_id', 'graph_meta')
-        entity_type = first_change.get('entity_type', 'graph')
-        
-        anchor_muid = self._find_or_create_history_anchor(entity_id, entity_type)
+        self._pending_records.append({"transaction": transaction_muid, "nodes": [], "relations": []})
+        self._add_log_node(transaction_node)
+
+        # Link the transaction to the anchor of every entity it touches, in changeset
+        # order. Changes that do not name an entity belong to the graph-level anchor.
+        # Anchors of renamed entities move to the new IDs and are linked as well.
+        anchor_muids = []
+        touched = [self._find_or_create_history_anchor(entity_id, entity_type) for entity_id, entity_type in self._touched_entities(changeset)]
+        for change in changeset:
+            touched.extend(self._rename_history_anchors(change.get('renamed_entities') or {}))
+        for anchor_muid in touched:
+            if anchor_muid in anchor_muids:
+                continue
+            anchor_muids.append(anchor_muid)
+
+            # Create a relation from the anchor to the new transaction
+            relation = {
+                "LID": utils.generate_lid(),
+                "from_MUID": anchor_muid,
+                "to_MUID": transaction_muid,
+                "type": "includes_change",
+                "class": "link"
+            }
+            self._add_log_relation(relation)
+        label = "anchor" if len(anchor_muids) == 1 else "anchors"
+        print(f"Recorded transaction {transaction_muid} linked to {label} {', '.join(anchor_muids)}.")
+
+    def _rename_history_anchors(self, renames: Dict[str, str]) -> List[str]:
+        """
+        Moves the HistoryAnchors of renamed entities to their new IDs.
+
+        An anchor is left unchanged (with a warning) if another anchor already uses
+        the new ID.
+
+        Args:
+            renames (Dict[str, str]): old entity_ID -> new entity_ID.
+
+        Returns:
+            The MUIDs of the renamed anchors.
+        """
+        if not renames:
+            return []
+        anchor_index = self._get_anchor_index()
+        # All moving anchors leave the index first, so swaps and chains do not collide.
+        moving = {old_id: anchor_index.pop(old_id) for old_id in renames if old_id in anchor_index}
+        renamed = []
+        for old_id, anchor_muid in moving.items():
+            new_id = renames[old_id]
+            if new_id in anchor_index:
+                print(f"Warning: History Anchor {anchor_index[new_id]} already exists for '{new_id}'; anchor {anchor_muid} keeps '{old_id}'.")
+                anchor_index[old_id] = anchor_muid
+                continue
+            self.lsg_data = operations.update_node(self.lsg_data, anchor_muid, {'entity_ID': new_id})
+            self._pending_records[-1].setdefault('node_updates', []).append({'MUID': anchor_muid, 'updates': {'entity_ID': new_id}})
+            anchor_index[new_id] = anchor_muid
+            renamed.append(anchor_muid)
+        if renamed:
+            print(f"Renamed {len(renamed)} History Anchor(s).")
+        return renamed
 
-        # Create a relation from the anchor to the new transaction
-        relation = {
+    @staticmethod
+    def _applied_recipe_muid(recipe_id: str, recipe_hash: str) -> str:
+        """Derives the MUID of the AppliedRecipe node of a recipe id and content hash."""
+        return f"ar_{recipe_id}_{recipe_hash.split(':')[-1][:16]}"
+
+    def find_applied_recipe(self, recipe_id: str, recipe_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up whether a recipe with this id and content hash was applied.
+
+        Returns:
+            The AppliedRecipe node, or None.
+        """
+        node = self.lsg_data.find_node(self._applied_recipe_muid(recipe_id, recipe_hash))
+        if node is None or node.get('type') != APPLIED_RECIPE_TYPE or node.get('recipe_hash') != recipe_hash:
+            return None
+        return node
+
+    def mark_recipe_applied(self, recipe_id: str, recipe_hash: str) -> None:
+        """
+        Records in the applied-recipe index that the transaction recorded last
+        completed a recipe. The AppliedRecipe node is created on first use; every
+        application adds an 'applied_in' link to its transaction.
+
+        Raises:
+            ValueError: If no transaction has been recorded since the last save.
+        """
+        if not self._pending_records:
+            raise ValueError("No transaction recorded to mark the recipe as applied.")
+        transaction_muid = self._pending_records[-1]['transaction']
+        node = self.find_applied_recipe(recipe_id, recipe_hash)
+        if node is None:
+            node = {
+                "MUID": self._applied_recipe_muid(recipe_id, recipe_hash),
+                "type": APPLIED_RECIPE_TYPE,
+                "recipe_id": recipe_id,
+                "recipe_hash": recipe_hash
+            }
+            self._add_log_node(node)
+        self._add_log_relation({
             "LID": utils.generate_lid(),
-            "from_MUID": anchor_muid,
+            "from_MUID": node['MUID'],
             "to_MUID": transaction_muid,
-            "type": "includes_change",
+            "type": "applied_in",
             "class": "link"
-        }
-        self.lsg_data = operations.add_relation(self.lsg_data, relation)
-        print(f"Recorded transaction {transaction_muid} linked to anchor {anchor_muid}.")
+        })
+
+    def last_transaction_id(self) -> Optional[str]:
+        """Returns the MUID of the transaction recorded last in the log, or None if there is none."""
+        transactions = self.lsg_data.lookup_nodes('type', 'Transaction')
+        return transactions[-1]['MUID'] if transactions else None
+
+    def saved_last_transaction_id(self) -> Optional[str]:
+        """
+        Returns the ID of the last transaction saved with the SG, read from the SG
+        frontmatter without loading the log.
+
+        Returns None if transactions are pending or the SG was last saved before
+        the ID was stored. Log-only transactions that do not save the SG (e.g. of
+        'archive-log') may follow it.
+        """
+        if self._pending_records:
+            return None
+        transaction = self.sg_metadata.get(LAST_TRANSACTION_KEY)
+        return transaction if isinstance(transaction, str) else None
+
+    @staticmethod
+    def _touched_entities(changeset: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Returns the unique (entity_id, entity_type) pairs of a changeset in order of appearance."""
+        entities = {}
+        for change in changeset:
+            entity_id = change.get('entity_id', 'graph_meta')
+            if isinstance(entity_id, str):
+                entities.setdefault(entity_id, change.get('entity_type', 'graph'))
+        return list(entities.items()) or [('graph_meta', 'graph')]
+
+    def get_entity_history(self, entity_id: str) -> List[Dict[str, Any]]:
+        """
+        Returns the Transaction nodes that touched an entity, oldest first.
+
+        Args:
+            entity_id (str): The ID of the entity (e.g., MUID, LID or 'graph_meta').
+
+        Returns:
+            A list of Transaction nodes (empty if the entity has no history).
+        """
+        anchor_muid = self._get_anchor_index().get(entity_id)
+        if anchor_muid is None:
+            return []
+        history = []
+        for relation in self.lsg_data.outgoing_relations(anchor_muid):
+            if relation.get('type') != 'includes_change':
+                continue
+            transaction = self.lsg_data.find_node(relation.get('to_MUID'))
+            if transaction is not None:
+                history.append(transaction)
+        return history
 
-    def save_changes(self) -> None:
+    def save_changes(self, backup: bool = True) -> None:
         """
-        Saves all changes to the SG and LSG files, after creating a backup.
+        Saves all changes to the SG and LSG files.
+
+        A backup of the SG is created before it is overwritten (unless backup is
+        False, e.g. for the intermediate commits of a streamed recipe). Files whose content
+        did not change are not rewritten (and not backed up). When the log is a
+        separate file, the new transactions are appended to its journal; the full
+        LSG is only written when the log file does not exist yet. The SG and LSG
+        writes run concurrently.
         If the log is bundled in the SG, saves only the SG file.
+        The ID of the last pending transaction is stored in the SG frontmatter
+        (see saved_last_transaction_id()).
         """
         print("Saving changes...")
-        # 1. Create a backup of the original SG file before overwriting
-        graph_io.create_backup(self.sg_path)
-
-        # 2. Save the (potentially modified) main SG file
+        if self._pending_records:
+            self.sg_metadata[LAST_TRANSACTION_KEY] = self._pending_records[-1]['transaction']
 
         if self.is_log_bundled:
-            # If log is bundled, update log_history in sg_data and save only SG
-            self.sg_data['log_history'] = self.lsg_data
-            graph_io.save_graph_to_file(self.sg_path, self.sg_metadata, self.sg_data)
-            print(f"Successfully saved main graph with bundled log to: {self.sg_path}")
+            # If log is bundled, update log_history in sg_data and save only SG.
+            # A log that was never loaded is still unchanged in sg_data.
+            if self._lsg_data is not None:
+                self.sg_data['log_history'] = self._lsg_data
+            sg_written = graph_io.save_graph_to_file(self.sg_path, self.sg_metadata, self.sg_data, backup=backup)
+            self._report_save(sg_written, "main graph with bundled log", self.sg_path)
+            self._write_checkpoint_if_due()
             # No separate LSG file to save in this case
+            self._pending_records = []
+            return
 
-        else:
-            # If log is separate, save both SG and LSG files
-            graph_io.save_graph_to_file(self.sg_path, self.sg_metadata, self.sg_data)
-            print(f"Successfully saved main graph to: {self.sg_path}")
+        # If log is separate, save both SG and LSG files. Serialization and disk I/O
+        # of one file overlap with those of the other.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sg_future = executor.submit(graph_io.save_graph_to_file, self.sg_path, self.sg_metadata, self.sg_data, backup)
+            if self.lsg_file_exists:
+                lsg_future = executor.submit(graph_io.append_journal_records, self.journal_path, self._pending_records)
+            else:
+                lsg_future = executor.submit(self._write_full_log)
+            sg_written = sg_future.result()
+            lsg_future.result()
 
-            graph_io.save_graph_to_file(self.lsg_path, self.lsg_metadata, self.lsg_data)
+        self._report_save(sg_written, "main graph", self.sg_path)
+        if self.lsg_file_exists:
+            print(f"Appended {len(self._pending_records)} transaction(s) to log journal: {self.journal_path}")
+        else:
             print(f"Successfully saved log graph to: {self.lsg_path}")
+            self.lsg_file_exists = True
+        self._write_checkpoint_if_due()
+        self._pending_records = []
 
+    def _write_checkpoint_if_due(self) -> None:
+        """
+        Writes a checkpoint of the saved SG when the pending transactions cross a
+        multiple of the checkpoint interval. The checkpoint is named after the last
+        pending transaction, whose resulting state is the SG just saved.
+        A failed checkpoint is reported but does not fail the save.
+        """
+        interval = checkpoints.get_interval()
+        pending = [record['transaction'] for record in self._pending_records if record.get('transaction')]
+        if not interval or not pending or self._lsg_data is None:
+            return
+        count = len(self._lsg_data.lookup_nodes('type', 'Transaction') or [])
+        if count // interval <= (count - len(pending)) // interval:
+            return
+        transaction = self._lsg_data.find_node(pending[-1])
+        if transaction is None:
+            return
+        try:
+            path = checkpoints.write_checkpoint(self.sg_path, transaction, self.sg_data)
+            print(f"Wrote checkpoint for transaction {pending[-1]}: {path}")
+        except OSError as e:
+            print(f"Warning: could not write checkpoint: {e}")
+
+    def _write_full_log(self) -> bool:
+        """Writes the complete LSG to its .md file and drops the journal folded into it."""
+        written = graph_io.save_graph_to_file(self.lsg_path, self.lsg_metadata, self.lsg_data)
+        self.journal_path.unlink(missing_ok=True)
+        return written
+
+    def compact_log(self) -> None:
+        """
+        Folds the journal back into the canonical LSG .md file.
+
+        Raises:
+            graph_io.GraphFileError: If the log is bundled or the write fails.
+        """
+        if self.is_log_bundled:
+            raise graph_io.GraphFileError("The log is bundled into the SG file; there is no journal to compact.")
+        self._write_full_log()
+        self.lsg_file_exists = True
+        self._pending_records = []
+
+    @staticmethod
+    def _report_save(written: bool, label: str, path: Path) -> None:
+        if written:
+            print(f"Successfully saved {label} to: {path}")
+        else:
+            print(f"No changes in {label}, file left untouched: {path}")
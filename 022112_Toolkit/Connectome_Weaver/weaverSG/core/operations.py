@@ -10,6 +10,13 @@ This approach ensures that data flow is explicit and predictable. All functions
 include robust error checking to prevent common issues like modifying non-existent
 entities.
 
+The graph data is handled as a SemanticGraph (see graph_model.py), which keeps
+MUID and LID indexes so that entity lookups are O(1). A plain dict passed in is
+wrapped on the fly; callers must always continue with the returned object.
+
+Operations that select entities by a 'query' or a 'where' clause compile it once
+per call with the query language of query.py.
+
 This is a final, integrated version containing both basic and advanced schema
 migration operations with conditional logic, based on the user's FS version.
 
@@ -18,9 +25,13 @@ Copyright (c) Rustam Kunafin 2025. All rights reserved.
 Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
 """
 
-from typing import Dict, Any, List, Optional, Callable
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Set
 import uuid
 
+from .graph_model import SemanticGraph, as_graph
+from .query import Query, QueryError, compile_query
+
 # --- Custom Exceptions for Operation Failures ---
 
 class OperationError(Exception):
@@ -39,21 +50,135 @@ class DuplicateNodeError(OperationError):
     """Raised when attempting to add a node with an MUID that already exists."""
     pass
 
+class DuplicateRelationError(OperationError):
+    """Raised when a bulk addition meets a relation that already exists."""
+    pass
+
+# Accepted values for the 'on_relations' parameter of delete_node.
+DELETE_NODE_RELATION_MODES = ('keep', 'cascade', 'repoint')
+
+# Accepted values for the 'on_duplicate' parameter of add_nodes / add_relations.
+BULK_DUPLICATE_MODES = ('error', 'skip', 'allow')
+
+# Keys whose string values are node MUIDs, wherever they occur in 'validation_issues'.
+MUID_REFERENCE_KEYS = ('MUID', 'muid', 'from_MUID', 'to_MUID')
+
+# Legacy 'where' conditions ({field, condition}), as operators on the tested field.
+WHERE_CONDITIONS = {
+    'is_not_uuid': {'$is_uuid': False},
+}
+
 # --- Internal Helper Functions ---
 
-def _find_node_index(graph_data: Dict[str, Any], muid: str) -> Optional[int]:
-    """Finds the index of a node by its MUID."""
-    for i, node in enumerate(graph_data.get('nodes', [])):
-        if node.get('MUID') == muid:
-            return i
-    return None
+def _find_node(graph: SemanticGraph, muid: str) -> Optional[Dict[str, Any]]:
+    """Finds a node by its MUID using the graph's MUID index."""
+    return graph.find_node(muid)
+
+def _find_relation(graph: SemanticGraph, lid: str) -> Optional[Dict[str, Any]]:
+    """Finds a relation by its LID using the graph's LID index."""
+    return graph.find_relation(lid)
+
+def _compile_query(query: Dict[str, Any], action: str) -> Query:
+    """Compiles a query parameter, reporting a malformed query as an OperationError."""
+    try:
+        return compile_query(query)
+    except QueryError as e:
+        raise OperationError(f"Invalid query in {action} operation: {e}") from e
+
+def compile_where(where: Dict[str, Any], action: str) -> Query:
+    """
+    Compiles a 'where' clause: either a query, or the legacy form
+    {field: <name>, condition: <name>} with a condition from WHERE_CONDITIONS.
+
+    Raises:
+        OperationError: If the clause is malformed or the condition is unsupported.
+    """
+    if 'field' in where or 'condition' in where:
+        field_to_check = where.get('field')
+        condition = where.get('condition')
+        if not field_to_check or not condition:
+            raise OperationError(f"Invalid 'where' clause in {action} operation.")
+        if condition not in WHERE_CONDITIONS:
+            raise OperationError(f"Unsupported 'where' condition: {condition}")
+        where = {field_to_check: WHERE_CONDITIONS[condition]}
+    return _compile_query(where, action)
+
+def _load_bulk_records(records: Any, action: str) -> List[Dict[str, Any]]:
+    """
+    Returns the entities of a bulk action: an inline list, or the records of a
+    JSONL/CSV file given by its path.
+    """
+    if isinstance(records, str):
+        try:
+            records = utils.load_records(Path(records))
+        except utils.RecipeFileError as e:
+            raise OperationError(f"Cannot load entities for {action}: {e}") from e
+    if not isinstance(records, list):
+        raise OperationError(f"{action} expects a list of entities or the path to a .jsonl/.csv file.")
+    for position, record in enumerate(records, start=1):
+        if not isinstance(record, dict):
+            raise OperationError(f"{action}: entity #{position} is not a dictionary.")
+    return records
+
+def _check_duplicate_mode(on_duplicate: str, allowed: tuple) -> None:
+    if on_duplicate not in allowed:
+        raise OperationError(f"Invalid on_duplicate mode '{on_duplicate}'. Expected one of: {', '.join(allowed)}.")
+
+def _report_bulk(action: str, kind: str, added: int, duplicates: List[str], on_duplicate: str) -> None:
+    if duplicates and on_duplicate == 'error':
+        shown = ', '.join(duplicates[:5]) + (f" and {len(duplicates) - 5} more" if len(duplicates) > 5 else '')
+        error_class = DuplicateNodeError if kind == 'node' else DuplicateRelationError
+        raise error_class(f"{action}: {len(duplicates)} duplicate {kind}(s): {shown}. Nothing was added.")
+    message = f"Added {added} {kind}(s)."
+    if duplicates:
+        message += f" Skipped {len(duplicates)} duplicate(s)."
+    print(message)
+
+def _check_relation_mode(graph: SemanticGraph, on_relations: str, repoint_to: Optional[str], deleted_muids: Set[str]) -> None:
+    """Validates the 'on_relations' / 'repoint_to' parameters of a node deletion."""
+    if on_relations not in DELETE_NODE_RELATION_MODES:
+        raise OperationError(f"Invalid on_relations mode '{on_relations}'. Expected one of: {', '.join(DELETE_NODE_RELATION_MODES)}.")
+    if on_relations == 'repoint':
+        if not repoint_to:
+            raise OperationError("delete_node with on_relations='repoint' requires 'repoint_to'.")
+        if repoint_to in deleted_muids or not graph.has_node(repoint_to):
+            raise NodeNotFoundError(f"Node with MUID '{repoint_to}' not found as a repoint target.")
+
+def _detach_relations(graph: SemanticGraph, muids: List[str], on_relations: str, repoint_to: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Deletes or re-points the relations incident to deleted node MUIDs.
+
+    MUIDs still held by another node (a duplicate) keep their relations.
 
-def _find_relation_index(graph_data: Dict[str, Any], lid: str) -> Optional[int]:
-    """Finds the index of a relation by its LID."""
-    for i, relation in enumerate(graph_data.get('relations', [])):
-        if relation.get('LID') == lid:
-            return i
-    return None
+    Returns:
+        The affected relations (empty in 'keep' mode).
+    """
+    if on_relations == 'keep':
+        return []
+    orphaned = {muid for muid in muids if not graph.has_node(muid)}
+    incident = {}
+    for muid in orphaned:
+        for relation in graph.incident_relations(muid):
+            incident[id(relation)] = relation
+    affected = list(incident.values())
+    if on_relations == 'cascade':
+        graph.remove_relations(affected)
+        return affected
+    for relation in affected:
+        endpoint_updates = {}
+        if relation.get('from_MUID') in orphaned:
+            endpoint_updates['from_MUID'] = repoint_to
+        if relation.get('to_MUID') in orphaned:
+            endpoint_updates['to_MUID'] = repoint_to
+        graph.update_relation(relation, endpoint_updates)
+    return affected
+
+def _update_entity(graph: SemanticGraph, entity_type: str, entity: Dict[str, Any], updates: Dict[str, Any]) -> None:
+    """Applies updates to a node or relation through the graph so its indexes stay in sync."""
+    if entity_type == 'relation':
+        graph.update_relation(entity, updates)
+    else:
+        graph.update_node(entity, updates)
 
 # --- Node Operations ---
 
@@ -75,15 +200,13 @@ def add_node(graph_data: Dict[str, Any], node_data: Dict[str, Any]) -> Dict[str,
     if 'MUID' not in node_data:
         raise OperationError("Cannot add node: 'MUID' is a required field.")
     
+    graph = as_graph(graph_data)
     muid = node_data['MUID']
-    if _find_node_index(graph_data, muid) is not None:
+    if graph.has_node(muid):
         raise DuplicateNodeError(f"Node with MUID '{muid}' already exists.")
 
-    if 'nodes' not in graph_data:
-        graph_data['nodes'] = []
-        
-    graph_data['nodes'].append(node_data)
-    return graph_data
+    graph.add_node(node_data)
+    return graph
 
 def update_node(graph_data: Dict[str, Any], muid: str, updates: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -100,33 +223,124 @@ def update_node(graph_data: Dict[str, Any], muid: str, updates: Dict[str, Any])
     Raises:
         NodeNotFoundError: If no node with the given MUID is found.
     """
-    node_index = _find_node_index(graph_data, muid)
-    if node_index is None:
+    graph = as_graph(graph_data)
+    node = _find_node(graph, muid)
+    if node is None:
         raise NodeNotFoundError(f"Node with MUID '{muid}' not found for update.")
     
-    graph_data['nodes'][node_index].update(updates)
-    return graph_data
+    graph.update_node(node, updates)
+    return graph
 
-def delete_node(graph_data: Dict[str, Any], muid: str) -> Dict[str, Any]:
+def delete_node(graph_data: Dict[str, Any], muid: str, on_relations: str = 'keep', repoint_to: Optional[str] = None) -> Dict[str, Any]:
     """
-    Deletes a node from the graph.
+    Deletes a node from the graph and optionally handles its incident relations.
+
+    Incident relations are found through the graph's adjacency index, so the
+    cost of 'cascade' and 'repoint' is proportional to the node's degree.
 
     Args:
         graph_data: The dictionary representing the graph.
         muid: The MUID of the node to delete.
+        on_relations: What to do with relations that start or end at the node:
+            'keep' leaves them untouched (the historical behaviour),
+            'cascade' deletes them,
+            'repoint' moves their endpoints to the node given by repoint_to.
+        repoint_to: The MUID of the node that takes over the relations in 'repoint' mode.
 
     Returns:
         The modified graph_data dictionary.
 
     Raises:
-        NodeNotFoundError: If no node with the given MUID is found.
+        NodeNotFoundError: If no node with the given MUID (or repoint_to) is found.
+        OperationError: If on_relations is invalid or repoint_to is missing.
     """
-    node_index = _find_node_index(graph_data, muid)
-    if node_index is None:
+    if on_relations not in DELETE_NODE_RELATION_MODES:
+        raise OperationError(f"Invalid on_relations mode '{on_relations}'. Expected one of: {', '.join(DELETE_NODE_RELATION_MODES)}.")
+
+    graph = as_graph(graph_data)
+    node = _find_node(graph, muid)
+    if node is None:
         raise NodeNotFoundError(f"Node with MUID '{muid}' not found for deletion.")
-        
-    del graph_data['nodes'][node_index]
-    return graph_data
+
+    _check_relation_mode(graph, on_relations, repoint_to, {muid})
+    graph.remove_node(node)
+
+    # Another node with the same MUID (a duplicate) still owns the relations.
+    if on_relations == 'keep' or graph.has_node(muid):
+        return graph
+
+    incident = _detach_relations(graph, [muid], on_relations, repoint_to)
+    if on_relations == 'cascade':
+        print(f"Deleted {len(incident)} relation(s) incident to node '{muid}'.")
+    else:
+        print(f"Re-pointed {len(incident)} relation(s) from node '{muid}' to '{repoint_to}'.")
+    return graph
+
+def update_nodes_by_query(graph_data: Dict[str, Any], query: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Finds all nodes matching a query and applies updates to them.
+
+    Args:
+        graph_data: The dictionary representing the graph.
+        query: A query (see query.py) selecting the nodes.
+        updates: A dictionary of key-value pairs to apply to matched nodes.
+
+    Returns:
+        The modified graph_data dictionary.
+
+    Raises:
+        OperationError: If the query is malformed.
+    """
+    graph = as_graph(graph_data)
+    # Matches are collected first, so updates cannot affect which nodes match.
+    matches = _compile_query(query, 'update_nodes_by_query').select(graph, 'node')
+    for node in matches:
+        graph.update_node(node, updates)
+
+    if not matches:
+        print(f"Warning: No nodes found matching query {query}. No changes made.")
+    else:
+        print(f"Updated {len(matches)} node(s) matching query.")
+    return graph
+
+def delete_nodes_by_query(graph_data: Dict[str, Any], query: Dict[str, Any], on_relations: str = 'keep', repoint_to: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Deletes all nodes matching a query and optionally handles their incident relations.
+
+    Args:
+        graph_data: The dictionary representing the graph.
+        query: A non-empty query (see query.py) selecting the nodes.
+        on_relations: 'keep', 'cascade' or 'repoint', as for delete_node.
+        repoint_to: The MUID of the node that takes over the relations in 'repoint' mode.
+                    It must not be deleted by the same query.
+
+    Returns:
+        The modified graph_data dictionary.
+
+    Raises:
+        OperationError: If the query is empty or malformed, or on_relations is invalid.
+        NodeNotFoundError: If the repoint target does not exist or matches the query.
+    """
+    if not query:
+        raise OperationError("delete_nodes_by_query requires a non-empty 'query'.")
+
+    graph = as_graph(graph_data)
+    matches = _compile_query(query, 'delete_nodes_by_query').select(graph, 'node')
+    muids = list(dict.fromkeys(node['MUID'] for node in matches if 'MUID' in node))
+    _check_relation_mode(graph, on_relations, repoint_to, set(muids))
+
+    if not matches:
+        print(f"Warning: No nodes found matching query {query}. No changes made.")
+        return graph
+
+    graph.remove_nodes(matches)
+    print(f"Deleted {len(matches)} node(s) matching query.")
+    incident = _detach_relations(graph, muids, on_relations, repoint_to)
+    if on_relations == 'cascade':
+        print(f"Deleted {len(incident)} relation(s) incident to the deleted node(s).")
+    elif on_relations == 'repoint':
+        print(f"Re-pointed {len(incident)} relation(s) from the deleted node(s) to '{repoint_to}'.")
+    return graph
 
 def add_or_update_node(graph_data: Dict[str, Any], node_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -145,19 +359,94 @@ def add_or_update_node(graph_data: Dict[str, Any], node_data: Dict[str, Any]) ->
     if 'MUID' not in node_data:
         raise OperationError("Cannot add or update node: 'MUID' is a required field.")
 
+    graph = as_graph(graph_data)
     muid = node_data['MUID']
-    node_index = _find_node_index(graph_data, muid)
+    node = _find_node(graph, muid)
 
-    if node_index is not None:
+    if node is not None:
         print(f"Node with MUID '{muid}' found. Updating existing node.")
-        graph_data['nodes'][node_index].update(node_data)
+        graph.update_node(node, node_data)
     else:
         print(f"Node with MUID '{muid}' not found. Adding new node.")
-        if 'nodes' not in graph_data:
-            graph_data['nodes'] = []
-        graph_data['nodes'].append(node_data)
+        graph.add_node(node_data)
 
-    return graph_data
+    return graph
+
+def add_nodes(graph_data: Dict[str, Any], nodes: Any, on_duplicate: str = 'error') -> Dict[str, Any]:
+    """
+    Adds many nodes in one step.
+
+    Duplicates (an MUID already in the graph or repeated within the batch) are
+    detected in one pass through the graph's MUID index and a set of the batch's
+    MUIDs, before anything is added.
+
+    Args:
+        graph_data: The dictionary representing the graph.
+        nodes: A list of node dictionaries, or the path to a .jsonl/.csv file of nodes.
+        on_duplicate: 'error' (the default) fails without adding anything,
+                      'skip' adds only the first node of every MUID not yet in the graph.
+
+    Returns:
+        The modified graph_data dictionary.
+
+    Raises:
+        OperationError: If the entities cannot be loaded, a node lacks 'MUID' or
+                        on_duplicate is invalid.
+        DuplicateNodeError: If on_duplicate is 'error' and a duplicate is found.
+    """
+    _check_duplicate_mode(on_duplicate, ('error', 'skip'))
+    records = _load_bulk_records(nodes, 'add_nodes')
+
+    graph = as_graph(graph_data)
+    seen = set()
+    new_nodes = []
+    duplicates = []
+    for position, node in enumerate(records, start=1):
+        muid = node.get('MUID')
+        if muid is None:
+            raise OperationError(f"Cannot add node #{position}: 'MUID' is a required field.")
+        if muid in seen or graph.has_node(muid):
+            duplicates.append(str(muid))
+            continue
+        seen.add(muid)
+        new_nodes.append(node)
+
+    _report_bulk('add_nodes', 'node', len(new_nodes), duplicates, on_duplicate)
+    for node in new_nodes:
+        graph.add_node(node)
+    return graph
+
+def upsert_nodes(graph_data: Dict[str, Any], nodes: Any) -> Dict[str, Any]:
+    """
+    Adds or updates many nodes in one step, like add_or_update_node for each of them.
+
+    Args:
+        graph_data: The dictionary representing the graph.
+        nodes: A list of node dictionaries, or the path to a .jsonl/.csv file of nodes.
+
+    Returns:
+        The modified graph_data dictionary.
+
+    Raises:
+        OperationError: If the entities cannot be loaded or a node lacks 'MUID'.
+    """
+    records = _load_bulk_records(nodes, 'upsert_nodes')
+    for position, node in enumerate(records, start=1):
+        if 'MUID' not in node:
+            raise OperationError(f"Cannot add or update node #{position}: 'MUID' is a required field.")
+
+    graph = as_graph(graph_data)
+    added = updated = 0
+    for node_data in records:
+        node = _find_node(graph, node_data['MUID'])
+        if node is not None:
+            graph.update_node(node, node_data)
+            updated += 1
+        else:
+            graph.add_node(node_data)
+            added += 1
+    print(f"Upserted {len(records)} node(s): {added} added, {updated} updated.")
+    return graph
 
 # --- Relation Operations ---
 
@@ -172,11 +461,61 @@ def add_relation(graph_data: Dict[str, Any], relation_data: Dict[str, Any]) -> D
     Returns:
         The modified graph_data dictionary.
     """
-    if 'relations' not in graph_data:
-        graph_data['relations'] = []
-        
-    graph_data['relations'].append(relation_data)
-    return graph_data
+    graph = as_graph(graph_data)
+    graph.add_relation(relation_data)
+    return graph
+
+def _relation_signature(relation: Dict[str, Any]) -> tuple:
+    """The (from_MUID, to_MUID, type) signature under which the validator reports duplicate relations."""
+    return (relation.get('from_MUID'), relation.get('to_MUID'), relation.get('type'))
+
+def add_relations(graph_data: Dict[str, Any], relations: Any, on_duplicate: str = 'error') -> Dict[str, Any]:
+    """
+    Adds many relations in one step.
+
+    A relation is a duplicate if a relation with the same (from_MUID, to_MUID,
+    type) signature or the same LID exists in the graph or earlier in the batch.
+    The existing signatures are collected into a set in one pass.
+
+    Args:
+        graph_data: The dictionary representing the graph.
+        relations: A list of relation dictionaries, or the path to a .jsonl/.csv file.
+        on_duplicate: 'error' (the default) fails without adding anything,
+                      'skip' leaves duplicates out, 'allow' adds them anyway
+                      (like add_relation).
+
+    Returns:
+        The modified graph_data dictionary.
+
+    Raises:
+        OperationError: If the entities cannot be loaded or on_duplicate is invalid.
+        DuplicateRelationError: If on_duplicate is 'error' and a duplicate is found.
+    """
+    _check_duplicate_mode(on_duplicate, BULK_DUPLICATE_MODES)
+    records = _load_bulk_records(relations, 'add_relations')
+
+    graph = as_graph(graph_data)
+    new_relations = records
+    duplicates = []
+    if on_duplicate != 'allow':
+        signatures = {_relation_signature(relation) for relation in graph.get('relations', [])}
+        seen_lids = set()
+        new_relations = []
+        for relation in records:
+            signature = _relation_signature(relation)
+            lid = relation.get('LID')
+            if signature in signatures or (lid is not None and (lid in seen_lids or graph.find_relation(lid) is not None)):
+                duplicates.append(lid or f"{signature[0]} -[{signature[2]}]-> {signature[1]}")
+                continue
+            signatures.add(signature)
+            if lid is not None:
+                seen_lids.add(lid)
+            new_relations.append(relation)
+
+    _report_bulk('add_relations', 'relation', len(new_relations), duplicates, on_duplicate)
+    for relation in new_relations:
+        graph.add_relation(relation)
+    return graph
 
 def update_relation(graph_data: Dict[str, Any], lid: str, updates: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -193,12 +532,13 @@ def update_relation(graph_data: Dict[str, Any], lid: str, updates: Dict[str, Any
     Raises:
         RelationNotFoundError: If no relation with the given LID is found.
     """
-    relation_index = _find_relation_index(graph_data, lid)
-    if relation_index is None:
+    graph = as_graph(graph_data)
+    relation = _find_relation(graph, lid)
+    if relation is None:
         raise RelationNotFoundError(f"Relation with LID '{lid}' not found for update.")
         
-    graph_data['relations'][relation_index].update(updates)
-    return graph_data
+    graph.update_relation(relation, updates)
+    return graph
 
 def update_relations_by_query(graph_data: Dict[str, Any], query: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -209,82 +549,97 @@ def update_relations_by_query(graph_data: Dict[str, Any], query: Dict[str, Any],
 
     Args:
         graph_data: The dictionary representing the graph.
-        query: A dictionary of key-value pairs to find matching relations.
+        query: A query (see query.py) selecting the relations; a plain dictionary
+               of key-value pairs matches relations holding all of them.
         updates: A dictionary of key-value pairs to apply to matched relations.
 
     Returns:
         The modified graph_data dictionary.
-    """
-    if 'relations' not in graph_data:
-        return graph_data
 
-    updated_indices = []
-    for i, relation in enumerate(graph_data['relations']):
-        is_match = all(item in relation.items() for item in query.items())
-        if is_match:
-            relation.update(updates)
-            updated_indices.append(i)
+    Raises:
+        OperationError: If the query is malformed.
+    """
+    graph = as_graph(graph_data)
+    if 'relations' not in graph:
+        return graph
+
+    # Matches are collected first, so updates cannot affect which relations match.
+    matches = _compile_query(query, 'update_relations_by_query').select(graph, 'relation')
+    for relation in matches:
+        graph.update_relation(relation, updates)
     
-    if not updated_indices:
+    if not matches:
         print(f"Warning: No relations found matching query {query}. No changes made.")
     else:
-        print(f"Updated {len(updated_indices)} relation(s) matching query.")
+        print(f"Updated {len(matches)} relation(s) matching query.")
     
-    return graph_data
+    return graph
+
+def delete_relations_by_query(graph_data: Dict[str, Any], query: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Deletes all relations matching a query.
+
+    Args:
+        graph_data: The dictionary representing the graph.
+        query: A non-empty query (see query.py) selecting the relations.
+
+    Returns:
+        The modified graph_data dictionary.
+
+    Raises:
+        OperationError: If the query is empty or malformed.
+    """
+    if not query:
+        raise OperationError("delete_relations_by_query requires a non-empty 'query'.")
+
+    graph = as_graph(graph_data)
+    matches = _compile_query(query, 'delete_relations_by_query').select(graph, 'relation')
+    if not matches:
+        print(f"Warning: No relations found matching query {query}. No changes made.")
+        return graph
+
+    graph.remove_relations(matches)
+    print(f"Deleted {len(matches)} relation(s) matching query.")
+    return graph
 
 # --- Advanced Schema Migration & Other Operations (RESTORED & INTEGRATED) ---
 
 def add_node_field(graph_data: Dict[str, Any], field_name: str, default_value: Any = None) -> Dict[str, Any]:
     """Adds a new field to all nodes if it doesn't exist."""
-    for node in graph_data.get('nodes', []):
+    graph = as_graph(graph_data)
+    for node in graph.get('nodes', []):
         if field_name not in node:
-            node[field_name] = default_value
-    return graph_data
+            graph.update_node(node, {field_name: default_value})
+    return graph
 
 def copy_field(graph_data: Dict[str, Any], source_field: str, target_field: str, where: Optional[Dict[str, Any]] = None, entity_type: str = 'node') -> Dict[str, Any]:
     """Copies a value from a source field to a target field for entities matching a condition."""
-    entities = graph_data.get(f"{entity_type}s", [])
-    
+    graph = as_graph(graph_data)
+
     if where:
-        field_to_check = where.get('field')
-        condition = where.get('condition')
-        if not field_to_check or not condition:
-            raise OperationError("Invalid 'where' clause in copy_field operation.")
-        
-        if condition == 'is_not_uuid':
-            # Filter entities based on the condition
-            entities_to_process = [e for e in entities if not utils.is_uuid(e.get(field_to_check))]
-        else:
-            raise OperationError(f"Unsupported 'where' condition: {condition}")
+        # Filter entities based on the condition
+        entities_to_process = compile_where(where, 'copy_field').select(graph, entity_type)
     else:
         # If no 'where' clause, process all entities
-        entities_to_process = entities
+        entities_to_process = graph.get(f"{entity_type}s", [])
     
     for entity in entities_to_process:
         if source_field in entity:
-            entity[target_field] = entity[source_field]
-    return graph_data
+            _update_entity(graph, entity_type, entity, {target_field: entity[source_field]})
+    return graph
 
 def set_field_from_generated_uuid(graph_data: Dict[str, Any], target_field: str, where: Optional[Dict[str, Any]] = None, entity_type: str = 'node') -> Dict[str, Any]:
     """Sets a field to a newly generated UUID for entities matching a condition."""
-    entities = graph_data.get(f"{entity_type}s", [])
+    graph = as_graph(graph_data)
 
     if where:
-        field_to_check = where.get('field')
-        condition = where.get('condition')
-        if not field_to_check or not condition:
-            raise OperationError("Invalid 'where' clause in set_field_from_generated_uuid operation.")
-            
-        if condition == 'is_not_uuid':
-            entities_to_process = [e for e in entities if not utils.is_uuid(e.get(field_to_check))]
-        else:
-            raise OperationError(f"Unsupported 'where' condition: {condition}")
+        entities_to_process = compile_where(where, 'set_field_from_generated_uuid').select(graph, entity_type)
     else:
-        entities_to_process = entities
+        entities_to_process = graph.get(f"{entity_type}s", [])
 
     for entity in entities_to_process:
-        entity[target_field] = str(uuid.uuid4())
-    return graph_data
+        _update_entity(graph, entity_type, entity, {target_field: str(uuid.uuid4())})
+    return graph
 
 def add_lid_to_all_links(graph_data: Dict[str, Any], id_generator_func: Callable) -> Dict[str, Any]:
     """
@@ -299,56 +654,183 @@ def add_lid_to_all_links(graph_data: Dict[str, Any], id_generator_func: Callable
     Returns:
         The modified graph_data dictionary.
     """
-    if 'relations' not in graph_data:
-        return graph_data
+    graph = as_graph(graph_data)
+    if 'relations' not in graph:
+        return graph
 
-    for relation in graph_data['relations']:
+    for relation in graph['relations']:
         # The logic from your FS version is preserved
         if relation.get('class') == 'link' and 'LID' not in relation:
-            relation['LID'] = id_generator_func()
+            graph.update_relation(relation, {'LID': id_generator_func()})
             
-    return graph_data
+    return graph
 
 def update_relation_endpoints_after_muid_change(graph_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Updates relation 'from_MUID' and 'to_MUID' based on node MUIDs that were migrated
     (where the old MUID is stored in the 'alias' field and the new MUID is in 'MUID').
+
+    Kept for existing recipes; rename_muids renames MUIDs and their references in one step.
     """
-    if 'nodes' not in graph_data or 'relations' not in graph_data:
+    graph = as_graph(graph_data)
+    if 'nodes' not in graph or 'relations' not in graph:
         print("Warning: Missing 'nodes' or 'relations' in graph data. Skipping relation endpoint update.")
-        return graph_data
+        return graph
 
     # Build a mapping from old MUID (now in alias) to new MUID (UUID) for migrated nodes
     # This requires that the 'copy_field' operation (Step 2 in recipe) was already executed.
     muid_migration_map = {}
-    for node in graph_data['nodes']:
+    for node in graph['nodes']:
         if 'MUID' in node and 'alias' in node and node['alias'] and node['MUID'] != node['alias']:
              # Assuming alias contains the OLD MUID and MUID contains the NEW UUID
             muid_migration_map[node['alias']] = node['MUID']
 
     if not muid_migration_map:
         print("No migrated nodes found (no old MUIDs in 'alias' field). No relation endpoints to update.")
-        return graph_data
+        return graph
+
+    # Only the relations incident to a migrated MUID can change, and the adjacency
+    # index yields exactly those. They are collected first so that every relation
+    # is rewritten once, based on its original endpoints.
+    affected_relations = {}
+    for old_muid in muid_migration_map:
+        for relation in graph.incident_relations(old_muid):
+            affected_relations[id(relation)] = relation
 
     updated_relations_count = 0
-    for relation in graph_data['relations']:
-        original_from_muid = relation.get('from_MUID')
-        original_to_muid = relation.get('to_MUID')
-        changes_made = False
+    for relation in affected_relations.values():
+        endpoint_updates = {}
 
+        original_from_muid = relation.get('from_MUID')
         if original_from_muid in muid_migration_map:
-            relation['from_MUID'] = muid_migration_map[original_from_muid]
-            changes_made = True
+            endpoint_updates['from_MUID'] = muid_migration_map[original_from_muid]
 
+        original_to_muid = relation.get('to_MUID')
         if original_to_muid in muid_migration_map:
-            relation['to_MUID'] = muid_migration_map[original_to_muid]
-            changes_made = True
+            endpoint_updates['to_MUID'] = muid_migration_map[original_to_muid]
 
-        if changes_made:
+        if endpoint_updates:
+            graph.update_relation(relation, endpoint_updates)
             updated_relations_count += 1
 
     print(f"Updated endpoints for {updated_relations_count} relation(s).")
-    return graph_data
+    return graph
+
+def resolve_muid_mapping(graph_data: Dict[str, Any], mapping: Optional[Dict[str, str]] = None,
+                         query: Optional[Dict[str, Any]] = None, from_field: Optional[str] = None) -> Dict[str, str]:
+    """
+    Builds and checks the old MUID -> new MUID mapping of a rename_muids step.
+
+    The mapping is either given explicitly, or derived from the nodes matching a
+    query: the new MUID is taken from the node's from_field, or newly generated
+    if from_field is not given. Nodes whose from_field is missing or empty are
+    left out. Entries that map a MUID to itself are dropped.
+
+    Args:
+        graph_data: The dictionary representing the graph.
+        mapping: An explicit {old MUID: new MUID} mapping.
+        query: A query (see query.py) selecting the nodes to rename.
+        from_field: The node field holding the new MUID (with query only).
+
+    Returns:
+        The mapping, in a stable order.
+
+    Raises:
+        OperationError: If neither or both of mapping and query are given, or the
+                        mapping is malformed or maps two MUIDs to the same new one.
+        NodeNotFoundError: If an old MUID does not exist.
+        DuplicateNodeError: If a new MUID belongs to a node that is not renamed.
+    """
+    graph = as_graph(graph_data)
+    if (mapping is None) == (query is None):
+        raise OperationError("rename_muids requires either 'mapping' or 'query'.")
+    if query is not None:
+        mapping = {}
+        for node in _compile_query(query, 'rename_muids').select(graph, 'node'):
+            if 'MUID' not in node or node['MUID'] in mapping:
+                continue
+            new_muid = node.get(from_field) if from_field else utils.generate_muid()
+            if new_muid:
+                mapping[node['MUID']] = new_muid
+    elif not isinstance(mapping, dict):
+        raise OperationError("rename_muids expects 'mapping' to be a dictionary of old MUID -> new MUID.")
+
+    mapping = {old: new for old, new in mapping.items() if old != new}
+    for old, new in mapping.items():
+        if not isinstance(old, str) or not isinstance(new, str) or not new:
+            raise OperationError(f"rename_muids: invalid mapping entry {old!r} -> {new!r}.")
+        if not graph.has_node(old):
+            raise NodeNotFoundError(f"Node with MUID '{old}' not found for renaming.")
+        if graph.has_node(new) and new not in mapping:
+            raise DuplicateNodeError(f"Cannot rename '{old}': a node with MUID '{new}' already exists.")
+    if len(set(mapping.values())) < len(mapping):
+        raise OperationError("rename_muids: several MUIDs are mapped to the same new MUID.")
+    return mapping
+
+def _rename_references(value: Any, mapping: Dict[str, str]) -> Any:
+    """Returns a copy of a JSON-like value with the MUIDs under MUID_REFERENCE_KEYS renamed."""
+    if isinstance(value, dict):
+        return {
+            key: mapping.get(item, item) if key in MUID_REFERENCE_KEYS and isinstance(item, str) else _rename_references(item, mapping)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_rename_references(item, mapping) for item in value]
+    return value
+
+def rename_muids(graph_data: Dict[str, Any], mapping: Optional[Dict[str, str]] = None,
+                 query: Optional[Dict[str, Any]] = None, from_field: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Renames node MUIDs and every reference to them in the graph.
+
+    Updates the nodes, the endpoints of their relations and the MUID references
+    in 'validation_issues'. Nodes and relations are found through the graph's
+    MUID and adjacency indexes, so the cost is proportional to the renamed nodes
+    and their degree. Swaps and chains (A -> B, B -> A) are allowed: every
+    relation is rewritten once, based on its original endpoints.
+
+    HistoryAnchors in the LSG are renamed by the LSGManager when the transaction
+    is recorded (see the 'renamed_entities' of the step's changeset).
+
+    Args:
+        graph_data: The dictionary representing the graph.
+        mapping, query, from_field: The renaming, as for resolve_muid_mapping.
+
+    Returns:
+        The modified graph_data dictionary.
+
+    Raises:
+        OperationError, NodeNotFoundError, DuplicateNodeError: As for resolve_muid_mapping.
+    """
+    graph = as_graph(graph_data)
+    mapping = resolve_muid_mapping(graph, mapping, query, from_field)
+    if not mapping:
+        print("Warning: No MUIDs to rename. No changes made.")
+        return graph
+
+    # Everything is collected before the first update, so renames cannot affect each other.
+    renamed_nodes = [(node, mapping[old]) for old in mapping for node in graph.lookup_nodes('MUID', old)]
+    affected_relations = {}
+    for old in mapping:
+        for relation in graph.incident_relations(old):
+            affected_relations[id(relation)] = relation
+
+    for node, new_muid in renamed_nodes:
+        graph.update_node(node, {'MUID': new_muid})
+    for relation in affected_relations.values():
+        endpoint_updates = {
+            endpoint: mapping[relation[endpoint]]
+            for endpoint in ('from_MUID', 'to_MUID') if relation.get(endpoint) in mapping
+        }
+        graph.update_relation(relation, endpoint_updates)
+
+    issues = graph.get('validation_issues')
+    renamed_issues = _rename_references(issues, mapping) if isinstance(issues, list) else issues
+    if renamed_issues != issues:
+        graph.update({'validation_issues': renamed_issues})
+
+    print(f"Renamed {len(renamed_nodes)} node(s) and updated {len(affected_relations)} relation(s).")
+    return graph
 
 # --- Graph-level Operations ---
 
@@ -365,8 +847,9 @@ def update_graph_properties(graph_data: Dict[str, Any], updates: Dict[str, Any])
     Returns:
         The modified graph_data dictionary.
     """
-    graph_data.update(updates)
-    return graph_data
+    graph = as_graph(graph_data)
+    graph.update(updates)
+    return graph
 
 # This import is placed here to avoid circular dependency issues,
 # as utils might need to be expanded in the future.
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+parallel_runner.py
+
+This module runs a per-file command over many Semantic Graph files at once,
+for the '--glob' mode of batch-modify and validate.
+
+The files matching a glob pattern are distributed over a pool of worker
+processes. Every file is handled independently (with its own LSGManager and
+transaction), so a failure affects only that file. The console output of each
+file is captured in the worker and printed as one block when the file is done,
+and an aggregated per-file success/failure/timing summary is printed at the end.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import glob
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable
+
+from . import graph_cache
+from . import serialization
+
+# --- Custom Exceptions ---
+
+class NoMatchingFilesError(Exception):
+    """Raised when a glob pattern matches no graph files."""
+    pass
+
+# --- File Discovery ---
+
+def is_graph_file(path: Path) -> bool:
+    """
+    Checks whether a path looks like a main SG file.
+
+    Logs (LSG_*), their journals and archives (*.archive_*) and backups (*_backup_*)
+    live next to the SGs they belong to and are never targets of a command.
+    """
+    name = path.name
+    return (
+        path.is_file()
+        and name.endswith('.md')
+        and not name.startswith('LSG_')
+        and '_backup_' not in name
+        and '.archive_' not in name
+    )
+
+def find_graph_files(pattern: str) -> List[Path]:
+    """
+    Expands a glob pattern ('**' matches nested directories) into SG files.
+
+    Args:
+        pattern (str): The glob pattern, e.g. 'graphs/**/*.md'.
+
+    Returns:
+        The matching graph files, sorted by path.
+
+    Raises:
+        NoMatchingFilesError: If no graph file matches the pattern.
+    """
+    files = sorted({Path(match) for match in glob.glob(pattern, recursive=True)})
+    files = [path for path in files if is_graph_file(path)]
+    if not files:
+        raise NoMatchingFilesError(f"No graph files match the pattern '{pattern}'.")
+    return files
+
+def find_files_under(root: Path) -> List[Path]:
+    """
+    Lists the Markdown files under a directory tree, with the same exclusions as
+    is_graph_file(). Hidden directories (e.g. '.git', '.weaver_checkpoints') are skipped.
+
+    Args:
+        root (Path): The directory to scan.
+
+    Returns:
+        The files, sorted by path.
+
+    Raises:
+        NoMatchingFilesError: If root is not a directory or holds no such file.
+    """
+    if not root.is_dir():
+        raise NoMatchingFilesError(f"'{root}' is not a directory.")
+    files = []
+    for directory, subdirectories, names in os.walk(root):
+        subdirectories[:] = [name for name in subdirectories if not name.startswith('.')]
+        files.extend(path for path in (Path(directory) / name for name in names) if is_graph_file(path))
+    if not files:
+        raise NoMatchingFilesError(f"No Markdown files found under '{root}'.")
+    return sorted(files)
+
+# --- Execution ---
+
+def _init_worker(codec_name: str, cache_dir: Optional[str], cache_max_mb: int) -> None:
+    """Applies the parent's global settings in a worker process (needed for 'spawn' start methods)."""
+    serialization.configure(codec_name)
+    graph_cache.configure(Path(cache_dir) if cache_dir else None, cache_max_mb)
+
+def _run_one(worker: Callable, file_path: Path, args: tuple) -> Dict[str, Any]:
+    """Runs worker(file_path, *args) with captured output and returns the file's result record."""
+    output = io.StringIO()
+    started = time.perf_counter()
+    result = {'file': str(file_path), 'status': 'ok', 'value': None, 'error': None}
+    try:
+        with redirect_stdout(output):
+            result['value'] = worker(file_path, *args)
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = str(e) or type(e).__name__
+    result['seconds'] = time.perf_counter() - started
+    result['output'] = output.getvalue()
+    return result
+
+def run_for_files(worker: Callable, files: List[Path], jobs: Optional[int], *args, echo_output: bool = True) -> List[Dict[str, Any]]:
+    """
+    Runs a per-file worker over files, in parallel worker processes.
+
+    Args:
+        worker (Callable): A module-level function worker(file_path, *args). Its return
+                           value is stored in the result; raising marks the file as failed.
+        files (List[Path]): The files to process.
+        jobs (Optional[int]): The number of worker processes (default: CPU count).
+                              With 1, the files are processed in this process.
+        *args: Extra arguments for the worker; they must be picklable.
+        echo_output (bool): If True, the captured output of each file is printed when it is done.
+
+    Returns:
+        One result record per file, in the order of files. A record holds 'file',
+        'status' ('ok' or 'failed'), 'value', 'error', 'seconds' and 'output'.
+    """
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(files)))
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def collect(result: Dict[str, Any]) -> None:
+        results[result['file']] = result
+        if echo_output:
+            print(f"===== {result['file']} =====")
+            print(result['output'], end='' if result['output'].endswith('\n') or not result['output'] else '\n')
+
+    if jobs == 1:
+        for file_path in files:
+            collect(_run_one(worker, file_path, args))
+    else:
+        cache = graph_cache.get_cache()
+        initargs = (
+            serialization.get_codec().name,
+            str(cache.cache_dir) if cache else None,
+            cache.max_bytes // (1024 * 1024) if cache else graph_cache.DEFAULT_MAX_MB,
+        )
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as executor:
+            futures = [executor.submit(_run_one, worker, file_path, args) for file_path in files]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    return [results[str(file_path)] for file_path in files]
+
+def print_summary(results: List[Dict[str, Any]], elapsed: float, describe: Callable[[Any], str] = str) -> None:
+    """
+    Prints the aggregated per-file summary of a run_for_files() call.
+
+    Args:
+        results (List[Dict[str, Any]]): The records returned by run_for_files().
+        elapsed (float): The wall-clock time of the whole run in seconds.
+        describe (Callable): Turns the worker's return value into a short text.
+    """
+    failed = [result for result in results if result['status'] != 'ok']
+    cpu_seconds = sum(result['seconds'] for result in results)
+    print(f"\nSummary: {len(results)} file(s), {len(results) - len(failed)} succeeded, {len(failed)} failed "
+          f"in {elapsed:.2f} s (sum of per-file times: {cpu_seconds:.2f} s).")
+    for result in results:
+        if result['status'] == 'ok':
+            status, detail = 'OK', describe(result['value'])
+        else:
+            status, detail = 'FAILED', result['error']
+        print(f"  {status:<7}{result['seconds']:>8.2f} s  {result['file']}  ({detail})")
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+query.py
+
+This module implements the small query language used by recipe steps to select
+nodes or relations ('query' parameters and 'where' clauses).
+
+A query is a dictionary. Each plain key is a field name and all of them must
+match (an implicit AND):
+
+    {"type": "artifact", "weight": {"$in": ["high", "medium"]}}
+
+A field is matched against a literal value (equality; the field must exist) or
+against a dictionary of operators:
+
+    $eq, $ne            equality / inequality
+    $in, $nin           membership in a list of values
+    $gt, $gte, $lt, $lte  comparisons (values of incomparable types never match)
+    $regex              re.search() on string values
+    $exists             true/false: whether the field is present
+    $is_uuid            true/false: whether the value is a valid UUID string
+    $not                negates a dictionary of operators
+
+The operand of $eq, $ne and the comparisons may be a field reference,
+{"$field": "other_field"}, which compares two fields of the same entity.
+Queries are combined with the top-level keys $and and $or (lists of queries)
+and $not (a single query).
+
+A query is compiled once into a Query object: a chain of closures that does no
+parsing per entity. Query.select() narrows the candidates through the graph's
+indexes (MUID, LID, type and the relation endpoints) when the query pins an
+indexed field to one value or a list of values, and only scans the whole list
+otherwise.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import json
+import operator
+import re
+from typing import Dict, Any, List, Optional, Callable, Tuple, Set
+
+from . import utils
+from .graph_model import SemanticGraph
+
+# A compiled predicate over one entity.
+Predicate = Callable[[Dict[str, Any]], bool]
+
+_MISSING = object()
+
+_COMPARISONS = {
+    '$gt': operator.gt,
+    '$gte': operator.ge,
+    '$lt': operator.lt,
+    '$lte': operator.le,
+}
+
+_FIELD_OPERATORS = ('$eq', '$ne', '$in', '$nin', '$regex', '$exists', '$is_uuid', '$not', *_COMPARISONS)
+
+
+class QueryError(ValueError):
+    """Raised when a query is malformed."""
+    pass
+
+
+class Query:
+    """
+    A compiled query.
+
+    Attributes:
+        source (Dict[str, Any]): The query as written in the recipe.
+        fields (Set[str]): Every field the query reads, including field references.
+        signature (str): A canonical text form; equal queries have equal signatures.
+    """
+
+    def __init__(self, source: Dict[str, Any], predicate: Predicate, fields: Set[str], index_terms: List[Tuple[str, List[Any]]]):
+        self.source = source
+        self.fields = fields
+        self.signature = json.dumps(source, sort_keys=True, ensure_ascii=False, default=str)
+        self._predicate = predicate
+        # (field, values) pairs that every match must satisfy: field == one of values.
+        self._index_terms = index_terms
+
+    def __repr__(self) -> str:
+        return f"Query({self.signature})"
+
+    def matches(self, entity: Dict[str, Any]) -> bool:
+        """Checks whether a single entity matches the query."""
+        return self._predicate(entity)
+
+    def select(self, graph: SemanticGraph, entity_type: str) -> List[Dict[str, Any]]:
+        """
+        Returns the matching nodes or relations of a graph, as a new list.
+
+        Args:
+            graph (SemanticGraph): The graph to search.
+            entity_type (str): 'node' or 'relation'.
+
+        Returns:
+            The matching entities. A full scan returns them in list order; an
+            index lookup on a single value returns them in index order.
+        """
+        lookup = graph.lookup_relations if entity_type == 'relation' else graph.lookup_nodes
+        entities = graph.get(f"{entity_type}s", [])
+        candidates = None
+        for field, values in self._index_terms:
+            buckets = [lookup(field, value) for value in values]
+            if any(bucket is None for bucket in buckets):
+                continue
+            if len(buckets) == 1:
+                narrowed = buckets[0]
+            else:
+                # Several buckets are merged back into list order.
+                members = {id(entity) for bucket in buckets for entity in bucket}
+                narrowed = [entity for entity in entities if id(entity) in members] if members else []
+            if candidates is None or len(narrowed) < len(candidates):
+                candidates = narrowed
+        if candidates is None:
+            candidates = entities
+        predicate = self._predicate
+        return [entity for entity in candidates if predicate(entity)]
+
+
+def compile_query(query: Dict[str, Any]) -> Query:
+    """
+    Compiles a query dictionary into a Query.
+
+    Args:
+        query (Dict[str, Any]): The query; an empty query matches every entity.
+
+    Returns:
+        The compiled Query.
+
+    Raises:
+        QueryError: If the query or one of its operators is malformed.
+    """
+    if not isinstance(query, dict):
+        raise QueryError(f"A query must be a dictionary, got {type(query).__name__}.")
+    fields: Set[str] = set()
+    index_terms: List[Tuple[str, List[Any]]] = []
+    predicate = _compile_clauses(query, fields, index_terms)
+    return Query(query, predicate, fields, index_terms)
+
+
+# --- Compilation ---
+
+def _all_of(predicates: List[Predicate]) -> Predicate:
+    if not predicates:
+        return lambda entity: True
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda entity: all(predicate(entity) for predicate in predicates)
+
+def _compile_clauses(query: Dict[str, Any], fields: Set[str], index_terms: Optional[List[Tuple[str, List[Any]]]]) -> Predicate:
+    """
+    Compiles the clauses of one query dictionary into a conjunction.
+
+    index_terms collects the indexable terms of the conjunction; it is None
+    inside $or and $not, where a term no longer constrains every match.
+    """
+    predicates = []
+    for key, spec in query.items():
+        if key == '$and':
+            predicates.append(_all_of([_compile_clauses(sub, fields, index_terms) for sub in _subqueries(key, spec)]))
+        elif key == '$or':
+            alternatives = [_compile_clauses(sub, fields, None) for sub in _subqueries(key, spec)]
+            predicates.append(lambda entity, alternatives=alternatives: any(p(entity) for p in alternatives))
+        elif key == '$not':
+            negated = _compile_clauses(_subqueries(key, [spec])[0], fields, None)
+            predicates.append(lambda entity, negated=negated: not negated(entity))
+        elif key.startswith('$'):
+            raise QueryError(f"Unknown query operator: '{key}'")
+        else:
+            fields.add(key)
+            predicates.append(_compile_field(key, spec, fields, index_terms))
+    return _all_of(predicates)
+
+def _subqueries(key: str, spec: Any) -> List[Dict[str, Any]]:
+    if not isinstance(spec, list) or not spec or not all(isinstance(sub, dict) for sub in spec):
+        raise QueryError(f"'{key}' expects {'a query' if key == '$not' else 'a non-empty list of queries'}.")
+    return spec
+
+def _is_operator_spec(spec: Any) -> bool:
+    return isinstance(spec, dict) and bool(spec) and all(isinstance(key, str) and key.startswith('$') for key in spec)
+
+def _compile_field(field: str, spec: Any, fields: Set[str], index_terms: Optional[List[Tuple[str, List[Any]]]]) -> Predicate:
+    if not _is_operator_spec(spec):
+        if index_terms is not None:
+            index_terms.append((field, [spec]))
+        return _equals(field, _constant(spec))
+
+    predicates = []
+    for op, operand in spec.items():
+        if op not in _FIELD_OPERATORS:
+            raise QueryError(f"Unknown operator '{op}' for field '{field}'.")
+        if op == '$eq':
+            if index_terms is not None and not _is_field_ref(operand):
+                index_terms.append((field, [operand]))
+            predicates.append(_equals(field, _operand(operand, fields)))
+        elif op == '$ne':
+            equals = _equals(field, _operand(operand, fields))
+            predicates.append(lambda entity, equals=equals: not equals(entity))
+        elif op in ('$in', '$nin'):
+            if not isinstance(operand, list):
+                raise QueryError(f"'{op}' for field '{field}' expects a list.")
+            if op == '$in' and index_terms is not None:
+                index_terms.append((field, list(operand)))
+            contained = _contained_in(field, operand)
+            predicates.append(contained if op == '$in' else lambda entity, contained=contained: not contained(entity))
+        elif op in _COMPARISONS:
+            predicates.append(_compare(field, _COMPARISONS[op], _operand(operand, fields)))
+        elif op == '$regex':
+            try:
+                pattern = re.compile(operand)
+            except (re.error, TypeError) as e:
+                raise QueryError(f"Invalid '$regex' for field '{field}': {e}") from e
+            predicates.append(lambda entity, search=pattern.search: isinstance(entity.get(field), str) and search(entity[field]) is not None)
+        elif op == '$exists':
+            expected = bool(operand)
+            predicates.append(lambda entity, expected=expected: (field in entity) is expected)
+        elif op == '$is_uuid':
+            expected = bool(operand)
+            predicates.append(lambda entity, expected=expected: utils.is_uuid(entity.get(field)) is expected)
+        elif op == '$not':
+            if not _is_operator_spec(operand):
+                raise QueryError(f"'$not' for field '{field}' expects a dictionary of operators.")
+            negated = _compile_field(field, operand, fields, None)
+            predicates.append(lambda entity, negated=negated: not negated(entity))
+    return _all_of(predicates)
+
+
+# --- Operands ---
+
+def _is_field_ref(operand: Any) -> bool:
+    return isinstance(operand, dict) and list(operand) == ['$field']
+
+def _constant(value: Any) -> Callable[[Dict[str, Any]], Any]:
+    return lambda entity: value
+
+def _operand(operand: Any, fields: Set[str]) -> Callable[[Dict[str, Any]], Any]:
+    """Returns a getter for an operand: a constant, or the value of a referenced field."""
+    if not _is_field_ref(operand):
+        return _constant(operand)
+    referenced = operand['$field']
+    if not isinstance(referenced, str):
+        raise QueryError("'$field' expects a field name.")
+    fields.add(referenced)
+    return lambda entity: entity.get(referenced, _MISSING)
+
+def _equals(field: str, operand: Callable[[Dict[str, Any]], Any]) -> Predicate:
+    def predicate(entity: Dict[str, Any]) -> bool:
+        value = entity.get(field, _MISSING)
+        if value is _MISSING:
+            return False
+        other = operand(entity)
+        return other is not _MISSING and value == other
+    return predicate
+
+def _contained_in(field: str, values: List[Any]) -> Predicate:
+    try:
+        members = frozenset(values)
+    except TypeError:
+        # Unhashable values (lists, dicts) are compared one by one.
+        return lambda entity: field in entity and entity[field] in values
+
+    def predicate(entity: Dict[str, Any]) -> bool:
+        value = entity.get(field, _MISSING)
+        if value is _MISSING:
+            return False
+        try:
+            return value in members
+        except TypeError:
+            return value in values
+    return predicate
+
+def _compare(field: str, compare: Callable[[Any, Any], bool], operand: Callable[[Dict[str, Any]], Any]) -> Predicate:
+    def predicate(entity: Dict[str, Any]) -> bool:
+        value = entity.get(field, _MISSING)
+        other = operand(entity)
+        if value is _MISSING or other is _MISSING:
+            return False
+        try:
+            return bool(compare(value, other))
+        except TypeError:
+            return False
+    return predicate
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+recipe_planner.py
+
+This module compiles the operation list of a batch-modify recipe into an
+execution plan. Several recipe actions (e.g. add_node_field, copy_field,
+set_field_from_generated_uuid, add_lid_to_links) are "per-entity": the change
+they make to one node or relation depends only on that entity. Consecutive
+per-entity steps over the same entity list are fused into a single sweep that
+applies every step to an entity before moving on to the next one, so a recipe
+walks each list once instead of once per step.
+
+Fusion preserves the sequential semantics of the recipe:
+- Only consecutive steps over the same entity list are fused; any other step
+  ends the sweep, and the sweeps run in recipe order.
+- Within a sweep, the steps are applied to each entity in recipe order.
+- Steps that need a view of the whole graph (the MUID migration map of
+  update_relation_endpoints_after_muid_change) compute it when the sweep starts,
+  after all earlier sweeps have completed. Relation sweeps never modify nodes.
+- 'where' conditions are compiled once per step (see query.py), evaluated once
+  per entity and reused by later steps of the sweep until one of them changes
+  a field the condition reads.
+
+Steps that cannot be fused, and sweeps of a single step, run the regular
+operation from operations.py.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import uuid
+from typing import Dict, Any, List, Optional, Callable, Tuple, FrozenSet
+
+from . import operations
+from . import utils
+from .graph_model import SemanticGraph, as_graph
+
+# A per-entity cache of evaluated 'where' conditions: (query signature, fields read) -> result.
+ConditionMemo = Dict[Tuple[str, FrozenSet[str]], bool]
+
+
+class SweepKernel:
+    """
+    The per-entity form of a recipe step.
+
+    Attributes:
+        entity_type (str): 'node' or 'relation'; the sweep runs over f"{entity_type}s".
+        apply (Callable): apply(graph, entity, memo) changes a single entity.
+        prepare (Optional[Callable]): prepare(graph), called once when the sweep starts.
+        finish (Optional[Callable]): finish(), called once after the sweep (e.g. to report).
+    """
+
+    def __init__(self, entity_type: str, apply: Callable, prepare: Optional[Callable] = None, finish: Optional[Callable] = None):
+        self.entity_type = entity_type
+        self.apply = apply
+        self.prepare = prepare
+        self.finish = finish
+
+
+class PlanStage:
+    """
+    One stage of an execution plan: a single recipe step, or a fused sweep.
+
+    Attributes:
+        steps (List[Tuple[int, Dict[str, Any]]]): (recipe position, operation) pairs, 1-based.
+        entity_type (Optional[str]): The entity type swept over, or None for a single step.
+        kernels (List[SweepKernel]): The per-entity kernels of a sweep, in step order.
+    """
+
+    def __init__(self, steps: List[Tuple[int, Dict[str, Any]]], entity_type: Optional[str] = None, kernels: Optional[List[SweepKernel]] = None):
+        self.steps = steps
+        self.entity_type = entity_type
+        self.kernels = kernels or []
+
+    @property
+    def is_sweep(self) -> bool:
+        """True if this stage applies several steps in one pass over an entity list."""
+        return self.entity_type is not None
+
+    @property
+    def actions(self) -> List[str]:
+        return [op.get('action') for _, op in self.steps]
+
+
+# --- Conditions and writes ---
+
+def _compile_where(where: Optional[Dict[str, Any]], action: str) -> Callable[[Dict[str, Any], ConditionMemo], bool]:
+    """Turns a 'where' clause into a memoizing predicate, raising the same errors as the operations."""
+    if not where:
+        return lambda entity, memo: True
+    query = operations.compile_where(where, action)
+    key = (query.signature, frozenset(query.fields))
+    matches = query.matches
+
+    def predicate(entity: Dict[str, Any], memo: ConditionMemo) -> bool:
+        result = memo.get(key)
+        if result is None:
+            result = memo[key] = matches(entity)
+        return result
+    return predicate
+
+def _write(graph: SemanticGraph, entity_type: str, entity: Dict[str, Any], updates: Dict[str, Any], memo: ConditionMemo) -> None:
+    """Updates an entity through the graph and forgets the conditions that read a changed field."""
+    operations._update_entity(graph, entity_type, entity, updates)
+    for key in [key for key in memo if not key[1].isdisjoint(updates)]:
+        del memo[key]
+
+
+# --- Kernels ---
+# Each factory accepts the same parameters as the operation it mirrors, so a
+# recipe step with unexpected parameters fails the same way.
+
+def _add_node_field_kernel(field_name: str, default_value: Any = None) -> SweepKernel:
+    def apply(graph, node, memo):
+        if field_name not in node:
+            _write(graph, 'node', node, {field_name: default_value}, memo)
+    return SweepKernel('node', apply)
+
+def _copy_field_kernel(source_field: str, target_field: str, where: Optional[Dict[str, Any]] = None, entity_type: str = 'node') -> SweepKernel:
+    matches = _compile_where(where, 'copy_field')
+
+    def apply(graph, entity, memo):
+        if matches(entity, memo) and source_field in entity:
+            _write(graph, entity_type, entity, {target_field: entity[source_field]}, memo)
+    return SweepKernel(entity_type, apply)
+
+def _set_field_from_generated_uuid_kernel(target_field: str, where: Optional[Dict[str, Any]] = None, entity_type: str = 'node') -> SweepKernel:
+    matches = _compile_where(where, 'set_field_from_generated_uuid')
+
+    def apply(graph, entity, memo):
+        if matches(entity, memo):
+            _write(graph, entity_type, entity, {target_field: str(uuid.uuid4())}, memo)
+    return SweepKernel(entity_type, apply)
+
+def _add_lid_to_all_links_kernel(**_ignored) -> SweepKernel:
+    # Like batch-modify's dispatch of this action, the recipe parameters are ignored.
+    def apply(graph, relation, memo):
+        if relation.get('class') == 'link' and 'LID' not in relation:
+            _write(graph, 'relation', relation, {'LID': utils.generate_lid()}, memo)
+    return SweepKernel('relation', apply)
+
+def _update_relation_endpoints_kernel() -> SweepKernel:
+    state = {'migration_map': {}, 'updated': 0, 'skipped': False}
+
+    def prepare(graph):
+        if 'nodes' not in graph or 'relations' not in graph:
+            print("Warning: Missing 'nodes' or 'relations' in graph data. Skipping relation endpoint update.")
+            state['skipped'] = True
+            return
+        for node in graph['nodes']:
+            if 'MUID' in node and 'alias' in node and node['alias'] and node['MUID'] != node['alias']:
+                state['migration_map'][node['alias']] = node['MUID']
+        if not state['migration_map']:
+            print("No migrated nodes found (no old MUIDs in 'alias' field). No relation endpoints to update.")
+            state['skipped'] = True
+
+    def apply(graph, relation, memo):
+        if state['skipped']:
+            return
+        migration_map = state['migration_map']
+        endpoint_updates = {}
+        original_from_muid = relation.get('from_MUID')
+        if original_from_muid in migration_map:
+            endpoint_updates['from_MUID'] = migration_map[original_from_muid]
+        original_to_muid = relation.get('to_MUID')
+        if original_to_muid in migration_map:
+            endpoint_updates['to_MUID'] = migration_map[original_to_muid]
+        if endpoint_updates:
+            _write(graph, 'relation', relation, endpoint_updates, memo)
+            state['updated'] += 1
+
+    def finish():
+        if not state['skipped']:
+            print(f"Updated endpoints for {state['updated']} relation(s).")
+    return SweepKernel('relation', apply, prepare, finish)
+
+# Recipe actions that can be fused, including batch-modify's aliases.
+KERNEL_FACTORIES: Dict[str, Callable[..., SweepKernel]] = {
+    'add_node_field': _add_node_field_kernel,
+    'copy_field': _copy_field_kernel,
+    'set_field_from_generated_uuid': _set_field_from_generated_uuid_kernel,
+    'add_lid_to_all_links': _add_lid_to_all_links_kernel,
+    'add_lid_to_links': _add_lid_to_all_links_kernel,
+    'update_relation_endpoints_after_muid_change': _update_relation_endpoints_kernel,
+}
+
+def _sweep_entity_type(op_details: Dict[str, Any]) -> Optional[str]:
+    """Returns the entity type a fusible step sweeps over, or None if the step is not fusible."""
+    action = op_details.get('action')
+    if action not in KERNEL_FACTORIES:
+        return None
+    if action in ('copy_field', 'set_field_from_generated_uuid'):
+        params = op_details.get('params') or {}
+        return params.get('entity_type', 'node') if isinstance(params, dict) else None
+    return 'node' if action == 'add_node_field' else 'relation'
+
+
+# --- Planning and execution ---
+
+def plan_recipe(operations_list: List[Dict[str, Any]], start: int = 1) -> List[PlanStage]:
+    """
+    Compiles a recipe's operation list into stages, fusing consecutive per-entity steps.
+
+    Args:
+        operations_list: The 'operations' list of a recipe.
+        start: The recipe position of the first operation (for a chunk of a streamed recipe).
+
+    Returns:
+        The stages in execution order. Every step appears in exactly one stage.
+
+    Raises:
+        operations.OperationError: If a fused step has an invalid 'where' clause.
+        TypeError: If a fused step has parameters its operation does not accept.
+    """
+    groups: List[Tuple[Optional[str], List[Tuple[int, Dict[str, Any]]]]] = []
+    for position, op_details in enumerate(operations_list, start=start):
+        entity_type = _sweep_entity_type(op_details) if isinstance(op_details, dict) else None
+        if entity_type is not None and groups and groups[-1][0] == entity_type:
+            groups[-1][1].append((position, op_details))
+        else:
+            groups.append((entity_type, [(position, op_details)]))
+
+    plan = []
+    for entity_type, steps in groups:
+        if entity_type is None or len(steps) == 1:
+            plan.extend(PlanStage([step]) for step in steps)
+            continue
+        kernels = [KERNEL_FACTORIES[op['action']](**(op.get('params') or {})) for _, op in steps]
+        plan.append(PlanStage(steps, entity_type, kernels))
+    return plan
+
+def run_sweep(graph_data: Dict[str, Any], stage: PlanStage) -> Dict[str, Any]:
+    """
+    Executes a fused stage: one pass over the stage's entity list.
+
+    Args:
+        graph_data: The dictionary representing the graph.
+        stage: A stage for which is_sweep is True.
+
+    Returns:
+        The modified graph_data dictionary.
+    """
+    graph = as_graph(graph_data)
+    for kernel in stage.kernels:
+        if kernel.prepare:
+            kernel.prepare(graph)
+    appliers = [kernel.apply for kernel in stage.kernels]
+    for entity in graph.get(f"{stage.entity_type}s", []):
+        memo: ConditionMemo = {}
+        for apply in appliers:
+            apply(graph, entity, memo)
+    for kernel in stage.kernels:
+        if kernel.finish:
+            kernel.finish()
+    return graph
+
+def describe_plan(plan: List[PlanStage]) -> List[str]:
+    """Returns a human-readable description of a plan, one line per entry."""
+    step_count = sum(len(stage.steps) for stage in plan)
+    lines = [f"Execution plan: {step_count} step(s) in {len(plan)} pass(es)."]
+    for number, stage in enumerate(plan, start=1):
+        if stage.is_sweep:
+            first, last = stage.steps[0][0], stage.steps[-1][0]
+            lines.append(f"  Pass {number}: fused sweep over {stage.entity_type}s (steps {first}-{last})")
+            lines.extend(f"    - step {position}: {op.get('action')}" for position, op in stage.steps)
+        else:
+            position, op = stage.steps[0]
+            action = op.get('action') if isinstance(op, dict) else None
+            lines.append(f"  Pass {number}: step {position}: {action}")
+    return lines
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+serialization.py
+
+This module provides the pluggable JSON/YAML codec layer used by graph_io and
+by recipe loading. A codec bundles the four primitives the tool needs:
+parsing and writing JSON graph bodies, and parsing and writing YAML documents.
+
+Available codecs:
+- 'stdlib':  The standard library 'json' module and PyYAML's pure-Python
+             SafeLoader/Dumper. Always available; this is the reference format.
+- 'orjson':  'orjson' for JSON (must be installed) plus libyaml for YAML when
+             PyYAML was built with it.
+- 'auto':    The fastest available combination (the default).
+
+Every codec writes byte-identical output to the 'stdlib' codec and reads what
+it writes. Data that orjson cannot represent identically (non-finite floats
+such as NaN/Infinity, which it would write as null; integers beyond 64 bits;
+floats with exponents) falls back to the stdlib encoder, and documents with
+NaN/Infinity literals fall back to the stdlib parser.
+
+The active codec is chosen with configure() (the CLI's --codec option) or with
+the WEAVERSG_CODEC environment variable.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import json
+import math
+import os
+import re
+from typing import Any, Iterator, Optional
+
+import yaml
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional accelerator
+    orjson = None
+
+CODEC_ENV_VAR = 'WEAVERSG_CODEC'
+CODEC_NAMES = ('auto', 'stdlib', 'orjson')
+
+# The keyword arguments that define the canonical on-disk format.
+_YAML_DUMP_OPTIONS = dict(allow_unicode=True, sort_keys=False, default_flow_style=False, indent=2)
+
+# orjson writes exponents as '1e16' / '1e-7' where the stdlib writes '1e+16' / '1e-07'.
+# Any output that may contain such a float is re-encoded with the stdlib instead.
+_FLOAT_EXPONENT = re.compile(rb'\de[-+]?\d')
+
+# orjson writes NaN and Infinity as null; only output containing null can hide one.
+_NULL = b'null'
+
+# --- Custom Exceptions ---
+
+class CodecError(Exception):
+    """Raised when an unknown or unavailable codec is requested."""
+    pass
+
+# --- Codec ---
+
+class Codec:
+    """
+    A named set of JSON/YAML (de)serialization functions.
+
+    Attributes:
+        name (str): The codec name, e.g. 'stdlib'.
+        json_backend (str): 'json' or 'orjson'.
+        yaml_backend (str): 'pure' or 'libyaml'.
+    """
+
+    def __init__(self, name: str, json_backend: str, yaml_backend: str):
+        self.name = name
+        self.json_backend = json_backend
+        self.yaml_backend = yaml_backend
+        if yaml_backend == 'libyaml':
+            self._yaml_loader, self._yaml_dumper = yaml.CSafeLoader, yaml.CDumper
+        else:
+            self._yaml_loader, self._yaml_dumper = yaml.SafeLoader, yaml.Dumper
+
+    def __repr__(self) -> str:
+        return f"Codec({self.name!r}, json={self.json_backend}, yaml={self.yaml_backend})"
+
+    def loads_json(self, buffer: Any) -> Any:
+        """
+        Parses a JSON document.
+
+        Args:
+            buffer: A str, or a UTF-8 encoded bytes-like object (bytes, memoryview).
+                    Buffers are parsed without an intermediate copy where the
+                    backend allows it.
+        """
+        if self.json_backend == 'orjson':
+            try:
+                return orjson.loads(buffer)
+            except orjson.JSONDecodeError:
+                # NaN/Infinity literals, which the stdlib writes and reads but orjson rejects.
+                pass
+        if not isinstance(buffer, str):
+            buffer = str(buffer, 'utf-8')
+        return json.loads(buffer)
+
+    def dumps_json(self, data: Any) -> str:
+        """Serializes data to the canonical JSON format (indent=2, non-ASCII kept)."""
+        if self.json_backend == 'orjson':
+            try:
+                encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits or non-string keys, which the stdlib handles.
+                encoded = None
+            if encoded is not None and not _FLOAT_EXPONENT.search(encoded) and not _hides_non_finite(encoded, data):
+                return encoded.decode('utf-8')
+        return json.dumps(data, indent=2, ensure_ascii=False)
+
+    def dumps_json_line(self, data: Any) -> str:
+        """Serializes data to compact single-line JSON (used for JSON-lines files)."""
+        if self.json_backend == 'orjson':
+            try:
+                encoded = orjson.dumps(data)
+            except orjson.JSONEncodeError:
+                encoded = None
+            if encoded is not None and not _hides_non_finite(encoded, data):
+                return encoded.decode('utf-8')
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+    def load_yaml(self, stream: Any) -> Any:
+        """Parses a YAML document from a string or a text stream using a safe loader."""
+        return yaml.load(stream, Loader=self._yaml_loader)
+
+    def load_yaml_all(self, stream: Any) -> Iterator[Any]:
+        """Parses the documents of a multi-document YAML stream one at a time (a generator)."""
+        return yaml.load_all(stream, Loader=self._yaml_loader)
+
+    def dump_yaml(self, data: Any) -> str:
+        """Serializes data to the canonical YAML format."""
+        return yaml.dump(data, Dumper=self._yaml_dumper, **_YAML_DUMP_OPTIONS)
+
+
+def _hides_non_finite(encoded: bytes, data: Any) -> bool:
+    """Checks whether orjson output stands for data holding NaN or Infinity (written as null)."""
+    if _NULL not in encoded:
+        return False
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def _build_codec(name: str) -> Codec:
+    if name not in CODEC_NAMES:
+        raise CodecError(f"Unknown codec '{name}'. Expected one of: {', '.join(CODEC_NAMES)}.")
+    if name == 'stdlib':
+        return Codec('stdlib', 'json', 'pure')
+    if name == 'orjson' and orjson is None:
+        raise CodecError("Codec 'orjson' requested but the 'orjson' package is not installed.")
+    json_backend = 'orjson' if orjson is not None else 'json'
+    yaml_backend = 'libyaml' if getattr(yaml, '__with_libyaml__', False) else 'pure'
+    return Codec(name, json_backend, yaml_backend)
+
+# --- Active Codec ---
+
+_active_codec: Optional[Codec] = None
+
+def configure(name: Optional[str] = None) -> Codec:
+    """
+    Selects the active codec.
+
+    Args:
+        name (Optional[str]): A codec name. If None, the WEAVERSG_CODEC environment
+                              variable is used, falling back to 'auto'.
+
+    Returns:
+        The newly active Codec.
+
+    Raises:
+        CodecError: If the codec is unknown or its backend is not installed.
+    """
+    global _active_codec
+    _active_codec = _build_codec(name or os.environ.get(CODEC_ENV_VAR) or 'auto')
+    return _active_codec
+
+def get_codec() -> Codec:
+    """Returns the active codec, configuring it from the environment on first use."""
+    if _active_codec is None:
+        return configure()
+    return _active_codec
@@ -3,18 +3,27 @@
 utils.py
 
 This module provides a collection of utility functions used across the weaverSG application.
-It includes helpers for generating unique identifiers and for loading configuration files.
+It includes helpers for generating unique identifiers and for loading configuration
+files, streaming recipes and the entity files (JSONL/CSV) of bulk recipe actions.
 
 Membra Open Development License (MODL) v1.0
 Copyright (c) Rustam Kunafin 2025. All rights reserved.
 Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
 """
 
+import csv
+import hashlib
+import json
 import uuid
 import yaml
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Iterator, Iterable, Tuple
+
+from . import serialization
+
+# Recipe file types that are always read as a stream of operations.
+STREAM_RECIPE_SUFFIXES = ('.jsonl',)
 
 # --- Custom Exceptions ---
 
@@ -107,7 +116,7 @@ def load_yaml_file(file_path: Path) -> Dict[str, Any]:
 
     try:
         with file_path.open('r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+            data = serialization.get_codec().load_yaml(f)
         if not isinstance(data, dict):
             raise RecipeFileError(f"YAML content is not a dictionary in file: {file_path}")
         return data
@@ -115,3 +124,182 @@ def load_yaml_file(file_path: Path) -> Dict[str, Any]:
         raise RecipeFileError(f"Error parsing YAML file {file_path}: {e}") from e
     except Exception as e:
         raise RecipeFileError(f"An unexpected error occurred while reading {file_path}: {e}") from e
+
+def load_records(file_path: Path) -> List[Dict[str, Any]]:
+    """
+    Loads a list of entity records from a JSON-lines or CSV file.
+
+    In a '.jsonl' file every non-empty line is one JSON object. In a '.csv' file
+    the header row names the fields and every further row is one record; cells
+    are strings, and empty cells are omitted from the record.
+
+    Args:
+        file_path (Path): The path to the '.jsonl' or '.csv' file.
+
+    Returns:
+        The records in file order.
+
+    Raises:
+        RecipeFileError: If the file is not found, has an unsupported extension,
+                         or a line is not a JSON object.
+    """
+    if not file_path.is_file():
+        raise RecipeFileError(f"File not found: {file_path}")
+
+    suffix = file_path.suffix.lower()
+    try:
+        if suffix == '.jsonl':
+            codec = serialization.get_codec()
+            records = []
+            with file_path.open('r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    record = codec.loads_json(line)
+                    if not isinstance(record, dict):
+                        raise RecipeFileError(f"Line {line_number} of {file_path} is not a JSON object.")
+                    records.append(record)
+            return records
+        if suffix == '.csv':
+            with file_path.open('r', encoding='utf-8', newline='') as f:
+                return [
+                    {field: value for field, value in row.items() if field and value not in ('', None)}
+                    for row in csv.DictReader(f)
+                ]
+    except RecipeFileError:
+        raise
+    except Exception as e:
+        raise RecipeFileError(f"An unexpected error occurred while reading {file_path}: {e}") from e
+    raise RecipeFileError(f"Unsupported entity file type '{suffix}' (expected .jsonl or .csv): {file_path}")
+
+def file_digest(file_path: Path) -> str:
+    """
+    Computes the SHA-256 digest of a file's bytes, reading it in chunks.
+
+    Returns:
+        The digest as 'sha256:<hex digest>'.
+
+    Raises:
+        RecipeFileError: If the file cannot be read.
+    """
+    digest = hashlib.sha256()
+    try:
+        with file_path.open('rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    except OSError as e:
+        raise RecipeFileError(f"Could not read {file_path}: {e}") from e
+    return f"sha256:{digest.hexdigest()}"
+
+def recipe_hash(operations: Iterable[Dict[str, Any]]) -> str:
+    """
+    Computes the content hash of a recipe's operations.
+
+    Each operation is serialized as canonical JSON (sorted keys), so formatting,
+    comments and key order do not change the hash, while any change to an action
+    or a parameter does. The recipe's header (id, description) is not included.
+    Operations are consumed one at a time, so a streamed recipe is never held in memory.
+
+    Returns:
+        The hash as 'sha256:<hex digest>'.
+    """
+    digest = hashlib.sha256()
+    for op_details in operations:
+        digest.update(json.dumps(op_details, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8'))
+        digest.update(b'\n')
+    return f"sha256:{digest.hexdigest()}"
+
+def is_streaming_recipe(file_path: Path) -> bool:
+    """
+    Checks whether a recipe file is in a streaming format: JSON lines, or YAML
+    with more than one document (a '---' separator after the first content line).
+    The file is scanned line by line without parsing.
+    """
+    if file_path.suffix.lower() in STREAM_RECIPE_SUFFIXES:
+        return True
+    try:
+        with file_path.open('r', encoding='utf-8') as f:
+            seen_content = False
+            for line in f:
+                if line.startswith('---'):
+                    if seen_content:
+                        return True
+                elif line.strip() and not line.lstrip().startswith('#'):
+                    seen_content = True
+    except OSError:
+        return False
+    return False
+
+def _iter_recipe_documents(file_path: Path) -> Iterator[Any]:
+    """Yields the documents of a streaming recipe: JSON lines, or YAML documents."""
+    try:
+        with file_path.open('r', encoding='utf-8') as f:
+            if file_path.suffix.lower() in STREAM_RECIPE_SUFFIXES:
+                codec = serialization.get_codec()
+                for line_number, line in enumerate(f, start=1):
+                    if line.strip():
+                        try:
+                            yield codec.loads_json(line)
+                        except ValueError as e:
+                            raise RecipeFileError(f"Line {line_number} of {file_path} is not valid JSON: {e}") from e
+            else:
+                for document in serialization.get_codec().load_yaml_all(f):
+                    if document is not None:
+                        yield document
+    except RecipeFileError:
+        raise
+    except yaml.YAMLError as e:
+        raise RecipeFileError(f"Error parsing YAML file {file_path}: {e}") from e
+    except OSError as e:
+        raise RecipeFileError(f"An unexpected error occurred while reading {file_path}: {e}") from e
+
+def open_recipe_stream(file_path: Path) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Opens a recipe for streaming execution.
+
+    The first document may be a header (a mapping without 'action', e.g. with
+    'id' and 'description'; an 'operations' list in it is streamed first). Every
+    further document is one operation, or a list of operations. A regular
+    single-document recipe is read the same way. Operations are parsed lazily,
+    one document at a time, as the returned iterator is consumed.
+
+    Args:
+        file_path (Path): The path to the '.yaml'/'.yml' or '.jsonl' recipe.
+
+    Returns:
+        A tuple of the header (empty if there is none) and an iterator over the operations.
+
+    Raises:
+        RecipeFileError: If the file is not found or its first document is malformed.
+                         Later documents raise it while the iterator is consumed.
+    """
+    if not file_path.is_file():
+        raise RecipeFileError(f"File not found: {file_path}")
+
+    documents = _iter_recipe_documents(file_path)
+    first = next(documents, None)
+    header: Dict[str, Any] = {}
+    leading: List[Any] = []
+    if isinstance(first, dict) and 'action' not in first:
+        header = dict(first)
+        leading = header.pop('operations', None) or []
+        if not isinstance(leading, list):
+            raise RecipeFileError(f"'operations' must be a list in the header of {file_path}")
+    elif isinstance(first, list):
+        leading = first
+    elif first is not None:
+        leading = [first]
+
+    def operations() -> Iterator[Dict[str, Any]]:
+        for document in _chain_documents(leading, documents):
+            for op_details in (document if isinstance(document, list) else [document]):
+                if not isinstance(op_details, dict) or 'action' not in op_details:
+                    raise RecipeFileError(f"Every document after the header must be an operation or a list of operations: {file_path}")
+                yield op_details
+    return header, operations()
+
+def _chain_documents(leading: List[Any], documents: Iterator[Any]) -> Iterator[Any]:
+    # The header's own operations form one list document.
+    if leading:
+        yield leading
+    yield from documents
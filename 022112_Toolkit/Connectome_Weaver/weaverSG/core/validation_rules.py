@@ -0,0 +1,630 @@
+# -*- coding: utf-8 -*-
+"""
+validation_rules.py
+
+This module holds the rules of the 'validate' command and runs them.
+
+A rule (ValidationRule) declares the shared indexes it needs, the issue code
+and severity it reports, and how an issue is summarized for humans. The
+registry keeps the rules in reporting order; rules of a project can be added
+from Python packages through the 'weaversg.validation_rules' entry point
+group, as a ValidationRule or a callable returning one or a list of them:
+
+    [project.entry-points."weaversg.validation_rules"]
+    my_rules = "my_package.rules:RULES"
+
+Rules with default=False run only when requested by name (--rules), e.g.
+expensive checks that are run nightly rather than on every commit.
+
+Membra Open Development License (MODL) v1.0
+Copyright (c) Rustam Kunafin 2025. All rights reserved.
+Licensed under MODL v1.0. See LICENSE or https://cyberries.org/04_Resources/0440_Agreements/MODL.
+"""
+
+import os
+import sys
+import time
+from importlib import metadata
+from typing import List, Dict, Any, Optional, Callable, Iterable, Sequence, Tuple
+
+ENTRY_POINT_GROUP = 'weaversg.validation_rules'
+
+# The shared indexes a rule can declare, by the pass that builds them.
+NODE_INDEXES = ('muids', 'muid_duplicates', 'alias_duplicates')
+RELATION_INDEXES = ('relation_duplicates', 'dangling', 'linked', 'components', 'hierarchy_edges')
+# The relation indexes that are keyed on the MUID index.
+_MUID_KEYED_INDEXES = {'muids', 'muid_duplicates', 'dangling', 'linked', 'components', 'hierarchy_edges'}
+
+# The relation types that form a hierarchy, and so must not form cycles.
+HIERARCHY_TYPES_ENV_VAR = 'WEAVERSG_HIERARCHY_TYPES'
+DEFAULT_HIERARCHY_TYPES = ('instance_of', 'governs', 'part_of')
+
+
+class ValidationRuleError(Exception):
+    """Raised when rules are registered twice, misdeclared or selected by an unknown name."""
+    pass
+
+
+class ValidationRule:
+    """
+    A validation check.
+
+    Attributes:
+        name (str): The name used to select the rule, e.g. 'dangling_relations'.
+        issue_code (str): The code of the issues it reports.
+        severity (str): 'ERROR' or 'WARNING'; filled into issues that do not set it.
+        check (Callable): check(graph_data, indexes) returns the list of issues.
+        indexes (Sequence[str]): The shared indexes check() reads (NODE_INDEXES, RELATION_INDEXES).
+        summarize (Optional[Callable]): summarize(issue) returns the one-line detail shown in
+                                        the human report.
+        default (bool): Whether the rule runs when no rules are selected explicitly.
+        description (str): A short description for listings.
+    """
+
+    def __init__(self, name: str, issue_code: str, severity: str, check: Callable, indexes: Sequence[str] = (),
+                 summarize: Optional[Callable] = None, default: bool = True, description: str = ""):
+        unknown = [index for index in indexes if index not in NODE_INDEXES + RELATION_INDEXES]
+        if unknown:
+            raise ValidationRuleError(f"Rule '{name}' declares unknown index(es): {', '.join(unknown)}")
+        self.name = name
+        self.issue_code = issue_code
+        self.severity = severity
+        self.check = check
+        self.indexes = tuple(indexes)
+        self.summarize = summarize
+        self.default = default
+        self.description = description
+
+
+# --- Shared Indexes ---
+#
+# The rules share their work: one pass over the nodes indexes the MUIDs and
+# aliases, one pass over the relations indexes the relation signatures and
+# evaluates the endpoints against the MUID index. Only the indexes that the
+# selected rules declare are built.
+#
+# Most keys occur once, so the indexes map a key to the index of its first
+# occurrence and only keep a list for the keys that repeat.
+
+def _by_first_occurrence(duplicates: Dict[Any, List[int]]) -> Dict[Any, List[int]]:
+    """Orders duplicate groups, which are created at their second occurrence, by their first."""
+    return dict(sorted(duplicates.items(), key=lambda item: item[1][0]))
+
+def index_nodes(nodes: List[Dict[str, Any]], muids: bool = True, aliases: bool = True) -> Dict[str, Dict[Any, Any]]:
+    """Indexes the MUIDs ('muids', 'muid_duplicates') and non-empty aliases ('alias_duplicates') of the nodes in one pass."""
+    muid_first: Dict[Any, int] = {}
+    muid_duplicates: Dict[Any, List[int]] = {}
+    alias_first: Dict[Any, int] = {}
+    alias_duplicates: Dict[Any, List[int]] = {}
+    for i, node in enumerate(nodes):
+        if muids and 'MUID' in node:
+            muid = node['MUID']
+            j = muid_first.setdefault(muid, i)
+            if j != i:
+                muid_duplicates.setdefault(muid, [j]).append(i)
+        # Group by non-empty alias (the field is present after schema migration)
+        alias = node.get('alias') if aliases else None
+        if alias:
+            j = alias_first.setdefault(alias, i)
+            if j != i:
+                alias_duplicates.setdefault(alias, [j]).append(i)
+    return {
+        'muids': muid_first,
+        'muid_duplicates': _by_first_occurrence(muid_duplicates),
+        'alias_duplicates': _by_first_occurrence(alias_duplicates)
+    }
+
+def relation_signature(rel: Dict[str, Any]) -> tuple:
+    """Returns (from_MUID, to_MUID, type), the key of duplicate relations."""
+    return (rel.get('from_MUID'), rel.get('to_MUID'), rel.get('type'))
+
+def get_hierarchy_types() -> Tuple[str, ...]:
+    """Returns the hierarchical relation types (WEAVERSG_HIERARCHY_TYPES, comma-separated, or the defaults)."""
+    configured = os.environ.get(HIERARCHY_TYPES_ENV_VAR)
+    if configured is None:
+        return DEFAULT_HIERARCHY_TYPES
+    return tuple(name.strip() for name in configured.split(',') if name.strip())
+
+def _find_root(parent: List[int], x: int) -> int:
+    """Finds the representative of x in a union-find forest, halving the path on the way."""
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+def index_relations(relations: List[Dict[str, Any]], muids: Optional[Dict[Any, int]] = None, signatures: bool = True,
+                    dangling: bool = False, structure: Sequence[str] = (), node_count: int = 0) -> Dict[str, Any]:
+    """
+    Indexes the relations in one pass.
+
+    Args:
+        relations (List[Dict[str, Any]]): The relations of the graph.
+        muids (Optional[Dict[Any, int]]): The MUID index ({MUID: first node index});
+            required for every index but 'relation_duplicates'.
+        signatures (bool): Build 'relation_duplicates': {signature: [index, ...]}.
+        dangling (bool): Build 'dangling': the indices of the relations with a missing endpoint.
+        structure (Sequence[str]): Which of the structural indexes to build, over the
+            nodes as numbered by the MUID index:
+            'linked' - a bytearray marking the nodes that are an endpoint of a relation;
+            'components' - a union-find forest (a parent list) joining the endpoints of each relation;
+            'hierarchy_edges' - (from, to, relation index) for the relations of a hierarchical type
+            whose endpoints both exist.
+        node_count (int): The number of nodes, for the structural indexes.
+
+    Returns:
+        The requested indexes.
+    """
+    first: Dict[tuple, int] = {}
+    duplicates: Dict[tuple, List[int]] = {}
+    dangling_indices = []
+    linked = bytearray(node_count) if 'linked' in structure else None
+    parent = list(range(node_count)) if 'components' in structure else None
+    size = [1] * node_count if parent is not None else None
+    hierarchy_types = frozenset(get_hierarchy_types()) if 'hierarchy_edges' in structure else None
+    hierarchy_edges = []
+    structural = bool(structure)
+    for i, rel in enumerate(relations):
+        from_muid = rel.get('from_MUID')
+        to_muid = rel.get('to_MUID')
+        if signatures:
+            signature = (from_muid, to_muid, rel.get('type'))
+            j = first.setdefault(signature, i)
+            if j != i:
+                duplicates.setdefault(signature, [j]).append(i)
+        if dangling and ((from_muid and from_muid not in muids) or (to_muid and to_muid not in muids)):
+            dangling_indices.append(i)
+        if not structural:
+            continue
+        a = muids.get(from_muid) if from_muid else None
+        b = muids.get(to_muid) if to_muid else None
+        if linked is not None:
+            if a is not None:
+                linked[a] = 1
+            if b is not None:
+                linked[b] = 1
+        if a is None or b is None:
+            continue
+        if parent is not None:
+            root_a, root_b = _find_root(parent, a), _find_root(parent, b)
+            if root_a != root_b:
+                if size[root_a] < size[root_b]:
+                    root_a, root_b = root_b, root_a
+                parent[root_b] = root_a
+                size[root_a] += size[root_b]
+        if hierarchy_types is not None and rel.get('type') in hierarchy_types:
+            hierarchy_edges.append((a, b, i))
+    return {
+        'relation_duplicates': _by_first_occurrence(duplicates),
+        'dangling': dangling_indices,
+        'linked': linked,
+        'components': parent,
+        'hierarchy_edges': hierarchy_edges
+    }
+
+# --- Issue Builders ---
+
+def duplicate_node_issue(muid: Any, indices: List[int], nodes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reports the nodes at the given indices as sharing a MUID."""
+    # For strict duplicates by MUID, report as ERROR
+    issue_details = {
+        "node_signature": {"MUID": muid},
+        "first_occurrence": nodes[indices[0]],
+        "duplicate_indices": indices
+    }
+    count = len(indices)
+    return {
+        "issue_code": "DUPLICATE_NODE",
+        "severity": "ERROR", # Strict duplicates are errors
+        "message": f"Обнаружено {count} узла(ов) с одинаковым MUID.",
+        "details": issue_details
+    }
+
+def alias_duplicate_issues(alias_duplicates: Dict[Any, List[int]], nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reports potential pre-migration duplicates: nodes sharing an alias."""
+    issues = []
+    for alias_value, indices in alias_duplicates.items():
+        # A potential duplicate group exists if more than one node shares the same alias
+        # AND not all nodes in the group have the same MUID (which would be a strict MUID duplicate, already caught above)
+        node_infos = [{'muid': nodes[i].get('MUID'), 'index': i} for i in indices]
+        if len(set(ni['muid'] for ni in node_infos if ni['muid'])) > 1:
+            # For potential duplicates by alias, report as WARNING
+            issue_details = {
+                "alias_signature": {"alias": alias_value},
+                "nodes_info": node_infos # List of {'muid': ..., 'index': ...} for nodes with this alias
+            }
+            count = len(node_infos)
+            issues.append({
+                "issue_code": "POTENTIAL_PRE_MIGRATION_DUPLICATE",
+                "severity": "WARNING", # Potential duplicates are warnings
+                "message": f"Обнаружено {count} узла(ов) с одинаковым alias (вероятно, дубликаты до миграции).",
+                "details": issue_details
+            })
+    return issues
+
+def duplicate_relation_issue(sig: tuple, indices: List[int], relations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reports the relations at the given indices as sharing a signature."""
+    issue_details = {
+        "relation_signature": {
+            "from_MUID": sig[0],
+            "to_MUID": sig[1],
+            "type": sig[2]
+        },
+        "first_occurrence": relations[indices[0]],
+        "duplicate_indices": indices
+    }
+    count = len(indices)
+    return {
+        "issue_code": "DUPLICATE_RELATION",
+        "severity": "ERROR",
+        "message": f"Обнаружено {count} идентичных связей.",
+        "details": issue_details
+    }
+
+def dangling_relation_issue(i: int, rel: Dict[str, Any], node_exists: Callable[[Any], bool]) -> Optional[Dict[str, Any]]:
+    """Reports a relation whose endpoints are not all existing nodes, or returns None."""
+    dangling_endpoints = []
+    from_muid = rel.get('from_MUID')
+    to_muid = rel.get('to_MUID')
+
+    if from_muid and not node_exists(from_muid):
+        dangling_endpoints.append({"direction": "from", "muid": from_muid})
+
+    if to_muid and not node_exists(to_muid):
+        dangling_endpoints.append({"direction": "to", "muid": to_muid})
+
+    if not dangling_endpoints:
+        return None
+    issue_details = {
+        "relation": rel,
+        "relation_index": i,
+        "dangling_endpoints": dangling_endpoints
+    }
+    return {
+        "issue_code": "DANGLING_RELATION",
+        "severity": "ERROR",
+        "message": "Связь ссылается на несуществующий узел.",
+        "details": issue_details
+    }
+
+
+# --- Built-in Rules ---
+
+def _check_dangling_relations(graph_data: Dict[str, Any], indexes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    relations = graph_data.get('relations', [])
+    return [dangling_relation_issue(i, relations[i], indexes['muids'].__contains__) for i in indexes['dangling']]
+
+def _summarize_dangling_relation(issue: Dict[str, Any]) -> str:
+    endpoints = issue['details']['dangling_endpoints']
+    dangling_info = ', '.join([f"{e['direction']}:{e['muid']}" for e in endpoints])
+    rel = issue['details']['relation']
+    return f"Missing MUID(s): {dangling_info} in relation from '{rel.get('from_MUID')}' to '{rel.get('to_MUID')}'"
+
+def _check_duplicate_nodes(graph_data: Dict[str, Any], indexes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes = graph_data.get('nodes', [])
+    return [duplicate_node_issue(muid, indices, nodes) for muid, indices in indexes['muid_duplicates'].items()]
+
+def _summarize_duplicate_node(issue: Dict[str, Any]) -> str:
+    count = len(issue['details']['duplicate_indices'])
+    return f"MUID: {issue['details']['node_signature']['MUID']} (found {count} times)"
+
+def _check_alias_duplicates(graph_data: Dict[str, Any], indexes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return alias_duplicate_issues(indexes['alias_duplicates'], graph_data.get('nodes', []))
+
+def _summarize_alias_duplicate(issue: Dict[str, Any]) -> str:
+    muids = ', '.join(str(info['muid']) for info in issue['details']['nodes_info'])
+    return f"Alias: {issue['details']['alias_signature']['alias']} (MUIDs: {muids})"
+
+def _check_duplicate_relations(graph_data: Dict[str, Any], indexes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    relations = graph_data.get('relations', [])
+    return [duplicate_relation_issue(sig, indices, relations) for sig, indices in indexes['relation_duplicates'].items()]
+
+def _summarize_duplicate_relation(issue: Dict[str, Any]) -> str:
+    count = len(issue['details']['duplicate_indices'])
+    sig = issue['details']['relation_signature']
+    return f"From: {sig['from_MUID']}, To: {sig['to_MUID']}, Type: {sig['type']} (found {count} times)"
+
+BUILTIN_RULES = (
+    ValidationRule('dangling_relations', 'DANGLING_RELATION', 'ERROR', _check_dangling_relations,
+                   indexes=('muids', 'dangling'), summarize=_summarize_dangling_relation,
+                   description="Relations pointing to a MUID that no node has."),
+    ValidationRule('duplicate_nodes', 'DUPLICATE_NODE', 'ERROR', _check_duplicate_nodes,
+                   indexes=('muid_duplicates',), summarize=_summarize_duplicate_node,
+                   description="Several nodes with the same MUID."),
+    ValidationRule('pre_migration_duplicates', 'POTENTIAL_PRE_MIGRATION_DUPLICATE', 'WARNING', _check_alias_duplicates,
+                   indexes=('alias_duplicates',), summarize=_summarize_alias_duplicate,
+                   description="Nodes with different MUIDs sharing an alias."),
+    ValidationRule('duplicate_relations', 'DUPLICATE_RELATION', 'ERROR', _check_duplicate_relations,
+                   indexes=('relation_duplicates',), summarize=_summarize_duplicate_relation,
+                   description="Several relations with the same endpoints and type."),
+)
+
+
+# --- Structural Rules ---
+#
+# These rules are linear in the size of the graph but do more work per entity
+# than the built-in ones, so they only run when selected with --rules. They
+# work on node numbers (the first index of each MUID) and never recurse, so
+# graphs of any depth are safe.
+
+def _strongly_connected_components(adjacency: Dict[int, List[int]], node_count: int) -> List[List[int]]:
+    """
+    Tarjan's algorithm with an explicit stack: returns the strongly connected
+    components of a directed graph over the nodes 0..node_count-1.
+
+    The depth-first search keeps the current path as two lists of integers (the
+    node and the position in its successor list) rather than a frame per node,
+    so a million-deep path costs no recursion and few tracked objects.
+    """
+    index = [-1] * node_count
+    low = [0] * node_count
+    on_stack = bytearray(node_count)
+    stack: List[int] = []
+    components = []
+    counter = 0
+    for root in adjacency:
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        path, positions = [root], [0]
+        while path:
+            v = path[-1]
+            successors = adjacency.get(v, ())
+            position = positions[-1]
+            descended = False
+            while position < len(successors):
+                w = successors[position]
+                position += 1
+                if index[w] < 0:
+                    positions[-1] = position
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    path.append(w)
+                    positions.append(0)
+                    descended = True
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            if descended:
+                continue
+            path.pop()
+            positions.pop()
+            if path and low[v] < low[path[-1]]:
+                low[path[-1]] = low[v]
+            if low[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = 0
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(component)
+    return components
+
+def _check_hierarchy_cycles(graph_data: Dict[str, Any], indexes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes = graph_data.get('nodes', [])
+    relations = graph_data.get('relations', [])
+    adjacency: Dict[int, List[int]] = {}
+    for a, b, _ in indexes['hierarchy_edges']:
+        adjacency.setdefault(a, []).append(b)
+    self_loops = {a for a, b, _ in indexes['hierarchy_edges'] if a == b}
+    cycles = [sorted(component) for component in _strongly_connected_components(adjacency, len(nodes))
+              if len(component) > 1 or component[0] in self_loops]
+    member_of = {node: number for number, component in enumerate(cycles) for node in component}
+    cycle_relations: Dict[int, List[int]] = {}
+    for a, b, i in indexes['hierarchy_edges']:
+        if a in member_of and member_of[a] == member_of.get(b):
+            cycle_relations.setdefault(member_of[a], []).append(i)
+
+    issues = []
+    for number, component in sorted(enumerate(cycles), key=lambda item: item[1][0]):
+        relation_indices = cycle_relations[number]
+        issues.append({
+            "issue_code": "HIERARCHY_CYCLE",
+            "severity": "ERROR",
+            "message": f"Обнаружен цикл из {len(component)} узла(ов) в иерархических связях.",
+            "details": {
+                "cycle_MUIDs": [nodes[node]['MUID'] for node in component],
+                "relation_types": sorted({str(relations[i].get('type')) for i in relation_indices}),
+                "relation_indices": relation_indices
+            }
+        })
+    return issues
+
+def _summarize_hierarchy_cycle(issue: Dict[str, Any]) -> str:
+    muids = issue['details']['cycle_MUIDs']
+    shown = ' -> '.join(str(muid) for muid in muids[:5]) + (' ...' if len(muids) > 5 else '')
+    return f"Types: {', '.join(issue['details']['relation_types'])}; MUIDs: {shown}"
+
+def _check_orphan_nodes(graph_data: Dict[str, Any], indexes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    linked = indexes['linked']
+    return [
+        {
+            "issue_code": "ORPHAN_NODE",
+            "severity": "WARNING",
+            "message": "Узел не участвует ни в одной связи.",
+            "details": {"node_signature": {"MUID": muid}, "node_index": i}
+        }
+        for muid, i in indexes['muids'].items() if not linked[i]
+    ]
+
+def _summarize_orphan_node(issue: Dict[str, Any]) -> str:
+    return f"MUID: {issue['details']['node_signature']['MUID']}"
+
+def _check_disconnected_components(graph_data: Dict[str, Any], indexes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes = graph_data.get('nodes', [])
+    parent = indexes['components']
+    components: Dict[int, List[int]] = {}
+    for i in indexes['muids'].values():
+        components.setdefault(_find_root(parent, i), []).append(i)
+    # Single nodes are left to the orphan_nodes rule; the largest component is the main graph.
+    islands = sorted((sorted(members) for members in components.values()), key=lambda members: (-len(members), members[0]))[1:]
+    issues = []
+    for members in sorted((members for members in islands if len(members) > 1), key=lambda members: members[0]):
+        issues.append({
+            "issue_code": "DISCONNECTED_COMPONENT",
+            "severity": "WARNING",
+            "message": f"Обнаружен изолированный фрагмент графа из {len(members)} узла(ов), не связанный с основной частью.",
+            "details": {
+                "component_size": len(members),
+                "component_count": len(components),
+                "MUIDs": [nodes[i]['MUID'] for i in members]
+            }
+        })
+    return issues
+
+def _summarize_disconnected_component(issue: Dict[str, Any]) -> str:
+    muids = issue['details']['MUIDs']
+    shown = ', '.join(str(muid) for muid in muids[:5]) + (' ...' if len(muids) > 5 else '')
+    return f"{issue['details']['component_size']} node(s) of {issue['details']['component_count']} component(s): {shown}"
+
+STRUCTURAL_RULES = (
+    ValidationRule('hierarchy_cycles', 'HIERARCHY_CYCLE', 'ERROR', _check_hierarchy_cycles,
+                   indexes=('hierarchy_edges',), summarize=_summarize_hierarchy_cycle, default=False,
+                   description="Cycles in the hierarchical relation types (WEAVERSG_HIERARCHY_TYPES)."),
+    ValidationRule('orphan_nodes', 'ORPHAN_NODE', 'WARNING', _check_orphan_nodes,
+                   indexes=('muids', 'linked'), summarize=_summarize_orphan_node, default=False,
+                   description="Nodes that are not an endpoint of any relation."),
+    ValidationRule('disconnected_components', 'DISCONNECTED_COMPONENT', 'WARNING', _check_disconnected_components,
+                   indexes=('muids', 'components'), summarize=_summarize_disconnected_component, default=False,
+                   description="Groups of linked nodes that are not connected to the largest component."),
+)
+
+
+# --- Registry ---
+
+_registry: Dict[str, ValidationRule] = {rule.name: rule for rule in BUILTIN_RULES + STRUCTURAL_RULES}
+_plugins_loaded = False
+
+def register_rule(rule: ValidationRule) -> None:
+    """
+    Adds a rule to the registry, after the rules registered before it.
+
+    Raises:
+        ValidationRuleError: If a rule with the same name is already registered.
+    """
+    if rule.name in _registry:
+        raise ValidationRuleError(f"A validation rule named '{rule.name}' is already registered.")
+    _registry[rule.name] = rule
+
+def _load_plugin_rules() -> None:
+    """
+    Registers the rules published through the entry point group, once. A broken
+    plugin is reported on stderr (so that JSON output stays valid) and skipped.
+    """
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+    for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            provided = entry_point.load()
+            if callable(provided) and not isinstance(provided, ValidationRule):
+                provided = provided()
+            for rule in [provided] if isinstance(provided, ValidationRule) else list(provided):
+                if not isinstance(rule, ValidationRule):
+                    raise ValidationRuleError(f"expected a ValidationRule, got {type(rule).__name__}")
+                register_rule(rule)
+        except Exception as e:
+            print(f"Warning: could not load validation rules from entry point '{entry_point.name}': {e}", file=sys.stderr)
+
+def get_rules() -> List[ValidationRule]:
+    """Returns every registered rule, built-in and from plugins, in reporting order."""
+    _load_plugin_rules()
+    return list(_registry.values())
+
+def _split_names(names: Optional[Iterable[str]]) -> List[str]:
+    """Accepts names as a list, comma-separated strings, or both."""
+    return [name.strip() for item in names or [] for name in item.split(',') if name.strip()]
+
+def select_rules(rules: Optional[Iterable[str]] = None, skip_rules: Optional[Iterable[str]] = None) -> List[ValidationRule]:
+    """
+    Selects the rules to run, in reporting order.
+
+    Args:
+        rules (Optional[Iterable[str]]): The names of the rules to run; default: every
+                                         rule with default=True.
+        skip_rules (Optional[Iterable[str]]): Names of rules to leave out.
+
+    Returns:
+        The selected rules.
+
+    Raises:
+        ValidationRuleError: If a name does not match any registered rule.
+    """
+    available = get_rules()
+    wanted, skipped = _split_names(rules), _split_names(skip_rules)
+    unknown = sorted(set(wanted + skipped) - {rule.name for rule in available})
+    if unknown:
+        raise ValidationRuleError(
+            f"Unknown validation rule(s): {', '.join(unknown)}. Available: {', '.join(rule.name for rule in available)}"
+        )
+    return [
+        rule for rule in available
+        if (rule.name in wanted if wanted else rule.default) and rule.name not in skipped
+    ]
+
+def summarize_issue(issue: Dict[str, Any]) -> str:
+    """Returns the human-readable detail of an issue from the rule that reports its code ('' if none)."""
+    for rule in _registry.values():
+        if rule.issue_code == issue.get('issue_code') and rule.summarize:
+            return rule.summarize(issue)
+    return ""
+
+
+# --- Running Rules ---
+
+def run_rules(graph_data: Dict[str, Any], rules: List[ValidationRule], timings: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Runs rules over a graph, building the shared indexes they declare once.
+
+    Args:
+        graph_data (Dict[str, Any]): The SG data.
+        rules (List[ValidationRule]): The rules, in reporting order.
+        timings (Optional[Dict[str, Any]]): If given, filled with the wall time of
+            each pass ('passes': {'nodes', 'relations'}) and, per rule, its issue
+            code, the time spent in its check and the number of issues ('rules').
+
+    Returns:
+        The issues of all rules, in rule order.
+    """
+    nodes = graph_data.get('nodes', [])
+    relations = graph_data.get('relations', [])
+    needed = {index for rule in rules for index in rule.indexes}
+    indexes: Dict[str, Any] = {}
+    passes: Dict[str, float] = {}
+
+    if needed & (_MUID_KEYED_INDEXES | {'alias_duplicates'}):
+        started = time.perf_counter()
+        indexes.update(index_nodes(nodes, muids=bool(needed & _MUID_KEYED_INDEXES), aliases='alias_duplicates' in needed))
+        passes['nodes'] = time.perf_counter() - started
+    if needed & set(RELATION_INDEXES):
+        started = time.perf_counter()
+        indexes.update(index_relations(
+            relations, indexes.get('muids'), signatures='relation_duplicates' in needed, dangling='dangling' in needed,
+            structure=[index for index in ('linked', 'components', 'hierarchy_edges') if index in needed],
+            node_count=len(nodes)
+        ))
+        passes['relations'] = time.perf_counter() - started
+
+    all_issues = []
+    rule_timings: Dict[str, Dict[str, Any]] = {}
+    for rule in rules:
+        started = time.perf_counter()
+        issues = [
+            issue if 'issue_code' in issue and 'severity' in issue
+            else {'issue_code': rule.issue_code, 'severity': rule.severity, **issue}
+            for issue in rule.check(graph_data, indexes)
+        ]
+        rule_timings[rule.name] = {'issue_code': rule.issue_code, 'seconds': time.perf_counter() - started, 'issues': len(issues)}
+        all_issues.extend(issues)
+
+    if timings is not None:
+        timings['passes'] = passes
+        timings['rules'] = rule_timings
+    return all_issues
@@ -25,8 +25,11 @@ from weaverSG.commands import (
     promote_handler,
     log_archiver,
     log_bundler,
+    log_compactor,
+    checkout,
     cleaner
 )
+from weaverSG.core import graph_cache, serialization
 
 def create_parser() -> argparse.ArgumentParser:
     """Creates and configures the main argument parser and all subparsers."""
@@ -34,19 +37,48 @@ def create_parser() -> argparse.ArgumentParser:
         description="Connectome Weaver (weaverSG): A tool for transactional management of Semantic Graphs.",
         epilog="Use 'weaverSG <command> --help' for more information on a specific command."
     )
+    parser.add_argument(
+        "--codec", choices=serialization.CODEC_NAMES, default=None,
+        help=f"JSON/YAML backend used to read and write graphs and recipes (default: ${serialization.CODEC_ENV_VAR} or 'auto')."
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path, default=None,
+        help=f"Directory for the persistent cache of parsed graphs (default: ${graph_cache.CACHE_DIR_ENV_VAR}; disabled if unset)."
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=int, default=None,
+        help=f"Size bound of the graph cache in MB (default: ${graph_cache.CACHE_MAX_MB_ENV_VAR} or {graph_cache.DEFAULT_MAX_MB})."
+    )
     subparsers = parser.add_subparsers(dest="command", help="Available commands", required=True)
 
     # --- Validator Command ---
     parser_validate = subparsers.add_parser("validate", help="Validates the integrity of an SG file.")
-    parser_validate.add_argument("--file", type=Path, required=True, help="Path to the SG file to validate.")
+    validate_target = parser_validate.add_mutually_exclusive_group(required=True)
+    validate_target.add_argument("--file", type=Path, help="Path to the SG file to validate.")
+    validate_target.add_argument("--glob", type=str, help="Glob pattern of SG files to validate in parallel, e.g. 'graphs/**/*.md'.")
+    validate_target.add_argument("--root", type=Path, help="Directory of a document corpus: check MUID uniqueness and references across all its .md files.")
+    parser_validate.add_argument("--jobs", type=int, default=None, help="Number of worker processes for --glob and --root (default: CPU count).")
     # For machine-readable output
     parser_validate.add_argument("--output-format", choices=['human', 'json'], default='human', help="Format for the output. 'json' is for machine processing.")
+    parser_validate.add_argument("--timings", action="store_true", help="Report the wall time and issue count of each pass and rule.")
+    parser_validate.add_argument("--rules", action="append", help="Comma-separated names of the rules to run (default: the default rules). May be repeated.")
+    parser_validate.add_argument("--skip-rules", action="append", help="Comma-separated names of rules to leave out. May be repeated.")
+    parser_validate.add_argument("--full", action="store_true", help="Check the whole graph instead of only the changes since the last validation.")
     parser_validate.set_defaults(func=validator.handle_validation)
 
     # --- Batch Modifier Command ---
     parser_batch = subparsers.add_parser("batch-modify", help="Modifies an SG file based on a YAML recipe.")
-    parser_batch.add_argument("--file", type=Path, required=True, help="Path to the target SG file.")
+    batch_target = parser_batch.add_mutually_exclusive_group(required=True)
+    batch_target.add_argument("--file", type=Path, help="Path to the target SG file.")
+    batch_target.add_argument("--glob", type=str, help="Glob pattern of SG files to modify in parallel, e.g. 'graphs/**/*.md'.")
+    parser_batch.add_argument("--jobs", type=int, default=None, help="Number of worker processes for --glob (default: CPU count).")
     parser_batch.add_argument("--recipe", type=Path, required=True, help="Path to the YAML recipe file.")
+    parser_batch.add_argument("--explain", action="store_true", help="Print the execution plan (fused passes) of the recipe and exit.")
+    parser_batch.add_argument("--dry-run", action="store_true", help="Run the recipe in memory and print the structural diff; write nothing.")
+    parser_batch.add_argument("--diff-limit", type=int, default=50, help="Maximum diff entries listed per category with --dry-run (0 = all).")
+    parser_batch.add_argument("--commit-every", type=int, default=0, help="Commit a transaction every K recipe steps (0 = one transaction for the recipe).")
+    parser_batch.add_argument("--resume", action="store_true", help="Continue after the last step committed for the recipe's id.")
+    parser_batch.add_argument("--force", action="store_true", help="Apply the recipe even if the log shows it was already applied.")
     parser_batch.set_defaults(func=batch_modifier.handle_batch_modify)
 
     # --- Promote Relation Command ---
@@ -60,6 +92,11 @@ def create_parser() -> argparse.ArgumentParser:
     parser_archive.add_argument("--file", type=Path, required=True, help="Path to the main SG file.")
     parser_archive.set_defaults(func=log_archiver.handle_archive_log)
 
+    # --- Log Compactor Command ---
+    parser_compact = subparsers.add_parser("compact-log", help="Folds the LSG journal back into the LSG file.")
+    parser_compact.add_argument("--file", type=Path, required=True, help="Path to the main SG file.")
+    parser_compact.set_defaults(func=log_compactor.handle_compact_log)
+
     # --- Log Bundler Command ---
     parser_bundle = subparsers.add_parser("bundle-log", help="Bundles the external LSG into the main SG file.")
     parser_bundle.add_argument("--file", type=Path, required=True, help="Path to the main SG file.")
@@ -70,6 +107,13 @@ def create_parser() -> argparse.ArgumentParser:
     parser_detach.add_argument("--file", type=Path, required=True, help="Path to the main SG file.")
     parser_detach.set_defaults(func=log_bundler.handle_detach_log)
 
+    # --- Checkout Command ---
+    parser_checkout = subparsers.add_parser("checkout", help="Reconstructs a past state of an SG from its log.")
+    parser_checkout.add_argument("--file", type=Path, required=True, help="Path to the main SG file.")
+    parser_checkout.add_argument("--at", required=True, help="Transaction ID, or ISO 8601 timestamp (the latest transaction at or before it).")
+    parser_checkout.add_argument("--output", type=Path, default=None, help="Output file (default: '.weaver_checkouts/<name>_at_<transaction>.md' next to the SG).")
+    parser_checkout.set_defaults(func=checkout.handle_checkout)
+
     # --- Cleaner Command ---
     parser_cleanup = subparsers.add_parser("cleanup-backups", help="Deletes all backup files in the SG directory.")
     parser_cleanup.add_argument("--file", type=Path, required=True, help="Path to the SG file (to identify the directory).")
@@ -83,19 +127,54 @@ def main():
     parser = create_parser()
     args = parser.parse_args()
 
+    try:
+        serialization.configure(args.codec)
+    except serialization.CodecError as e:
+        parser.error(str(e))
+    try:
+        graph_cache.configure(args.cache_dir, args.cache_max_mb)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if getattr(args, 'jobs', None) is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    if args.command == 'batch-modify':
+        if args.commit_every < 0:
+            parser.error("--commit-every must not be negative.")
+        if args.glob and (args.commit_every or args.resume):
+            parser.error("--commit-every and --resume apply to a single --file.")
+    if args.command == 'validate' and args.root and (args.full or args.timings or args.rules or args.skip_rules):
+        parser.error("--full, --timings, --rules and --skip-rules do not apply to --root.")
+
     # Dispatch the call to the appropriate handler function
-    if args.command == 'validate':
-        args.func(file_path=args.file, output_format=args.output_format)
+    if args.command == 'validate' and args.root:
+        validator.handle_validation_corpus(root=args.root, output_format=args.output_format, jobs=args.jobs)
+    elif args.command == 'validate' and args.glob:
+        validator.handle_validation_glob(pattern=args.glob, output_format=args.output_format, jobs=args.jobs, full=args.full, timings=args.timings, rules=args.rules, skip_rules=args.skip_rules)
+    elif args.command == 'validate':
+        args.func(file_path=args.file, output_format=args.output_format, full=args.full, timings=args.timings, rules=args.rules, skip_rules=args.skip_rules)
+    elif args.command == 'batch-modify' and args.glob:
+        batch_modifier.handle_batch_modify_glob(
+            pattern=args.glob, recipe_path=args.recipe, jobs=args.jobs, explain=args.explain,
+            dry_run=args.dry_run, diff_limit=args.diff_limit, force=args.force
+        )
     elif args.command == 'batch-modify':
-        args.func(file_path=args.file, recipe_path=args.recipe)
+        args.func(
+            file_path=args.file, recipe_path=args.recipe, explain=args.explain, dry_run=args.dry_run, diff_limit=args.diff_limit,
+            commit_every=args.commit_every, resume=args.resume, force=args.force
+        )
     elif args.command == 'promote-relation':
         args.func(file_path=args.file, lid=args.lid)
     elif args.command == 'archive-log':
         args.func(file_path=args.file)
+    elif args.command == 'compact-log':
+        args.func(file_path=args.file)
     elif args.command == 'bundle-log':
         args.func(file_path=args.file)
     elif args.command == 'detach-log':
         args.func(file_path=args.file)
+    elif args.command == 'checkout':
+        args.func(file_path=args.file, at=args.at, output=args.output)
     elif args.command == 'cleanup-backups':
         args.func(file_path=args.file, auto_confirm=args.yes)
     else: